@@ -1,9 +1,9 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from hedra_client import HedraClient
-from script_generator import ScriptGenerator
-from openai_client import OpenAIClient
+from health_checks import get_health_monitor
+from job_journal import get_default_journal
+from job_queue import get_default_queue
 import time
 
 # Load environment variables
@@ -37,37 +37,110 @@ else:
     st.sidebar.error("❌ Hedra API key missing")
     st.sidebar.info("Add HEDRA_API_KEY to your .env file")
 
-# Test API connections
+# Renders still in flight from earlier runs; "Create Video" with the same script reattaches to them
+# (a count plus the first few - the Campaign Dashboard pages through all of them)
+SIDEBAR_PENDING_JOBS = 5
+if hedra_key:
+    journal = get_default_journal()
+    pending_count = journal.count_unfinished(max_age=24 * 3600)
+    if pending_count:
+        st.sidebar.subheader(f"⏳ In-flight Renders ({pending_count})")
+        for job in journal.unfinished(max_age=24 * 3600, limit=SIDEBAR_PENDING_JOBS):
+            st.sidebar.caption(f"Job {job['job_id']}: {job['status']} ({job['progress']}%)")
+        if pending_count > SIDEBAR_PENDING_JOBS:
+            st.sidebar.caption(f"...and {pending_count - SIDEBAR_PENDING_JOBS} more on the Campaign Dashboard")
+
+# API connection status - rendered from the cached health checks (see health_checks.py);
+# stale results are re-probed in the background with zero-token endpoints
 st.subheader("🔗 API Connection Status")
 
-# Initialize clients
-try:
-    openai_client = OpenAIClient()
-    hedra_client = HedraClient()
-    
-    # Test OpenAI connection
-    with st.spinner("Testing OpenAI connection..."):
-        openai_test = openai_client.test_connection()
-        
-    if openai_test["success"]:
-        st.success("✅ OpenAI API: Connected successfully")
+health = get_health_monitor()
+
+def show_health(label: str, status: dict, hint: str):
+    checked = f" (checked {int(time.time() - status['checked_at'])}s ago)" if status.get("checked_at") else ""
+    if status["success"] is None:
+        st.info(f"⏳ {label}: {status['message']}")
+    elif status["success"]:
+        st.success(f"✅ {label}: Connected successfully{checked}")
     else:
-        st.error(f"❌ OpenAI API: {openai_test['error']}")
-        st.info("💡 Check your OpenAI API key in the .env file")
-    
-    # Show Hedra connection status
-    if hedra_key:
-        st.success("✅ Hedra AI: API key configured")
-        st.info(f"🔗 API Endpoint: {hedra_client.base_url}")
-        st.info("🎤 Voice: Will use first available voice from API")
+        st.error(f"❌ {label}: {status['error']}{checked}")
+        st.info(hint)
+
+show_health("OpenAI API", health.status("openai", openai_key), "💡 Check your OpenAI API key in the .env file")
+show_health("Hedra AI", health.status("hedra", hedra_key), "💡 Check HEDRA_API_KEY in your .env file")
+
+if st.button("🔄 Re-check connections"):
+    for provider, key in (("openai", openai_key), ("hedra", hedra_key)):
+        if key:
+            health.refresh(provider, key)
+    st.rerun()
+
+# Renders are done by render_worker.py processes; the app only writes requests to
+# the local queue and reads their status back (see job_queue.py)
+render_queue = None
+render_queue_error = None
+try:
+    render_queue = get_default_queue()
+    workers = render_queue.live_workers()
+    if workers:
+        st.info(f"🛠️ Render workers: {len(workers)} running")
     else:
-        st.error("❌ Hedra AI: API key missing")
-        st.info("💡 Add HEDRA_API_KEY to your .env file")
-        
+        st.warning("🛠️ No render workers running - queued videos wait until you start "
+                   "`python render_worker.py` next to the app")
+    st.info("🎤 Voice: Will use first available voice from API")
 except Exception as e:
-    st.error(f"❌ Initialization Error: {str(e)}")
+    render_queue_error = str(e)
+    st.error(f"❌ Initialization Error: {render_queue_error}")
     st.info("💡 Check your .env file and API keys")
 
+# Seconds between progress refreshes while this session has renders in flight
+VIDEO_REFRESH_SECONDS = 2.0
+
+def show_video_result(result: dict):
+    if result["success"]:
+        st.success(f"✅ {result['message']}")
+        
+        # Display video URL
+        video_url = result["video_url"]
+        st.video(video_url)
+        
+        # Download button
+        st.markdown(f"**Video URL:** {video_url}")
+        st.markdown("*Right-click the video above and select 'Save video as...' to download*")
+        
+        # Show job details
+        st.json({
+            "job_id": result["job_id"],
+            "status": result["status"],
+            "video_url": video_url
+        })
+        
+    else:
+        error_msg = result.get('error', 'Unknown error')
+        st.error(f"❌ Video generation failed: {error_msg}")
+        
+        # Provide specific guidance based on error
+        if "authenticate" in error_msg.lower() or "403" in str(result.get('status_code', '')):
+            st.warning("🔑 **API Key Authentication Issue**")
+            st.info("""
+            **Possible Solutions:**
+            1. **Verify API Key**: Check if your API key is correct
+            2. **Account Upgrade**: Ensure you have a paid Hedra subscription
+            3. **API Access**: Enable API access in your Hedra dashboard
+            4. **Contact Support**: Reach out to Hedra support for API activation
+            """)
+            
+            st.markdown("""
+            **Troubleshooting:**
+            - Log into [Hedra Dashboard](https://app.hedra.com) and verify you have a paid subscription with API access
+            - Regenerate your API key if needed and update your .env file
+            - Email support@hedra.com to request API activation (mention the mercury API endpoint)
+            """)
+        
+        # Show debug details
+        st.caption("Debug details")
+        st.json(result)
+
 # Main interface
 col1, col2 = st.columns([1, 1])
 
@@ -92,26 +165,62 @@ with col1:
     st.subheader("🎥 Video Settings")
     aspect_ratio = st.selectbox("Aspect Ratio", ["16:9", "9:16", "1:1"], index=0)
     
+    # Identical inputs are answered from the prompt cache unless a fresh take is requested
+    regenerate = st.checkbox("🔁 Regenerate (skip cached script)", value=False)
+    
     # Generate script button
     if st.button("🤖 Generate Script", type="primary"):
         if all([company_name, contact_name, product_service, key_benefits, call_to_action]):
-            with st.spinner("Generating personalized script..."):
-                try:
-                    script_gen = ScriptGenerator()
-                    script = script_gen.generate_sales_script(
-                        company_name=company_name,
-                        contact_name=contact_name,
-                        product_service=product_service,
-                        key_benefits=key_benefits,
-                        call_to_action=call_to_action
-                    )
-                    st.session_state.generated_script = script
-                    st.success("✅ Script generated successfully!")
-                except Exception as e:
-                    st.error(f"❌ Error generating script: {str(e)}")
-                    st.info("Please check your OpenAI API key in the .env file")
+            # Render tokens as they arrive instead of waiting for the whole completion
+            preview = st.empty()
+            preview.info("Generating personalized script...")
+            try:
+                # Imported on first use: it pulls in openai/httpx, which no other rerun needs
+                from script_generator import ScriptGenerator
+                script_gen = ScriptGenerator()
+                script = ""
+                for delta in script_gen.generate_sales_script_stream(
+                    company_name=company_name,
+                    contact_name=contact_name,
+                    product_service=product_service,
+                    key_benefits=key_benefits,
+                    call_to_action=call_to_action,
+                    regenerate=regenerate
+                ):
+                    script += delta
+                    preview.markdown(script + " ▌")
+                preview.empty()
+                st.session_state.generated_script = script.strip()
+                st.success(f"✅ Script generated successfully! (model: {script_gen.last_model})")
+            except Exception as e:
+                # Whatever streamed before the failure is discarded, not kept as the script
+                preview.empty()
+                st.error(f"❌ Error generating script: {str(e)}")
+                st.info("Please check your OpenAI API key in the .env file")
         else:
             st.error("Please fill in all fields to generate a script")
+    
+    # Script and video both produced by a render worker - nothing to wait for here
+    if st.button("📨 Queue Script + Video"):
+        if render_queue is None:
+            st.error(f"❌ Render queue unavailable: {render_queue_error}")
+        elif all([company_name, contact_name, product_service, key_benefits, call_to_action]):
+            request_id = render_queue.enqueue({
+                "script": {
+                    "company_name": company_name,
+                    "contact_name": contact_name,
+                    "product_service": product_service,
+                    "key_benefits": key_benefits,
+                    "call_to_action": call_to_action,
+                    "regenerate": regenerate
+                },
+                "aspect_ratio": aspect_ratio,
+                "voice_id": "default"
+            }, prospect=f"{contact_name} @ {company_name}")
+            st.session_state.setdefault("video_requests", []).insert(0, request_id)
+            st.success("✅ Queued - the script and video will appear under \"Your Videos\"")
+        else:
+            st.error("Please fill in all fields to queue a video")
 
 with col2:
     st.header("🎬 Video Generation")
@@ -128,79 +237,23 @@ with col2:
         st.info("✅ Using Hedra AI voice: **tara** (built-in text-to-speech)")
         st.markdown("*Hedra will automatically generate audio from your script text*")
         
-        # Video generation
+        # Video generation - enqueue and return; progress is shown under "Your Videos"
         if st.button("🎥 Create Video", type="primary"):
-            if openai_key and hedra_key:
-                with st.spinner("🎬 Creating video with Hedra AI..."):
-                    try:
-                        # Use the new create_video_complete method
-                        result = hedra_client.create_video_complete(
-                            script_text=script_text,
-                            aspect_ratio=aspect_ratio,
-                            voice_id="default"  # Will use first available voice
-                        )
-                        
-                        if result["success"]:
-                            st.success(f"✅ {result['message']}")
-                            
-                            # Display video URL
-                            video_url = result["video_url"]
-                            st.subheader("🎬 Your Generated Video")
-                            st.video(video_url)
-                            
-                            # Download button
-                            st.markdown(f"**Video URL:** {video_url}")
-                            st.markdown("*Right-click the video above and select 'Save video as...' to download*")
-                            
-                            # Show job details
-                            with st.expander("📋 Generation Details"):
-                                st.json({
-                                    "job_id": result["job_id"],
-                                    "status": result["status"],
-                                    "video_url": video_url
-                                })
-                                
-                        else:
-                            error_msg = result.get('error', 'Unknown error')
-                            st.error(f"❌ Video generation failed: {error_msg}")
-                            
-                            # Provide specific guidance based on error
-                            if "authenticate" in error_msg.lower() or "403" in str(result.get('status_code', '')):
-                                st.warning("🔑 **API Key Authentication Issue**")
-                                st.info("""
-                                **Possible Solutions:**
-                                1. **Verify API Key**: Check if your API key is correct
-                                2. **Account Upgrade**: Ensure you have a paid Hedra subscription
-                                3. **API Access**: Enable API access in your Hedra dashboard
-                                4. **Contact Support**: Reach out to Hedra support for API activation
-                                """)
-                                
-                                with st.expander("🔧 Troubleshooting Steps"):
-                                    st.markdown("""
-                                    **Step 1: Check Your Hedra Account**
-                                    - Log into [Hedra Dashboard](https://app.hedra.com)
-                                    - Verify you have a paid subscription
-                                    - Look for API access settings
-                                    
-                                    **Step 2: Verify API Key**
-                                    - Go to API settings in your dashboard
-                                    - Regenerate your API key if needed
-                                    - Update your .env file with the new key
-                                    
-                                    **Step 3: Contact Support**
-                                    - Email: support@hedra.com
-                                    - Request API access activation
-                                    - Mention you're using the mercury API endpoint
-                                    """)
-                            
-                            # Show debug details
-                            with st.expander("🔍 Debug Details"):
-                                st.json(result)
-                                
-                    except Exception as e:
-                        st.error(f"❌ Unexpected error: {str(e)}")
-                        st.info("Please check your API configuration and try again")
-                        
+            if render_queue is None:
+                st.error(f"❌ Render queue unavailable: {render_queue_error}")
+            elif openai_key and hedra_key:
+                try:
+                    request_id = render_queue.enqueue({
+                        "script_text": script_text,
+                        "aspect_ratio": aspect_ratio,
+                        "voice_id": "default"  # Will use first available voice
+                    }, prospect=f"{contact_name or 'Prospect'} @ {company_name or 'Company'}")
+                    st.session_state.setdefault("video_requests", []).insert(0, request_id)
+                    st.success("✅ Video queued - you can keep working while it renders")
+                except Exception as e:
+                    st.error(f"❌ Unexpected error: {str(e)}")
+                    st.info("Please check your API configuration and try again")
+                    
             else:
                 st.error("Please configure your API keys in the .env file first")
                 
@@ -222,6 +275,31 @@ with col2:
     else:
         st.info("👆 Generate a script first to create your video")
 
+    # Queued and finished videos for this session - one indexed read of the queue per rerun
+    tickets = render_queue.get_many(st.session_state.get("video_requests", [])) if render_queue else []
+    if tickets:
+        st.subheader("🎞️ Your Videos")
+        auto_refresh = st.checkbox("Auto-refresh progress", value=True)
+        for ticket in tickets:
+            elapsed = int(time.time() - ticket["created_at"])
+            if not ticket["done"]:
+                st.progress(ticket["progress"] / 100,
+                            text=f"⏳ {ticket['prospect']}: {ticket['stage']} ({ticket['progress']}%, {elapsed}s)")
+            elif ticket["result"] is None:
+                st.caption(f"🚫 {ticket['prospect']}: {ticket['error'] or ticket['stage']}")
+            else:
+                with st.expander(f"{'✅' if ticket['result']['success'] else '❌'} {ticket['prospect']}",
+                                 expanded=ticket is tickets[0]):
+                    if "script" in ticket["params"] and ticket["result"].get("script"):
+                        st.markdown(f"**Script:** {ticket['result']['script']}")
+                    show_video_result(ticket["result"])
+
 # Footer
 st.markdown("---")
 st.markdown("Built with ❤️ using Streamlit, OpenAI, and Hedra AI")
+
+# Lightweight polling: rerun while this session has requests in flight. Each rerun
+# only reads queue records - the render workers do all the Hedra polling.
+if tickets and auto_refresh and any(not ticket["done"] for ticket in tickets):
+    time.sleep(VIDEO_REFRESH_SECONDS)
+    st.rerun()
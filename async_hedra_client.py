@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Async Hedra API Client - asyncio-native version of HedraClient
+
+One event loop can drive thousands of outstanding Mercury jobs: submits and
+polls are coroutines, and a semaphore bounds how many jobs are in flight.
+"""
+
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from polling import PollStrategy, AdaptiveEtaStrategy
+from job_journal import JobJournal
+from render_cache import RenderCache
+from rate_limiter import ApiGovernor, get_governor
+from retry_policy import RetryPolicy
+from voice_catalog import VoiceCatalog, get_voice_catalog
+from hedra_client import (
+    DEDUP_MAX_AGE,
+    HEDRA_BASE_URL,
+    MAX_MISSING_CHECKS,
+    SubmitFlow,
+    build_character_payload,
+    cached_render_result,
+    give_up_on_job,
+    payload_hash,
+    parse_project_list,
+    interpret_project
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHedraClient:
+    def __init__(self, api_key: str = None, max_concurrency: int = 50, max_connections: int = 20,
+                 poll_strategy: PollStrategy = None, journal: JobJournal = None, render_cache: RenderCache = None,
+                 governor: ApiGovernor = None, retry_policy: RetryPolicy = None, voice_catalog: VoiceCatalog = None):
+        """
+        Initialize async Hedra client
+
+        Args:
+            api_key: Hedra API key (defaults to HEDRA_API_KEY)
+            max_concurrency: Maximum number of jobs submitted and polled at once
+            max_connections: Maximum keep-alive connections to the Mercury API
+            poll_strategy: Decides the wait between status checks (see polling.py)
+            journal: Optional durable record of submitted jobs (see job_journal.py)
+            render_cache: Optional cache of completed renders (see render_cache.py)
+            governor: Rate limits shared with HedraClient (defaults to the one for this API key)
+            retry_policy: Retries transient submit failures (see retry_policy.py)
+            voice_catalog: Cached /v1/voices shared with HedraClient (defaults to the one for this API key)
+        """
+        self.api_key = api_key or os.getenv("HEDRA_API_KEY")
+        if not self.api_key:
+            raise ValueError("HEDRA_API_KEY not found in environment variables")
+
+        self.base_url = HEDRA_BASE_URL
+        self.headers = {
+            "X-API-Key": self.api_key,
+            "Content-Type": "application/json"
+        }
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.poll_strategy = poll_strategy or AdaptiveEtaStrategy()
+        self.journal = journal
+        self.render_cache = render_cache
+        self._governor = governor
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._voice_catalog = voice_catalog
+
+        # Created lazily so they bind to the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=httpx.Timeout(60.0, connect=10.0)
+            )
+        return self._client
+
+    def _slots(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @property
+    def governor(self) -> ApiGovernor:
+        return self._governor or get_governor(self.api_key)
+
+    @property
+    def voice_catalog(self) -> VoiceCatalog:
+        return self._voice_catalog or get_voice_catalog(self.base_url, self.api_key)
+
+    @asynccontextmanager
+    async def _job_slot(self):
+        """Hold one of the governor's in-flight job slots without blocking the loop"""
+        while not self.governor.try_acquire_job_slot():
+            await asyncio.sleep(0.5)
+        try:
+            yield
+        finally:
+            self.governor.release_job_slot()
+
+    async def get_available_voices(self) -> list:
+        """Get list of available voices from /v1/voices (the catalog HedraClient uses, revalidated off the loop)"""
+        return await asyncio.to_thread(self.voice_catalog.voices)
+
+    async def resolve_voice(self, voice_id: str) -> str:
+        """Map "default" or a voice name to a concrete voice id, exactly as HedraClient.resolve_voice"""
+        return await asyncio.to_thread(self.voice_catalog.resolve, voice_id)
+
+    async def submit_video(self, script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9",
+                           prospect: Optional[str] = None, queued_at: Optional[float] = None) -> Dict[str, Any]:
+        """Submit a character job to /v1/characters without waiting for it (retries as HedraClient.submit_video)"""
+        try:
+            logger.info(f"Creating video with script length: {len(script_text)} characters")
+            payload = build_character_payload(script_text, await self.resolve_voice(voice_id), aspect_ratio)
+            flow = SubmitFlow(payload, self.retry_policy, self.journal, prospect, queued_at)
+            existing = flow.start()
+            if existing is None and flow.needs_reconcile:
+                existing = flow.reconcile(await self.list_recent_projects())
+            if existing is not None:
+                return existing
+
+            while True:
+                await asyncio.sleep(self.governor.reserve("submit"))
+                flow.next_attempt()
+                try:
+                    response = await self._http().post(
+                        f"{self.base_url}/v1/characters",
+                        json=payload,
+                        headers=flow.headers(self.headers),
+                        timeout=60
+                    )
+                except Exception as e:
+                    outcome = flow.on_exception(e)
+                else:
+                    self.governor.observe("submit", response.status_code, response.headers.get("Retry-After"))
+                    outcome = flow.on_response(response)
+                if isinstance(outcome, dict):
+                    return outcome
+                await asyncio.sleep(outcome)
+
+        except Exception as e:
+            logger.error(f"Video generation error: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Video generation error: {str(e)}"
+            }
+
+    async def list_recent_projects(self) -> Optional[List[Dict[str, Any]]]:
+        """Recently created projects from GET /v1/projects, or None if they could not be listed"""
+        try:
+            await asyncio.sleep(self.governor.reserve("poll"))
+            response = await self._http().get(f"{self.base_url}/v1/projects", headers=self.headers, timeout=30)
+            self.governor.observe("poll", response.status_code, response.headers.get("Retry-After"))
+            if response.status_code != 200:
+                logger.error(f"Listing projects failed: {response.status_code} - {response.text}")
+                return None
+            return parse_project_list(response.json())
+        except Exception as e:
+            logger.error(f"Listing projects error: {e}")
+            return None
+
+    async def get_project_status(self, job_id: str) -> Dict[str, Any]:
+        """Single status check against /v1/projects/{jobId} (same shape as HedraClient.get_project_status)"""
+        try:
+            await asyncio.sleep(self.governor.reserve("poll"))
+            response = await self._http().get(f"{self.base_url}/v1/projects/{job_id}", headers=self.headers, timeout=30)
+            self.governor.observe("poll", response.status_code, response.headers.get("Retry-After"))
+
+            if response.status_code != 200:
+                logger.error(f"Status check failed: {response.status_code} - {response.text}")
+                return {"done": False, "error": response.text, "status_code": response.status_code}
+
+            check = interpret_project(job_id, response.json())
+            if self.journal is not None:
+                self.journal.record_check(job_id, check)
+            return check
+
+        except Exception as e:
+            logger.error(f"Status check error: {e}")
+            return {"done": False, "error": str(e)}
+
+    async def wait_for_completion(self, job_id: str, max_wait_time: int = 300) -> Dict[str, Any]:
+        """Poll /v1/projects/{jobId} without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait_time
+        state = self.poll_strategy.begin(job_id)
+        missing = 0
+
+        while loop.time() < deadline:
+            check = await self.get_project_status(job_id)
+            state.record(check)
+            if check["done"]:
+                result = check["result"]
+                result["polling"] = self.poll_strategy.finish(state, result["success"])
+                return result
+            missing = missing + 1 if check.get("status_code") == 404 else 0
+            if missing >= MAX_MISSING_CHECKS:
+                result = give_up_on_job(self.journal, job_id, "Abandoned",
+                                        f"Job {job_id} not found on Hedra ({missing} checks in a row)")
+                result["polling"] = self.poll_strategy.finish(state, False)
+                return result
+            delay = self.poll_strategy.next_delay(state, check)
+            await asyncio.sleep(max(0.0, min(delay, deadline - loop.time())))
+
+        result = give_up_on_job(self.journal, job_id, "TimedOut",
+                                f"Video generation timed out after {max_wait_time} seconds")
+        result["polling"] = self.poll_strategy.finish(state, False)
+        return result
+
+    async def create_video_complete(self, script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9",
+                                    max_wait_time: int = 300) -> Dict[str, Any]:
+        """Submit a job and wait for it, holding one of the bounded concurrency slots"""
+        # Resolved before hashing so cache and dedup keys match HedraClient's
+        voice_id = await self.resolve_voice(voice_id)
+        request_hash = payload_hash(build_character_payload(script_text, voice_id, aspect_ratio))
+        if self.render_cache is not None:
+            cached = self.render_cache.get(request_hash)
+            if cached:
+                return cached_render_result(cached)
+
+        async with self._slots():
+            pending = self.journal.find_unfinished(request_hash, max_age=DEDUP_MAX_AGE) if self.journal is not None else None
+            if pending:
+                logger.info(f"Reattaching to in-flight job {pending['job_id']} for identical payload")
+                result = await self.wait_for_completion(pending["job_id"], max_wait_time)
+            else:
+                async with self._job_slot():
+                    submitted = await self.submit_video(script_text, voice_id, aspect_ratio)
+                    if not submitted["success"]:
+                        return submitted
+                    result = await self.wait_for_completion(submitted["job_id"], max_wait_time)
+
+        if self.render_cache is not None:
+            self.render_cache.put(request_hash, result)
+        return result
+
+    async def create_videos(self, scripts: List[str], voice_id: str = "default", aspect_ratio: str = "16:9",
+                            max_wait_time: int = 300) -> List[Dict[str, Any]]:
+        """Render many scripts concurrently; results are returned in input order"""
+        return await asyncio.gather(*[
+            self.create_video_complete(script, voice_id, aspect_ratio, max_wait_time)
+            for script in scripts
+        ])
+
+    async def download_video(self, video_url: str, output_filename: str = "hedra_video.mp4") -> Dict[str, Any]:
+        """Download video from URL without blocking the event loop on the network"""
+        try:
+            logger.info(f"Downloading video from: {video_url}")
+
+            await asyncio.sleep(self.governor.reserve("download"))
+            async with self._http().stream("GET", video_url, timeout=60) as response:
+                response.raise_for_status()
+                with open(output_filename, 'wb') as f:
+                    async for chunk in response.aiter_bytes(chunk_size=65536):
+                        f.write(chunk)
+
+            if self.render_cache is not None:
+                self.render_cache.record_download(video_url, output_filename)
+
+            logger.info(f"Video downloaded successfully: {output_filename}")
+            return {
+                "success": True,
+                "video_path": output_filename,
+                "message": f"Video downloaded: {output_filename}"
+            }
+
+        except Exception as e:
+            logger.error(f"Download error: {str(e)}")
+            return {
+                "success": False,
+                "error": f"Download error: {str(e)}"
+            }
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Bulk campaign script generation
+
+Reads a prospect table (CSV or Parquet) in chunks, generates one sales script
+per row with a bounded worker pool and a shared token bucket, and appends each
+result to a JSONL file as soon as it is ready. The output file doubles as the
+checkpoint: rerunning the same command skips prospects that already have a
+script, so a crash or Ctrl-C resumes where it stopped.
+
+Usage:
+    python campaign.py prospects.csv -o scripts.jsonl --workers 8 --rate 2
+    python campaign.py prospects.csv -o scripts.jsonl --batch    # overnight, via the Batch API
+    python campaign.py prospects.csv -o scripts.jsonl --template # one model call per offer
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import itertools
+import argparse
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set
+
+import openai
+import pandas as pd
+
+from rate_limiter import TokenBucket, parse_retry_after
+from retry_policy import RetryBudget, RetryPolicy
+from script_generator import BATCH_MAX_REQUESTS, ScriptGenerator
+from script_templates import MasterTemplate, TemplateError
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ("company_name", "contact_name", "product_service", "key_benefits", "call_to_action")
+OPTIONAL_COLUMNS = ("prospect_id", "tone", "duration")
+
+# OpenAI errors worth another attempt (429, 5xx, dropped connections and timeouts)
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+def prospect_id(row: Dict[str, Any]) -> str:
+    """Stable id for a prospect row: its prospect_id column, else a hash of the script inputs"""
+    if row.get("prospect_id"):
+        return str(row["prospect_id"])
+    fields = {column: row.get(column, "") for column in REQUIRED_COLUMNS + ("tone", "duration")}
+    canonical = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def read_prospects(path: str, chunksize: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Yield prospect rows from a CSV or Parquet file without loading it all at once
+
+    Args:
+        path: .csv (optionally compressed) or .parquet file
+        chunksize: Rows read per chunk
+
+    Raises:
+        ValueError: If a required column is missing
+        ImportError: If path is Parquet and pyarrow is not installed
+    """
+    if path.lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq  # optional: only needed for Parquet input
+        except ImportError as e:
+            raise ImportError("Reading .parquet prospect files needs pyarrow: pip install pyarrow") from e
+        parquet = pq.ParquetFile(path)
+        chunks = (batch.to_pandas() for batch in parquet.iter_batches(batch_size=chunksize))
+    else:
+        chunks = pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Prospect table {path} is missing columns: {', '.join(missing)}")
+        columns = [column for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if column in chunk.columns]
+        for record in chunk[columns].to_dict("records"):
+            yield {key: "" if pd.isna(value) else str(value).strip() for key, value in record.items()}
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Prospect ids that already have a successful script in output_path"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash; that prospect is simply redone
+            if record.get("status") == "ok":
+                done.add(record["prospect_id"])
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _load_batch_state(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_batch_state(path: str, batches: List[Dict[str, Any]]):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(batches, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class CampaignRunner:
+    def __init__(self,
+                 generator: Optional[ScriptGenerator] = None,
+                 max_workers: int = 8,
+                 requests_per_second: float = 2.0,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 default_tone: str = "professional",
+                 default_duration: str = "60-90 seconds",
+                 use_templates: bool = False,
+                 personalize: bool = False):
+        """
+        Args:
+            generator: Script generator to use (a new one by default)
+            max_workers: Concurrent OpenAI requests
+            requests_per_second: Sustained OpenAI request rate; halves on 429 and recovers
+            retry_policy: Backoff for transient OpenAI errors (own retry budget by default)
+            default_tone: Tone for rows without a tone column value
+            default_duration: Duration for rows without a duration column value
+            use_templates: Generate one master script per product/offer and fill in each
+                           prospect's names locally instead of one model call per prospect
+            personalize: With use_templates, run a cheap per-prospect polish on each script
+        """
+        self.generator = generator or ScriptGenerator()
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(requests_per_second, capacity=max(1.0, requests_per_second * 2))
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=4, budget=RetryBudget())
+        self.default_tone = default_tone
+        self.default_duration = default_duration
+        self.use_templates = use_templates
+        self.personalize = personalize
+        self._templates: Dict[tuple, Future] = {}  # offer -> Future of its MasterTemplate (or TemplateError)
+        self._templates_lock = threading.Lock()
+
+    def _generate(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the script for one prospect, retrying transient errors"""
+        record = {
+            "prospect_id": prospect_id(row),
+            "company_name": row["company_name"],
+            "contact_name": row["contact_name"]
+        }
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            # Rendering from a template is local; only the per-prospect polish costs a call
+            if not self.use_templates or self.personalize:
+                self.bucket.acquire()
+            self.retry_policy.budget.record_call()
+            try:
+                if self.use_templates:
+                    template = self._template_for(row)
+                    script = template.render(row)
+                    if self.personalize:
+                        script = self.generator.personalize_script(script, row["company_name"], row["contact_name"],
+                                                                   raise_errors=True)
+                    record["template_id"] = template.template_id
+                else:
+                    script = self.generator.generate_sales_script(
+                        company_name=row["company_name"],
+                        contact_name=row["contact_name"],
+                        product_service=row["product_service"],
+                        key_benefits=row["key_benefits"],
+                        call_to_action=row["call_to_action"],
+                        tone=row.get("tone") or self.default_tone,
+                        duration=row.get("duration") or self.default_duration,
+                        raise_errors=True
+                    )
+                self.bucket.succeed()
+                record.update({"status": "ok", "script": script})
+                if not self.use_templates or self.personalize:
+                    record["model"] = self.generator.last_model
+                break
+            except RETRYABLE_ERRORS as e:
+                retry_after = None
+                if isinstance(e, openai.APIStatusError):
+                    retry_after = e.response.headers.get("retry-after")
+                if isinstance(e, openai.RateLimitError):
+                    self.bucket.throttle(parse_retry_after(retry_after))
+                if not self.retry_policy.allow(attempt):
+                    record.update({"status": "failed", "error": str(e)})
+                    break
+                delay = self.retry_policy.backoff(attempt, retry_after)
+                logger.info(f"Prospect {record['prospect_id']}: {type(e).__name__}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+            except Exception as e:
+                record.update({"status": "failed", "error": str(e)})
+                break
+
+        record["attempts"] = attempt
+        record["seconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    def _template_for(self, row: Dict[str, Any]) -> MasterTemplate:
+        """The master template for this row's offer, generated on first use"""
+        offer = (row["product_service"], row["key_benefits"], row["call_to_action"],
+                 row.get("tone") or self.default_tone, row.get("duration") or self.default_duration)
+        with self._templates_lock:
+            future = self._templates.get(offer)
+            owner = future is None
+            if owner:
+                future = self._templates[offer] = Future()
+        if owner:
+            # Generated outside the lock: rows for other offers don't wait on this call,
+            # rows for the same offer wait on the future
+            try:
+                template = self.generator.generate_master_template(*offer)
+                logger.info(f"Master template {template.template_id} for {offer[0][:40]}")
+                future.set_result(template)
+            except TemplateError as e:
+                future.set_exception(e)  # don't pay for the same failure on every row
+            except Exception as e:
+                with self._templates_lock:
+                    del self._templates[offer]  # transient (e.g. network) error: a later row retries
+                future.set_exception(e)
+        return future.result()
+
+    def run(self, prospects: Iterable[Dict[str, Any]], output_path: str, resume: bool = True) -> Dict[str, Any]:
+        """
+        Generate scripts for every prospect and append them to output_path as JSONL
+
+        At most 2 x max_workers rows are held in memory at a time; each result is
+        written and flushed as soon as it finishes, in completion order.
+
+        Args:
+            prospects: Rows as produced by read_prospects
+            output_path: JSONL file to append to (also the resume checkpoint)
+            resume: Skip prospects already marked "ok" in output_path (False truncates it)
+
+        Returns:
+            Run statistics
+        """
+        done = load_checkpoint(output_path) if resume else set()
+        stats = {"succeeded": 0, "failed": 0, "skipped": 0}
+        started = time.perf_counter()
+
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+
+        def write(future):
+            record = future.result()
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            stats["succeeded" if record["status"] == "ok" else "failed"] += 1
+            written = stats["succeeded"] + stats["failed"]
+            if written % 50 == 0:
+                logger.info(f"{written} scripts written ({stats['failed']} failed)")
+
+        with open(output_path, "a" if resume else "w", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if resume and out.tell() and not _ends_with_newline(output_path):
+                out.write("\n")  # don't glue the next record onto a line cut short by a crash
+
+            pending = set()
+            try:
+                for row in prospects:
+                    pid = prospect_id(row)
+                    if pid in done:
+                        stats["skipped"] += 1
+                        continue
+                    done.add(pid)  # duplicate rows in the table are generated once
+
+                    while len(pending) >= self.max_workers * 2:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            write(future)
+                    pending.add(pool.submit(self._generate, row))
+            except BaseException:
+                # On Ctrl-C drop queued rows but keep whatever is already being generated
+                for future in pending:
+                    future.cancel()
+                raise
+            finally:
+                for future in as_completed(pending):
+                    if not future.cancelled():
+                        write(future)
+
+        stats["seconds"] = round(time.perf_counter() - started, 2)
+        stats["rate_limiter"] = self.bucket.stats()
+        stats["retry_budget"] = self.retry_policy.budget.stats()
+        return stats
+
+    def run_batch(self, prospects: Iterable[Dict[str, Any]], output_path: str, resume: bool = True,
+                  batch_size: int = BATCH_MAX_REQUESTS, poll_interval: float = 60) -> Dict[str, Any]:
+        """
+        Generate scripts through the OpenAI Batch API instead of live requests
+
+        Prospects are written to batch input files of up to batch_size requests and
+        submitted as batch jobs, which are not subject to per-minute request limits and
+        cost less; results usually arrive within hours. Submitted batches are recorded
+        in <output_path>.batches.json, so a rerun waits for them instead of paying for
+        the same prospects again. Records have the same shape as run()'s, minus the
+        company/contact columns (join on prospect_id).
+
+        Args:
+            prospects: Rows as produced by read_prospects
+            output_path: JSONL file to append to (also the resume checkpoint)
+            resume: Skip finished prospects and reattach to submitted batches
+            batch_size: Requests per batch job
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            Run statistics
+        """
+        state_path = output_path + ".batches.json"
+        batches = _load_batch_state(state_path) if resume else []
+        done = load_checkpoint(output_path) if resume else set()
+        stats = {"succeeded": 0, "failed": 0, "skipped": 0, "batches": 0}
+        started = time.perf_counter()
+
+        # Prospects already sitting in a submitted batch are collected, not resubmitted
+        for entry in batches:
+            if not entry["collected"]:
+                with open(entry["batch_path"], encoding="utf-8") as f:
+                    done.update(json.loads(line)["custom_id"] for line in f)
+
+        def pending_requests():
+            for row in prospects:
+                pid = prospect_id(row)
+                if pid in done:
+                    stats["skipped"] += 1
+                    continue
+                done.add(pid)
+                yield pid, {
+                    "company_name": row["company_name"],
+                    "contact_name": row["contact_name"],
+                    "product_service": row["product_service"],
+                    "key_benefits": row["key_benefits"],
+                    "call_to_action": row["call_to_action"],
+                    "tone": row.get("tone") or self.default_tone,
+                    "duration": row.get("duration") or self.default_duration
+                }
+
+        requests = pending_requests()
+        while True:
+            batch_path = f"{output_path}.batch{len(batches) + 1}.jsonl"
+            count = self.generator.write_script_batch(itertools.islice(requests, batch_size), batch_path)
+            if not count:
+                os.remove(batch_path)
+                break
+            submitted = self.generator.submit_script_batch(batch_path, metadata={"source": "campaign"})
+            if not submitted["success"]:
+                raise RuntimeError(submitted["error"])
+            batches.append({"batch_id": submitted["batch_id"], "batch_path": batch_path, "collected": False})
+            _save_batch_state(state_path, batches)
+            logger.info(f"Batch {submitted['batch_id']}: {count} prospects")
+
+        with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+            if resume and out.tell() and not _ends_with_newline(output_path):
+                out.write("\n")
+            for entry in batches:
+                if entry["collected"]:
+                    continue
+                batch = self.generator.wait_for_script_batch(entry["batch_id"], poll_interval=poll_interval)
+                if not batch["success"]:
+                    logger.error(batch["error"])
+                    continue  # left uncollected: the next run checks it again
+                for item in self.generator.script_batch_results(batch, entry["batch_path"]):
+                    record = {"prospect_id": item["custom_id"], "batch_id": entry["batch_id"]}
+                    if item["success"]:
+                        record.update({"status": "ok", "script": item["script"]})
+                        stats["succeeded"] += 1
+                    else:
+                        record.update({"status": "failed", "error": item["error"]})
+                        stats["failed"] += 1
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                entry["collected"] = True
+                _save_batch_state(state_path, batches)
+                stats["batches"] += 1
+
+        stats["seconds"] = round(time.perf_counter() - started, 2)
+        return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate sales scripts for a prospect table")
+    parser.add_argument("prospects", help="CSV or Parquet file with columns: " + ", ".join(REQUIRED_COLUMNS))
+    parser.add_argument("-o", "--output", help="JSONL output / checkpoint file (default: <prospects>_scripts.jsonl)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent OpenAI requests")
+    parser.add_argument("--rate", type=float, default=2.0, help="OpenAI requests per second")
+    parser.add_argument("--chunksize", type=int, default=1000, help="Rows read from the table at a time")
+    parser.add_argument("--tone", default="professional", help="Tone for rows without one")
+    parser.add_argument("--duration", default="60-90 seconds", help="Duration for rows without one")
+    parser.add_argument("--batch", action="store_true",
+                        help="Use the OpenAI Batch API (cheaper, no per-minute limits, results within 24h)")
+    parser.add_argument("--poll-interval", type=float, default=60, help="Seconds between batch status checks")
+    parser.add_argument("--template", action="store_true",
+                        help="One master script per offer, names filled in locally (1 model call instead of N)")
+    parser.add_argument("--personalize", action="store_true", help="With --template, polish each script per prospect")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and overwrite the output")
+    args = parser.parse_args(argv)
+    if args.template and args.batch:
+        parser.error("--template and --batch are alternatives; choose one")
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    output = args.output or os.path.splitext(args.prospects)[0] + "_scripts.jsonl"
+    runner = CampaignRunner(max_workers=args.workers, requests_per_second=args.rate,
+                            default_tone=args.tone, default_duration=args.duration,
+                            use_templates=args.template, personalize=args.personalize)
+    prospects = read_prospects(args.prospects, chunksize=args.chunksize)
+    if args.batch:
+        stats = runner.run_batch(prospects, output, resume=not args.restart, poll_interval=args.poll_interval)
+    else:
+        stats = runner.run(prospects, output, resume=not args.restart)
+
+    print(f"✅ {stats['succeeded']} scripts written to {output} "
+          f"({stats['failed']} failed, {stats['skipped']} already done) in {stats['seconds']}s")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable video downloads
+
+Large renders are fetched as parallel HTTP Range requests into a preallocated
+".part" file. Finished ranges are recorded in a sidecar state file so an
+interrupted download resumes where it stopped. Servers that don't advertise
+Accept-Ranges (or ignore the Range header) get a plain single-stream download.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+import requests
+
+from http_transport import get_session
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadError(Exception):
+    pass
+
+
+class RangeNotSupported(DownloadError):
+    pass
+
+
+class RangedDownloader:
+    def __init__(self,
+                 parts: int = 4,
+                 piece_size: int = 4 * 1024 * 1024,
+                 min_ranged_size: int = 8 * 1024 * 1024,
+                 session_factory: Callable[[], requests.Session] = get_session):
+        """
+        Args:
+            parts: Number of parallel Range requests
+            piece_size: Bytes per Range request (also the resume granularity)
+            min_ranged_size: Smaller files are fetched in a single stream
+            session_factory: Returns the (thread-local) session to use
+        """
+        self.parts = parts
+        self.piece_size = piece_size
+        self.min_ranged_size = min_ranged_size
+        self.session_factory = session_factory
+
+    def download(self, url: str, output_path: str, expected_sha256: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Download url to output_path
+
+        Returns:
+            {"bytes", "seconds", "throughput_mbps", "sha256", "ranged", "resumed"}
+        Raises:
+            DownloadError when the length or checksum does not verify
+        """
+        start = time.time()
+        part_path = output_path + ".part"
+        state_path = output_path + ".part.json"
+
+        # Probe with a one-byte ranged GET rather than HEAD: presigned video URLs are usually GET-only
+        probe = self.session_factory().get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=60)
+        probe.raise_for_status()
+        size, etag = _probe_size(probe), probe.headers.get("ETag")
+        ranged = probe.status_code == 206 and size >= self.min_ranged_size
+
+        resumed = False
+        if ranged:
+            probe.close()
+            try:
+                resumed = self._download_ranged(url, part_path, state_path, size, etag)
+            except RangeNotSupported as e:
+                logger.warning(f"{e} - falling back to single-stream download")
+                ranged = False
+                if os.path.exists(state_path):
+                    os.remove(state_path)
+                probe = None
+        if not ranged:
+            if probe is not None and probe.status_code == 200:
+                self._write_stream(probe, part_path)  # server ignored Range - the probe is the full body
+            else:
+                if probe is not None:
+                    probe.close()
+                response = self.session_factory().get(url, stream=True, timeout=60)
+                response.raise_for_status()
+                size = int(response.headers.get("Content-Length", 0))
+                self._write_stream(response, part_path)
+
+        actual_size = os.path.getsize(part_path)
+        if size and actual_size != size:
+            raise DownloadError(f"Length mismatch: expected {size} bytes, got {actual_size}")
+
+        digest = _sha256_file(part_path)
+        if expected_sha256 and digest != expected_sha256.lower():
+            os.remove(part_path)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            raise DownloadError(f"Checksum mismatch: expected {expected_sha256}, got {digest}")
+
+        os.replace(part_path, output_path)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+        seconds = max(time.time() - start, 1e-6)
+        return {
+            "bytes": actual_size,
+            "seconds": round(seconds, 3),
+            "throughput_mbps": round(actual_size * 8 / seconds / 1e6, 2),
+            "sha256": digest,
+            "ranged": ranged,
+            "resumed": resumed
+        }
+
+    def _write_stream(self, response: requests.Response, part_path: str):
+        with open(part_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=256 * 1024):
+                f.write(chunk)
+
+    def _download_ranged(self, url: str, part_path: str, state_path: str, size: int, etag: Optional[str]) -> bool:
+        """Fetch all missing pieces in parallel; returns True if an earlier partial download was resumed"""
+        state = _load_state(state_path)
+        resumed = bool(state and state["url"] == url and state["size"] == size
+                       and state.get("etag") == etag and os.path.exists(part_path))
+        if not resumed:
+            state = {"url": url, "size": size, "etag": etag, "done": []}
+            with open(part_path, "wb") as f:
+                f.truncate(size)  # preallocate
+            _save_state(state_path, state)
+        else:
+            logger.info(f"Resuming download with {len(state['done'])} pieces already on disk")
+
+        done = {tuple(piece) for piece in state["done"]}
+        pieces = [p for p in self._pieces(size) if p not in done]
+        lock = threading.Lock()
+        # Set once any piece fails (e.g. the server refuses a range): queued pieces are
+        # cancelled and in-flight ones stop reading instead of finishing a doomed download
+        abort = threading.Event()
+
+        def fetch(piece: Tuple[int, int]):
+            if abort.is_set():
+                return
+            first, last = piece
+            with self.session_factory().get(url, headers={"Range": f"bytes={first}-{last}"},
+                                            stream=True, timeout=60) as response:
+                if response.status_code != 206:
+                    # Not read: a 200 here would be the whole file
+                    raise RangeNotSupported(f"Server ignored Range request (HTTP {response.status_code})")
+                content = bytearray()
+                for chunk in response.iter_content(chunk_size=256 * 1024):
+                    if abort.is_set():
+                        return
+                    content += chunk
+            if len(content) != last - first + 1:
+                raise DownloadError(f"Short range {first}-{last}: got {len(content)} bytes")
+            with open(part_path, "r+b") as f:
+                f.seek(first)
+                f.write(content)
+            with lock:
+                state["done"].append([first, last])
+                _save_state(state_path, state)
+
+        pool = ThreadPoolExecutor(max_workers=self.parts)
+        try:
+            for future in as_completed([pool.submit(fetch, piece) for piece in pieces]):
+                future.result()
+        except BaseException:
+            abort.set()
+            raise
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return resumed
+
+    def _pieces(self, size: int) -> List[Tuple[int, int]]:
+        return [(first, min(first + self.piece_size, size) - 1) for first in range(0, size, self.piece_size)]
+
+
+def _probe_size(response: requests.Response) -> int:
+    """Total size from a Content-Range ("bytes 0-0/1234") or Content-Length header"""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    if response.status_code == 200:
+        return int(response.headers.get("Content-Length", 0))
+    return 0
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_state(state_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_state(state_path: str, state: Dict[str, Any]):
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
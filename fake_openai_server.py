@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI API
+
+Implements just enough of /v1 for the script generator to run without a real
+key or network: chat completions (plain and streamed), model listing, file
+upload/download and Batch API jobs. Batches finish after a configurable delay
+and answer every request with a canned script, so batch campaigns can be
+exercised end to end in seconds.
+
+Usage:
+    python fake_openai_server.py --port 8089
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=sk-test python campaign.py prospects.csv --batch
+
+test_script_batch.py starts its own instance on a free port.
+"""
+
+import re
+import json
+import time
+import uuid
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Optional, Set
+
+
+def canned_script(body: Dict[str, Any]) -> str:
+    """Deterministic reply naming the target company and contact from the prompt, if it has them"""
+    prompt = body["messages"][-1]["content"]
+    company = re.search(r"Target Company: (.+)", prompt)
+    contact = re.search(r"Contact Person: (.+)", prompt)
+    return (f"Hi {contact.group(1).strip() if contact else 'there'}! I made this short video for "
+            f"{company.group(1).strip() if company else 'your team'}. Let's talk this week.")
+
+
+class FakeOpenAIServer:
+    def __init__(self, port: int = 0, batch_delay: float = 1.0, fail_ids: Optional[Set[str]] = None):
+        """
+        Args:
+            port: Port to listen on (0 picks a free one)
+            batch_delay: Seconds a batch stays in_progress before completing
+            fail_ids: custom_ids the batch answers with an error instead of a script
+        """
+        self.batch_delay = batch_delay
+        self.fail_ids = fail_ids or set()
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._submitted: Dict[str, float] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _batch_view(self, batch_id: str) -> Dict[str, Any]:
+        """Advance a batch through validating -> in_progress -> completed as time passes"""
+        with self._lock:
+            batch = self.batches[batch_id]
+            if batch["status"] != "completed" and time.time() - self._submitted[batch_id] >= self.batch_delay:
+                self._complete_batch(batch)
+            elif batch["status"] == "validating":
+                batch["status"] = "in_progress"
+            return dict(batch)
+
+    def _complete_batch(self, batch: Dict[str, Any]):
+        output, errors = [], []
+        for line in self.files[batch["input_file_id"]].decode("utf-8").splitlines():
+            request = json.loads(line)
+            if request["custom_id"] in self.fail_ids:
+                errors.append({"id": f"req_{uuid.uuid4().hex[:12]}", "custom_id": request["custom_id"],
+                               "response": None, "error": {"code": "server_error", "message": "Stand-in failure"}})
+                continue
+            output.append({
+                "id": f"req_{uuid.uuid4().hex[:12]}",
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "request_id": uuid.uuid4().hex,
+                             "body": _completion(request["body"])},
+                "error": None
+            })
+        batch["output_file_id"] = self._store_lines(output)
+        batch["error_file_id"] = self._store_lines(errors) if errors else None
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+        batch["request_counts"] = {"total": len(output) + len(errors), "completed": len(output), "failed": len(errors)}
+
+    def _store_lines(self, items) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        self.files[file_id] = "".join(json.dumps(item) + "\n" for item in items).encode("utf-8")
+        return file_id
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, obj, status: int = 200, content_type: str = "application/json"):
+                body = obj if isinstance(obj, bytes) else json.dumps(obj).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if self.path.endswith("/models"):
+                    return self._send({"object": "list", "data": [
+                        {"id": model, "object": "model", "created": 0, "owned_by": "stand-in"}
+                        for model in ("gpt-4", "gpt-3.5-turbo")
+                    ]})
+                match = re.search(r"/files/([^/]+)/content$", self.path)
+                if match and match.group(1) in server.files:
+                    return self._send(server.files[match.group(1)], content_type="application/octet-stream")
+                match = re.search(r"/batches/([^/?]+)$", self.path)
+                if match and match.group(1) in server.batches:
+                    return self._send(server._batch_view(match.group(1)))
+                self._send({"error": {"message": "Not found"}}, 404)
+
+            def do_POST(self):
+                with server._lock:
+                    server.requests += 1
+                body = self._body()
+                if self.path.endswith("/chat/completions"):
+                    return self._chat(json.loads(body))
+                if self.path.endswith("/files"):
+                    return self._upload(body)
+                if self.path.endswith("/batches"):
+                    return self._create_batch(json.loads(body))
+                self._send({"error": {"message": "Not found"}}, 404)
+
+            def _chat(self, request: Dict[str, Any]):
+                if not request.get("stream"):
+                    return self._send(_completion(request))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for word in canned_script(request).split(" "):
+                    chunk = {"id": "chatcmpl-stand-in", "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": request["model"],
+                             "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]}
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, text: str):
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _upload(self, body: bytes):
+                header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+                message = BytesParser(policy=HTTP).parsebytes(header + body)
+                fields = {part.get_param("name", header="content-disposition"): part
+                          for part in message.iter_parts()}
+                content = fields["file"].get_payload(decode=True)
+                file_id = f"file-{uuid.uuid4().hex[:24]}"
+                with server._lock:
+                    server.files[file_id] = content
+                self._send({"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                            "filename": fields["file"].get_filename(), "purpose": fields["purpose"].get_content(),
+                            "status": "processed"})
+
+            def _create_batch(self, request: Dict[str, Any]):
+                if request["input_file_id"] not in server.files:
+                    return self._send({"error": {"message": "No such file"}}, 400)
+                batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+                batch = {"id": batch_id, "object": "batch", "endpoint": request["endpoint"],
+                         "input_file_id": request["input_file_id"], "completion_window": request["completion_window"],
+                         "status": "validating", "created_at": int(time.time()), "output_file_id": None,
+                         "error_file_id": None, "metadata": request.get("metadata"),
+                         "request_counts": {"total": 0, "completed": 0, "failed": 0}}
+                with server._lock:
+                    server.batches[batch_id] = batch
+                    server._submitted[batch_id] = time.time()
+                self._send(batch)
+
+        return Handler
+
+
+def _completion(request: Dict[str, Any]) -> Dict[str, Any]:
+    text = canned_script(request)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request["model"],
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": len(text.split()), "total_tokens": 100 + len(text.split())}
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the OpenAI API")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--batch-delay", type=float, default=5.0, help="Seconds before a batch completes")
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(port=args.port, batch_delay=args.batch_delay)
+    print(f"🧪 Stand-in OpenAI API at {fake.base_url} (Ctrl-C to stop)")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cached provider health checks
+
+The app used to call OpenAI (with a paid completion) on every Streamlit rerun
+before the page could render. Health is now probed with zero-token endpoints
+(OpenAI /v1/models, Hedra /v1/voices), cached per provider and API key for all
+sessions in the process (and on disk for restarts), and refreshed on a
+background thread once stale, so the page always renders from the last known
+status.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEALTH_PATH = os.getenv("PROVIDER_HEALTH_PATH", os.path.join(".video_state", "provider_health.json"))
+
+
+def _probe_openai(api_key: str) -> Dict[str, Any]:
+    from openai_client import OpenAIClient
+    return OpenAIClient(api_key=api_key).test_connection()
+
+
+def _probe_hedra(api_key: str) -> Dict[str, Any]:
+    from hedra_client import HedraClient
+    return HedraClient(api_key=api_key).test_connection()
+
+
+PROBES: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "openai": _probe_openai,
+    "hedra": _probe_hedra
+}
+
+
+def _key_id(provider: str, api_key: str) -> str:
+    return f"{provider}:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]}"
+
+
+class HealthMonitor:
+    def __init__(self,
+                 ttl: float = 300.0,
+                 failure_ttl: float = 30.0,
+                 path: Optional[str] = DEFAULT_HEALTH_PATH,
+                 probes: Optional[Dict[str, Callable[[str], Dict[str, Any]]]] = None):
+        """
+        Args:
+            ttl: Seconds a healthy result is fresh
+            failure_ttl: Seconds a failed result is fresh (short, so recovery shows quickly)
+            path: JSON file the results persist to across restarts (None for memory only)
+            probes: provider -> fn(api_key) returning {"success", "message"/"error"}
+        """
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.path = path
+        self.probes = probes or PROBES
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def status(self, provider: str, api_key: Optional[str]) -> Dict[str, Any]:
+        """
+        Last known health for provider/api_key, without waiting on the network
+
+        A missing or stale result schedules a background refresh. Returns a dict with
+        success (None while the first check is running), message or error,
+        checked_at and stale.
+        """
+        if not api_key:
+            return {"success": False, "error": "API key missing", "checked_at": None, "stale": False}
+
+        key = _key_id(provider, api_key)
+        with self._lock:
+            result = self._results.get(key)
+        if result is None:
+            self._refresh_in_background(provider, api_key)
+            return {"success": None, "message": "Checking connection...", "checked_at": None, "stale": True}
+
+        ttl = self.ttl if result["success"] else self.failure_ttl
+        stale = time.time() - result["checked_at"] >= ttl
+        if stale:
+            self._refresh_in_background(provider, api_key)
+        return {**result, "stale": stale}
+
+    def refresh(self, provider: str, api_key: str) -> Dict[str, Any]:
+        """Probe now and cache the result"""
+        started = time.perf_counter()
+        try:
+            result = self.probes[provider](api_key)
+        except Exception as e:
+            result = {"success": False, "error": f"Connection failed: {str(e)}"}
+        result = {**result, "checked_at": time.time(), "latency": round(time.perf_counter() - started, 3)}
+
+        with self._lock:
+            self._results[_key_id(provider, api_key)] = result
+            self._save()
+        if not result["success"]:
+            logger.warning(f"{provider} health check failed: {result.get('error')}")
+        return result
+
+    def _refresh_in_background(self, provider: str, api_key: str):
+        key = _key_id(provider, api_key)
+        with self._lock:
+            if key in self._refreshing:
+                return  # one probe per provider/key at a time, however many sessions ask
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(provider, api_key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"health-{provider}", daemon=True).start()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self._results = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable health cache {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._results, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist health cache: {e}")
+
+
+_default_monitor: Optional[HealthMonitor] = None
+_default_lock = threading.Lock()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Process-wide monitor shared by every Streamlit session"""
+    global _default_monitor
+    with _default_lock:
+        if _default_monitor is None:
+            _default_monitor = HealthMonitor()
+        return _default_monitor
@@ -4,98 +4,442 @@ Hedra API Client - FINAL VERSION using Official OpenAPI Spec
 """
 
 import os
+import json
 import time
+import hashlib
 import requests
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
+
+from http_transport import get_session, get_transport_stats
+from polling import PollStrategy, AdaptiveEtaStrategy
+from job_journal import JobJournal
+from render_cache import RenderCache
+from downloader import RangedDownloader
+from voice_catalog import VoiceCatalog, get_voice_catalog
+from rate_limiter import ApiGovernor, get_governor
+from retry_policy import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+HEDRA_BASE_URL = "https://mercury.dev.dream-ai.com/api"
+AVATAR_PROMPT = "Professional business person presenting, confident smile, business attire, clean background"
+
+# Only jobs submitted this recently are reattached to instead of resubmitted; anything
+# older is long past every render timeout and assumed dead
+DEDUP_MAX_AGE = 3600
+
+# Consecutive 404s from /v1/projects/{jobId} after which a job is given up as Abandoned
+MAX_MISSING_CHECKS = 3
+
+# Seconds an ambiguous submit gets to show up in /v1/projects before it counts as lost
+RECONCILE_GRACE_SECONDS = 120
+
+
+def build_character_payload(script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9") -> Dict[str, Any]:
+    """OFFICIAL /v1/characters payload structure from OpenAPI spec"""
+    return {
+        "text": script_text,
+        "audioSource": "tts",  # Use built-in TTS
+        "voiceId": voice_id,
+        "aspectRatio": aspect_ratio,
+        "avatarImageInput": {
+            "seed": 42,
+            "prompt": AVATAR_PROMPT
+        }
+    }
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """Canonical SHA-256 of a Mercury payload - identical requests hash identically"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cached_render_result(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Result dict for a render served from the cache (same shape as a fresh one)"""
+    result = {
+        "success": True,
+        "video_url": entry["video_url"],
+        "job_id": entry["job_id"],
+        "status": "Completed",
+        "message": "Video served from render cache",
+        "cached": True
+    }
+    if entry.get("local_path"):
+        result["video_path"] = entry["local_path"]
+    return result
+
+
+def interpret_submit_response(status_code: int, text: str, job_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn a /v1/characters response into a result dict carrying the jobId"""
+    if status_code == 429:
+        return {
+            "success": False,
+            "error": f"Video generation failed: rate limited by Hedra (HTTP 429) - {text}",
+            "status_code": status_code,
+            "rate_limited": True
+        }
+    
+    if status_code != 200:
+        return {
+            "success": False,
+            "error": f"Video generation failed: {text}",
+            "status_code": status_code
+        }
+    
+    job_id = (job_data or {}).get("jobId")
+    if not job_id:
+        return {
+            "success": False,
+            "error": "No jobId returned from API",
+            "response": job_data
+        }
+    
+    logger.info(f"Video generation started! Job ID: {job_id}")
+    return {"success": True, "job_id": job_id}
+
+
+def give_up_on_job(journal: Optional[JobJournal], job_id: str, status: str, error: str) -> Dict[str, Any]:
+    """
+    Result for a job we stop waiting on (status "TimedOut" or "Abandoned")
+
+    The status is journaled as terminal, so the job is neither resumed nor
+    deduplicated against afterwards.
+    """
+    logger.warning(f"Giving up on job {job_id}: {error}")
+    if journal is not None:
+        journal.record_status(job_id, status, error=error)
+    return {"success": False, "error": error, "job_id": job_id, "status": status}
+
+
+def parse_project_list(body: Any) -> List[Dict[str, Any]]:
+    """Projects from a GET /v1/projects body (a bare list, or wrapped in "projects"/"data")"""
+    if isinstance(body, dict):
+        body = body.get("projects", body.get("data", []))
+    return [project for project in body or [] if isinstance(project, dict)]
+
+
+def match_submitted_project(projects: List[Dict[str, Any]], payload: Dict[str, Any],
+                            known_job_ids=()) -> Optional[str]:
+    """
+    jobId of a listed project created from payload, skipping jobs we already know about
+
+    Projects may echo the request at the top level or under "input"/"request".
+    """
+    for project in projects:
+        job_id = project.get("jobId") or project.get("id") or project.get("projectId")
+        if not job_id or job_id in known_job_ids:
+            continue
+        echoed = project.get("input") or project.get("request") or project
+        if echoed.get("text") != payload["text"] or echoed.get("voiceId") != payload["voiceId"]:
+            continue
+        if echoed.get("aspectRatio", payload["aspectRatio"]) == payload["aspectRatio"]:
+            return job_id
+    return None
+
+
+def interpret_project(job_id: str, project: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Interpret a /v1/projects/{jobId} body
+    Official status values: Queued, InProgress, Completed, Failed
+    """
+    status = project.get("status")
+    progress = project.get("progress", 0)
+    
+    logger.info(f"Job {job_id} status: {status} ({progress}% complete)")
+    
+    if status == "Completed":
+        video_url = project.get("videoUrl")
+        if video_url:
+            result = {
+                "success": True,
+                "video_url": video_url,
+                "job_id": job_id,
+                "status": status,
+                "message": "Video generation completed successfully!"
+            }
+        else:
+            result = {
+                "success": False,
+                "error": "Video completed but no videoUrl found",
+                "job_id": job_id,
+                "data": project
+            }
+        return {"done": True, "status": status, "progress": progress, "result": result}
+    
+    if status == "Failed":
+        return {"done": True, "status": status, "progress": progress, "result": {
+            "success": False,
+            "error": project.get("errorMessage", "Video generation failed"),
+            "job_id": job_id,
+            "status": status
+        }}
+    
+    if status not in ["Queued", "InProgress"]:
+        logger.warning(f"Unknown status: {status}")
+    
+    return {"done": False, "status": status, "progress": progress}
+
+
+class SubmitFlow:
+    """
+    One /v1/characters submit minus the I/O
+
+    HedraClient and AsyncHedraClient each drive this from their own (sync or async)
+    loop; journal dedup, the Idempotency-Key, retry decisions, reconciliation of
+    ambiguous submits and the final bookkeeping live here so the two clients
+    cannot drift apart.
+
+    A submit that may have reached Hedra without a jobId coming back (read timeout,
+    dropped connection, 502/504) is never resent blindly: the result is marked
+    "unconfirmed" and the journal intent stays open, and the next submit of the
+    same payload first looks for the job in /v1/projects (see reconcile).
+    """
+
+    def __init__(self, payload: Dict[str, Any], retry_policy: RetryPolicy, journal: Optional[JobJournal] = None,
+                 prospect: Optional[str] = None, queued_at: Optional[float] = None):
+        self.payload = payload
+        self.request_hash = payload_hash(payload)
+        self.retry_policy = retry_policy
+        self.journal = journal
+        self.prospect = prospect
+        self.queued_at = queued_at
+        self.attempt = 0
+        self.idempotency_key = self.request_hash
+        self.needs_reconcile = False
+        self._intent_created_at = None
+
+    def start(self) -> Optional[Dict[str, Any]]:
+        """
+        Open the submit; returns the existing job's result if this payload is already rendering
+
+        Afterwards needs_reconcile tells whether an earlier ambiguous submit of this payload
+        has to be looked up (reconcile) before anything is sent.
+        """
+        if self.journal is None:
+            return None
+        pending = self.journal.find_unfinished(self.request_hash, max_age=DEDUP_MAX_AGE)
+        if pending:
+            logger.info(f"Identical payload already submitted as job {pending['job_id']}")
+            return {"success": True, "job_id": pending["job_id"], "deduplicated": True}
+        intent = self.journal.submit_intent(self.request_hash)
+        if intent is not None and intent["ambiguous"]:
+            self.needs_reconcile = True
+            self._intent_created_at = intent["created_at"]
+        self.idempotency_key = self.journal.begin_submit(self.request_hash)
+        return None
+
+    def reconcile(self, projects: Optional[List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Settle an earlier ambiguous submit against the recently listed projects
+
+        Args:
+            projects: Parsed GET /v1/projects, or None if listing them failed
+
+        Returns:
+            The found job's result, an "unconfirmed" result while it is still unknown
+            whether the earlier submit took effect, or None once it is safe to resend
+        """
+        if projects is None:
+            return self.unconfirmed("could not list recent projects to check for it")
+        job_id = match_submitted_project(projects, self.payload, set(self.journal.job_ids_for_payload(self.request_hash)))
+        if job_id:
+            logger.info(f"Earlier ambiguous submit did reach Hedra as job {job_id}")
+            self.journal.record_submission(job_id, self.payload, self.request_hash, self.prospect, self.queued_at)
+            self.journal.finish_submit(self.request_hash)
+            return {"success": True, "job_id": job_id, "reconciled": True}
+        age = time.time() - self._intent_created_at
+        if age < RECONCILE_GRACE_SECONDS:
+            return self.unconfirmed(f"no matching project listed yet ({age:.0f}s after the first attempt)")
+        logger.warning(f"Earlier ambiguous submit not found after {age:.0f}s - resending with the same idempotency key")
+        return None
+
+    def unconfirmed(self, reason: str) -> Dict[str, Any]:
+        """Result for a submit that may or may not have created a job"""
+        logger.warning(f"Submit for payload {self.request_hash[:12]} unconfirmed: {reason}")
+        return {
+            "success": False,
+            "unconfirmed": True,
+            "error": f"Video submit unconfirmed ({reason}). The job may still exist on Hedra; submitting "
+                     f"the same script again checks recent projects before sending anything",
+            "attempts": self.attempt
+        }
+
+    def headers(self, base: Dict[str, str]) -> Dict[str, str]:
+        return {**base, "Idempotency-Key": self.idempotency_key}
+
+    def next_attempt(self):
+        self.attempt += 1
+        self.retry_policy.budget.record_call()
+        logger.info(f"Submitting to /v1/characters endpoint (attempt {self.attempt})...")
+
+    def on_exception(self, error: Exception) -> Union[float, Dict[str, Any]]:
+        """
+        Seconds to wait before retrying after error, or the result to return
+
+        Re-raises errors that are not transport failures, and never-sent ones that may not be retried.
+        """
+        decision = self.retry_policy.decide_exception(error, self.attempt)
+        if decision is None:
+            raise error
+        if decision.ambiguous and self.journal is not None:
+            self.journal.mark_submit_ambiguous(self.request_hash)
+        if decision.retry:
+            logger.warning(f"Submit attempt {self.attempt} failed ({error}) - retrying in {decision.delay:.1f}s")
+            return decision.delay
+        if decision.ambiguous:
+            return self.unconfirmed(f"{type(error).__name__} after the request was sent")
+        raise error
+
+    def on_response(self, response) -> Union[float, Dict[str, Any]]:
+        """Seconds to wait before retrying after a (requests or httpx) response, or the result to return"""
+        status_code = response.status_code
+        decision = self.retry_policy.decide_status(status_code, self.attempt, response.headers.get("Retry-After"))
+        if decision.ambiguous and self.journal is not None:
+            self.journal.mark_submit_ambiguous(self.request_hash)
+        if decision.retry:
+            logger.warning(f"Submit attempt {self.attempt} got HTTP {status_code} - retrying in {decision.delay:.1f}s")
+            return decision.delay
+        if decision.ambiguous:
+            return self.unconfirmed(f"HTTP {status_code} from the gateway")
+        return self.finish(status_code, response.text, response.json() if status_code == 200 else None)
+
+    def finish(self, status_code: int, text: str, job_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Interpret the final response and close the journal intent"""
+        result = interpret_submit_response(status_code, text, job_data)
+        result["attempts"] = self.attempt
+        if self.journal is not None:
+            if result["success"]:
+                self.journal.record_submission(result["job_id"], self.payload, self.request_hash,
+                                               self.prospect, self.queued_at)
+            self.journal.finish_submit(self.request_hash)
+        return result
+
+
 class HedraClient:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, session: requests.Session = None, poll_strategy: PollStrategy = None,
+                 journal: JobJournal = None, render_cache: RenderCache = None, voice_catalog: VoiceCatalog = None,
+                 governor: ApiGovernor = None, retry_policy: RetryPolicy = None):
         """Initialize Hedra client with official OpenAPI spec configuration"""
         self.api_key = api_key or os.getenv("HEDRA_API_KEY")
         if not self.api_key:
             raise ValueError("HEDRA_API_KEY not found in environment variables")
         
         # OFFICIAL OpenAPI spec configuration
-        self.base_url = "https://mercury.dev.dream-ai.com/api"
+        self.base_url = HEDRA_BASE_URL
         self.headers = {
             "X-API-Key": self.api_key,  # CORRECT: X-API-Key (case-sensitive!)
             "Content-Type": "application/json"
         }
         
+        # Pooled keep-alive transport shared across clients and threads
+        self._session = session
+        
+        # Decides the wait between status checks (see polling.py)
+        self.poll_strategy = poll_strategy or AdaptiveEtaStrategy()
+        
+        # Optional durable record of submitted jobs (see job_journal.py)
+        self.journal = journal
+        
+        # Optional cache of completed renders keyed by payload hash (see render_cache.py)
+        self.render_cache = render_cache
+        
+        # Cached /v1/voices (see voice_catalog.py) - shared per API key unless one is passed in
+        self._voice_catalog = voice_catalog
+        
+        # Rate limits and in-flight cap (see rate_limiter.py) - shared per API key unless one is passed in
+        self._governor = governor
+        
+        # Retries transient submit failures (see retry_policy.py)
+        self.retry_policy = retry_policy or RetryPolicy()
+        
         logger.info(f"Initialized Hedra client with API: {self.base_url}")
     
+    def _http(self) -> requests.Session:
+        """Session used for every request - the shared pooled one unless overridden"""
+        return self._session or get_session()
+    
+    @property
+    def voice_catalog(self) -> VoiceCatalog:
+        return self._voice_catalog or get_voice_catalog(self.base_url, self.api_key)
+    
+    @property
+    def governor(self) -> ApiGovernor:
+        return self._governor or get_governor(self.api_key)
+    
     def get_available_voices(self) -> list:
-        """Get list of available voices from /v1/voices"""
+        """Get list of available voices from /v1/voices (TTL-cached and revalidated)"""
+        return self.voice_catalog.voices()
+    
+    def resolve_voice(self, voice_id: str) -> str:
+        """Map "default" or a voice name to a concrete voice id using the cached catalog"""
+        return self.voice_catalog.resolve(voice_id)
+    
+    def test_connection(self) -> Dict[str, Any]:
+        """
+        Check the API key against /v1/voices (no credits used)
+        
+        Sends the voice catalog's ETag when it has one, so a healthy check is usually
+        an empty 304.
+        """
+        headers = dict(self.headers)
+        etag = self.voice_catalog.stats().get("etag")
+        if etag:
+            headers["If-None-Match"] = etag
         try:
-            response = requests.get(
-                f"{self.base_url}/v1/voices",
-                headers=self.headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                voices_data = response.json()
-                return voices_data.get("supported_voices", [])
-            else:
-                logger.warning(f"Could not fetch voices: {response.status_code}")
-                return []
-                
-        except Exception as e:
-            logger.error(f"Error fetching voices: {e}")
-            return []
+            response = self._http().get(f"{self.base_url}/v1/voices", headers=headers, timeout=10)
+        except requests.RequestException as e:
+            return {"success": False, "error": f"Connection failed: {str(e)}"}
+        
+        if response.status_code in (200, 304):
+            return {"success": True, "message": "Hedra API connected successfully"}
+        if response.status_code in (401, 403):
+            return {"success": False, "error": "Invalid Hedra API key. Please check your API key in the .env file."}
+        return {"success": False, "error": f"Hedra API returned {response.status_code}"}
     
-    def create_video_complete(self, script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9") -> Dict[str, Any]:
+    def submit_video(self, script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9",
+                     prospect: Optional[str] = None, queued_at: Optional[float] = None) -> Dict[str, Any]:
         """
-        Generate video using TTS and AI-generated avatar - OFFICIAL OpenAPI spec
-        No file uploads needed - everything in one call!
+        Submit a character job to /v1/characters without waiting for it
+        
+        Rejections (429/503) and never-sent connection errors are retried per self.retry_policy.
+        A failure after the request may have reached Hedra (read timeout, 502/504) returns
+        {"success": False, "unconfirmed": True, ...} instead of resending. With a journal
+        attached, an identical payload that is already rendering is returned instead of
+        resubmitted, retries reuse one Idempotency-Key, and an unconfirmed submit is looked
+        up in list_recent_projects() before the payload is sent again. prospect and
+        queued_at (when the render was requested) are journaled for the dashboard.
         """
         try:
             logger.info(f"Creating video with script length: {len(script_text)} characters")
             
-            # OFFICIAL payload structure from OpenAPI spec
-            payload = {
-                "text": script_text,
-                "audioSource": "tts",  # Use built-in TTS
-                "voiceId": voice_id,
-                "aspectRatio": aspect_ratio,
-                "avatarImageInput": {
-                    "seed": 42,
-                    "prompt": "Professional business person presenting, confident smile, business attire, clean background"
-                }
-            }
-            
-            logger.info("Submitting to /v1/characters endpoint...")
-            response = requests.post(
-                f"{self.base_url}/v1/characters",
-                json=payload,
-                headers=self.headers,
-                timeout=60
-            )
+            payload = build_character_payload(script_text, self.resolve_voice(voice_id), aspect_ratio)
+            flow = SubmitFlow(payload, self.retry_policy, self.journal, prospect, queued_at)
+            existing = flow.start()
+            if existing is None and flow.needs_reconcile:
+                existing = flow.reconcile(self.list_recent_projects())
+            if existing is not None:
+                return existing
             
-            if response.status_code == 200:
-                job_data = response.json()
-                job_id = job_data.get("jobId")
-                
-                if job_id:
-                    logger.info(f"Video generation started! Job ID: {job_id}")
-                    
-                    # Wait for completion and return result
-                    return self.wait_for_completion(job_id)
+            while True:
+                self.governor.acquire("submit")
+                flow.next_attempt()
+                try:
+                    response = self._http().post(
+                        f"{self.base_url}/v1/characters",
+                        json=payload,
+                        headers=flow.headers(self.headers),
+                        timeout=60
+                    )
+                except Exception as e:
+                    outcome = flow.on_exception(e)
                 else:
-                    return {
-                        "success": False,
-                        "error": "No jobId returned from API",
-                        "response": job_data
-                    }
-            else:
-                return {
-                    "success": False,
-                    "error": f"Video generation failed: {response.text}",
-                    "status_code": response.status_code
-                }
+                    self.governor.observe("submit", response.status_code, response.headers.get("Retry-After"))
+                    outcome = flow.on_response(response)
+                if isinstance(outcome, dict):
+                    return outcome
+                time.sleep(outcome)
                 
         except Exception as e:
             logger.error(f"Video generation error: {str(e)}")
@@ -104,98 +448,154 @@ class HedraClient:
                 "error": f"Video generation error: {str(e)}"
             }
     
+    def create_video_complete(self, script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9") -> Dict[str, Any]:
+        """
+        Generate video using TTS and AI-generated avatar - OFFICIAL OpenAPI spec
+        No file uploads needed - everything in one call!
+        """
+        voice_id = self.resolve_voice(voice_id)
+        request_hash = payload_hash(build_character_payload(script_text, voice_id, aspect_ratio))
+        
+        # Identical request rendered before - return it without a new job
+        if self.render_cache is not None:
+            cached = self.render_cache.get(request_hash)
+            if cached:
+                logger.info(f"Render cache hit for job {cached['job_id']}")
+                return cached_render_result(cached)
+        
+        # Reattach to an identical render that is still in flight instead of paying for another
+        pending = self.journal.find_unfinished(request_hash, max_age=DEDUP_MAX_AGE) if self.journal is not None else None
+        if pending:
+            logger.info(f"Reattaching to in-flight job {pending['job_id']} for identical payload")
+            result = self.wait_for_completion(pending["job_id"])
+        else:
+            # Counts against the per-key cap on jobs in flight until it finishes
+            with self.governor.job_slot():
+                submitted = self.submit_video(script_text, voice_id, aspect_ratio)
+                if not submitted["success"]:
+                    return submitted
+                
+                # Wait for completion and return result
+                result = self.wait_for_completion(submitted["job_id"])
+        
+        if self.render_cache is not None:
+            self.render_cache.put(request_hash, result)
+        return result
+    
+    def list_recent_projects(self) -> Optional[List[Dict[str, Any]]]:
+        """Recently created projects from GET /v1/projects, or None if they could not be listed"""
+        try:
+            self.governor.acquire("poll")
+            response = self._http().get(f"{self.base_url}/v1/projects", headers=self.headers, timeout=30)
+            self.governor.observe("poll", response.status_code, response.headers.get("Retry-After"))
+            if response.status_code != 200:
+                logger.error(f"Listing projects failed: {response.status_code} - {response.text}")
+                return None
+            return parse_project_list(response.json())
+        except Exception as e:
+            logger.error(f"Listing projects error: {e}")
+            return None
+    
+    def get_project_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Single status check against /v1/projects/{jobId}
+        
+        Returns:
+            {"done": False, "status": ..., "progress": ...} while the job is running,
+            {"done": True, "result": {...}} once it finished, or
+            {"done": False, "error": ...} when the check itself failed
+        """
+        try:
+            self.governor.acquire("poll")
+            response = self._http().get(
+                f"{self.base_url}/v1/projects/{job_id}",
+                headers=self.headers,
+                timeout=30
+            )
+            self.governor.observe("poll", response.status_code, response.headers.get("Retry-After"))
+            
+            if response.status_code != 200:
+                logger.error(f"Status check failed: {response.status_code} - {response.text}")
+                return {"done": False, "error": response.text, "status_code": response.status_code}
+            
+            check = interpret_project(job_id, response.json())
+            if self.journal is not None:
+                self.journal.record_check(job_id, check)
+            return check
+            
+        except Exception as e:
+            logger.error(f"Status check error: {e}")
+            return {"done": False, "error": str(e)}
+    
     def wait_for_completion(self, job_id: str, max_wait_time: int = 300) -> Dict[str, Any]:
         """
         Wait for video generation to complete using /v1/projects/{jobId}
         Official status values: Queued, InProgress, Completed, Failed
         """
         start_time = time.time()
+        state = self.poll_strategy.begin(job_id)
+        missing = 0
         logger.info(f"Waiting for job {job_id} to complete...")
         
         while time.time() - start_time < max_wait_time:
-            try:
-                # Check status using OFFICIAL endpoint
-                response = requests.get(
-                    f"{self.base_url}/v1/projects/{job_id}",
-                    headers=self.headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    project = response.json()
-                    status = project.get("status")
-                    progress = project.get("progress", 0)
-                    
-                    logger.info(f"Job {job_id} status: {status} ({progress}% complete)")
-                    
-                    if status == "Completed":
-                        video_url = project.get("videoUrl")
-                        if video_url:
-                            return {
-                                "success": True,
-                                "video_url": video_url,
-                                "job_id": job_id,
-                                "status": status,
-                                "message": "Video generation completed successfully!"
-                            }
-                        else:
-                            return {
-                                "success": False,
-                                "error": "Video completed but no videoUrl found",
-                                "job_id": job_id,
-                                "data": project
-                            }
-                            
-                    elif status == "Failed":
-                        return {
-                            "success": False,
-                            "error": project.get("errorMessage", "Video generation failed"),
-                            "job_id": job_id,
-                            "status": status
-                        }
-                        
-                    elif status in ["Queued", "InProgress"]:
-                        # Still processing - wait and continue
-                        time.sleep(10)
-                        continue
-                    else:
-                        logger.warning(f"Unknown status: {status}")
-                        time.sleep(10)
-                        continue
-                        
-                else:
-                    logger.error(f"Status check failed: {response.status_code} - {response.text}")
-                    time.sleep(10)
-                    continue
-                    
-            except Exception as e:
-                logger.error(f"Status check error: {e}")
-                time.sleep(10)
-                continue
+            check = self.get_project_status(job_id)
+            state.record(check)
+            if check["done"]:
+                result = check["result"]
+                result["polling"] = self.poll_strategy.finish(state, result["success"])
+                return result
+            
+            missing = missing + 1 if check.get("status_code") == 404 else 0
+            if missing >= MAX_MISSING_CHECKS:
+                result = give_up_on_job(self.journal, job_id, "Abandoned",
+                                        f"Job {job_id} not found on Hedra ({missing} checks in a row)")
+                result["polling"] = self.poll_strategy.finish(state, False)
+                return result
+            
+            # Still processing (or the check failed) - let the strategy pick the next wait
+            delay = self.poll_strategy.next_delay(state, check)
+            time.sleep(max(0.0, min(delay, max_wait_time - (time.time() - start_time))))
                 
-        return {
-            "success": False,
-            "error": f"Video generation timed out after {max_wait_time} seconds",
-            "job_id": job_id
-        }
+        result = give_up_on_job(self.journal, job_id, "TimedOut",
+                                f"Video generation timed out after {max_wait_time} seconds")
+        result["polling"] = self.poll_strategy.finish(state, False)
+        return result
     
-    def download_video(self, video_url: str, output_filename: str = "hedra_video.mp4") -> Dict[str, Any]:
-        """Download video from URL"""
+    def download_video(self, video_url: str, output_filename: str = "hedra_video.mp4",
+                       output_dir: str = None, expected_sha256: str = None) -> Dict[str, Any]:
+        """
+        Download video from URL
+        
+        Uses parallel Range requests with resume when the server supports them
+        (see downloader.py), otherwise a single stream.
+        
+        Args:
+            video_url: URL of the rendered video
+            output_filename: File name (or path) to write
+            output_dir: Directory for the file - defaults to HEDRA_DOWNLOAD_DIR, else the CWD
+            expected_sha256: Optional checksum the download must match
+        """
         try:
+            output_dir = output_dir or os.getenv("HEDRA_DOWNLOAD_DIR", "")
+            output_path = os.path.join(output_dir, output_filename) if output_dir else output_filename
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
             logger.info(f"Downloading video from: {video_url}")
             
-            response = requests.get(video_url, stream=True, timeout=60)
-            response.raise_for_status()
+            self.governor.acquire("download")
+            stats = RangedDownloader(session_factory=self._http).download(video_url, output_path, expected_sha256)
             
-            with open(output_filename, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if self.render_cache is not None:
+                self.render_cache.record_download(video_url, output_path)
             
-            logger.info(f"Video downloaded successfully: {output_filename}")
+            logger.info(f"Video downloaded successfully: {output_path} "
+                        f"({stats['bytes']} bytes at {stats['throughput_mbps']} Mbit/s)")
             return {
                 "success": True,
-                "video_path": output_filename,
-                "message": f"Video downloaded: {output_filename}"
+                "video_path": output_path,
+                "message": f"Video downloaded: {output_path}",
+                **stats
             }
             
         except Exception as e:
@@ -205,6 +605,29 @@ class HedraClient:
                 "error": f"Download error: {str(e)}"
             }
     
+    def create_videos(self, scripts: list, voice_id: str = "default", aspect_ratio: str = "16:9",
+                      max_concurrency: int = 50, max_wait_time: int = 300) -> list:
+        """
+        Render many scripts concurrently on one event loop
+        Thin blocking wrapper over AsyncHedraClient.create_videos; results keep input order
+        """
+        import asyncio
+        from async_hedra_client import AsyncHedraClient
+        
+        async def run():
+            async with AsyncHedraClient(self.api_key, max_concurrency=max_concurrency,
+                                        poll_strategy=self.poll_strategy, journal=self.journal,
+                                        render_cache=self.render_cache, governor=self._governor,
+                                        retry_policy=self.retry_policy, voice_catalog=self.voice_catalog) as client:
+                client.base_url = self.base_url
+                return await client.create_videos(scripts, voice_id, aspect_ratio, max_wait_time)
+        
+        return asyncio.run(run())
+    
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """Connection reuse counters for the shared HTTP transport"""
+        return get_transport_stats()
+    
     # Alias for backward compatibility
     def create_video(self, audio_text: str, aspect_ratio: str = "16:9", voice_id: str = "default", **kwargs) -> Dict[str, Any]:
         """Alias for create_video_complete"""
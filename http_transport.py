@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP transport - pooled keep-alive connections for all API clients
+
+Every thread gets its own lightweight requests.Session, but all sessions mount
+the same adapter, so the underlying urllib3 connection pools (and their open
+TCP+TLS connections) are shared across client instances and threads.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+
+
+class TransportStats:
+    """Thread-safe counters for requests sent vs. new connections opened"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.per_host: Dict[str, Dict[str, int]] = {}
+
+    def _host(self, host: str) -> Dict[str, int]:
+        return self.per_host.setdefault(host, {"requests": 0, "new_connections": 0})
+
+    def record_request(self, host: str):
+        with self._lock:
+            self.requests += 1
+            self._host(host)["requests"] += 1
+
+    def record_new_connection(self, host: str):
+        with self._lock:
+            self.new_connections += 1
+            self._host(host)["new_connections"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+                "per_host": {host: dict(counts) for host, counts in self.per_host.items()}
+            }
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self.per_host = {}
+
+
+_stats = TransportStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _stats.record_new_connection(self.host)
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _stats.record_new_connection(self.host)
+        return super()._new_conn()
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool
+        }
+
+    def send(self, request, **kwargs):
+        _stats.record_request(requests.utils.urlparse(request.url).hostname or "")
+        return super().send(request, **kwargs)
+
+
+_lock = threading.RLock()
+_adapter: Optional[PooledAdapter] = None
+_local = threading.local()
+_generation = 0
+
+
+def configure_transport(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                        pool_block: bool = False):
+    """
+    (Re)configure the shared connection pools
+
+    Args:
+        pool_connections: Number of distinct hosts to keep pools for
+        pool_maxsize: Maximum keep-alive connections per host
+        pool_block: Block when a host's pool is exhausted instead of opening extra connections
+    """
+    global _adapter, _generation
+    with _lock:
+        old = _adapter
+        _adapter = PooledAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        _generation += 1
+    if old is not None:
+        old.close()
+    logger.info(f"HTTP transport configured: {pool_connections} hosts x {pool_maxsize} connections")
+
+
+def _get_adapter() -> PooledAdapter:
+    if _adapter is None:
+        with _lock:
+            if _adapter is None:
+                configure_transport()
+    return _adapter
+
+
+def get_session() -> requests.Session:
+    """Return this thread's session, mounted on the shared pooled adapter"""
+    adapter = _get_adapter()
+    session = getattr(_local, "session", None)
+    if session is None or getattr(_local, "generation", None) != _generation:
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        _local.session = session
+        _local.generation = _generation
+    return session
+
+
+def get_transport_stats() -> Dict[str, Any]:
+    """Connection reuse counters for the shared transport"""
+    return _stats.snapshot()
+
+
+def reset_transport_stats():
+    _stats.reset()
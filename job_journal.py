@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Durable Hedra job journal (SQLite, WAL mode)
+
+Every submitted jobId is written to disk together with the hash of the payload
+that produced it, its status transitions and the final videoUrl, so a Streamlit
+rerun or a process restart can reattach to an in-flight render instead of
+paying for a new one. The same table backs the campaign dashboard page, so it
+also carries the prospect, script hash and queue time of each job, and offers
+paginated/filtered listing plus a changed-since feed for incremental refresh.
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import sqlite3
+import threading
+import logging
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = os.getenv("HEDRA_JOB_JOURNAL", os.path.join(".video_state", "hedra_jobs.db"))
+
+# Statuses after which the job is never polled (or deduplicated against) again: the
+# provider's own, plus TimedOut (we stopped waiting) and Abandoned (the job kept 404ing)
+TERMINAL_STATUSES = ("Completed", "Failed", "TimedOut", "Abandoned")
+
+_NOT_TERMINAL = f"status NOT IN ({', '.join('?' * len(TERMINAL_STATUSES))})"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id       TEXT PRIMARY KEY,
+    payload_hash TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    progress     INTEGER NOT NULL DEFAULT 0,
+    video_url    TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    finished_at  REAL,
+    prospect     TEXT,
+    script_hash  TEXT,
+    queued_at    REAL,
+    change_seq   INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_payload_hash ON jobs (payload_hash);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE TABLE IF NOT EXISTS job_transitions (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id   TEXT NOT NULL,
+    status   TEXT NOT NULL,
+    progress INTEGER,
+    at       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_transitions_job ON job_transitions (job_id);
+CREATE TABLE IF NOT EXISTS submit_intents (
+    payload_hash    TEXT PRIMARY KEY,
+    idempotency_key TEXT NOT NULL,
+    ambiguous       INTEGER NOT NULL DEFAULT 0,
+    created_at      REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS change_counter (
+    id  INTEGER PRIMARY KEY CHECK (id = 1),
+    seq INTEGER NOT NULL
+);
+"""
+
+# Columns added after the first release; journals created before get them via ALTER TABLE
+MIGRATIONS = {
+    "prospect": "ALTER TABLE jobs ADD COLUMN prospect TEXT",
+    "script_hash": "ALTER TABLE jobs ADD COLUMN script_hash TEXT",
+    "queued_at": "ALTER TABLE jobs ADD COLUMN queued_at REAL",
+    "change_seq": "ALTER TABLE jobs ADD COLUMN change_seq INTEGER"
+}
+
+# Dashboard access paths: newest-first pages and the changed-since feed
+INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at);
+DROP INDEX IF EXISTS jobs_updated_at;
+DROP INDEX IF EXISTS jobs_updated_at_job_id;
+CREATE INDEX IF NOT EXISTS jobs_change_seq ON jobs (change_seq);
+"""
+
+# Everything but the payload, which the dashboard never needs
+LIST_COLUMNS = ("job_id, payload_hash, status, progress, video_url, error, created_at, updated_at, "
+                "finished_at, prospect, script_hash, COALESCE(queued_at, created_at) AS queued_at")
+
+
+def script_hash(script_text: str) -> str:
+    """Short hash identifying the script a job rendered"""
+    return hashlib.sha256(script_text.encode("utf-8")).hexdigest()[:16]
+
+
+class JobJournal:
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        """Open (or create) the journal database at path"""
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, ddl in MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(ddl)
+        # Rows journaled before change_seq existed get one in insertion order
+        conn.execute("UPDATE jobs SET change_seq = rowid WHERE change_seq IS NULL")
+        conn.execute("INSERT OR IGNORE INTO change_counter (id, seq) SELECT 1, COALESCE(MAX(change_seq), 0) FROM jobs")
+        conn.executescript(INDEXES)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets readers and the writer run concurrently"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _next_change_seq(self, conn: sqlite3.Connection) -> int:
+        """
+        Take the next change number inside the caller's write transaction
+
+        Bumping the counter takes SQLite's write lock, which is held until commit,
+        so change numbers become visible in order whichever process or clock wrote them.
+        """
+        conn.execute("UPDATE change_counter SET seq = seq + 1 WHERE id = 1")
+        return conn.execute("SELECT seq FROM change_counter WHERE id = 1").fetchone()[0]
+
+    def record_submission(self, job_id: str, payload: Dict[str, Any], payload_hash: str,
+                          prospect: Optional[str] = None, queued_at: Optional[float] = None):
+        """
+        Persist a freshly submitted job
+
+        Args:
+            prospect: Who the video is for, shown on the dashboard
+            queued_at: When the render was requested, if it waited before submit (default: now)
+        """
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, payload_hash, payload, status, created_at, updated_at, "
+                "prospect, script_hash, queued_at, change_seq) VALUES (?, ?, ?, 'Submitted', ?, ?, ?, ?, ?, ?)",
+                (job_id, payload_hash, json.dumps(payload), now, now, prospect,
+                 script_hash(payload.get("text", "")), queued_at or now, self._next_change_seq(conn))
+            )
+            conn.execute(
+                "INSERT INTO job_transitions (job_id, status, progress, at) VALUES (?, 'Submitted', 0, ?)",
+                (job_id, now)
+            )
+
+    def record_status(self, job_id: str, status: str, progress: Optional[int] = None,
+                      video_url: Optional[str] = None, error: Optional[str] = None):
+        """Update a job's status, logging a transition only when the status changes"""
+        if not status:
+            return
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            finished_at = now if status in TERMINAL_STATUSES else None
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = COALESCE(?, progress), video_url = COALESCE(?, video_url), "
+                "error = COALESCE(?, error), updated_at = ?, finished_at = COALESCE(finished_at, ?), "
+                "change_seq = ? WHERE job_id = ?",
+                (status, progress, video_url, error, now, finished_at, self._next_change_seq(conn), job_id)
+            )
+            if row["status"] != status:
+                conn.execute(
+                    "INSERT INTO job_transitions (job_id, status, progress, at) VALUES (?, ?, ?, ?)",
+                    (job_id, status, progress, now)
+                )
+
+    def record_check(self, job_id: str, check: Dict[str, Any]):
+        """Record the outcome of a HedraClient.get_project_status call"""
+        if check.get("error"):
+            return
+        if check["done"]:
+            result = check["result"]
+            self.record_status(job_id, check.get("status"), 100 if result["success"] else None,
+                               result.get("video_url"), None if result["success"] else result.get("error"))
+        else:
+            self.record_status(job_id, check.get("status"), check.get("progress"))
+
+    def begin_submit(self, payload_hash: str) -> str:
+        """
+        Open (or reopen) a submit intent and return its idempotency key
+
+        An intent left open by an earlier attempt - e.g. a crash or timeout after the
+        request was sent - keeps its key, so the retried submit reuses it. Check
+        submit_intent() first: an ambiguous one must be reconciled before resending.
+        """
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO submit_intents (payload_hash, idempotency_key, created_at) VALUES (?, ?, ?)",
+                (payload_hash, uuid.uuid4().hex, time.time())
+            )
+            row = conn.execute("SELECT * FROM submit_intents WHERE payload_hash = ?", (payload_hash,)).fetchone()
+        return row["idempotency_key"]
+
+    def submit_intent(self, payload_hash: str) -> Optional[Dict[str, Any]]:
+        """The open submit intent for this payload, if any"""
+        row = self._conn().execute("SELECT * FROM submit_intents WHERE payload_hash = ?", (payload_hash,)).fetchone()
+        return dict(row) if row else None
+
+    def mark_submit_ambiguous(self, payload_hash: str):
+        """The request may have reached the server even though no jobId came back"""
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE submit_intents SET ambiguous = 1 WHERE payload_hash = ?", (payload_hash,))
+
+    def finish_submit(self, payload_hash: str):
+        """Close the intent once the submit definitely succeeded or definitely failed"""
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM submit_intents WHERE payload_hash = ?", (payload_hash,))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def find_unfinished(self, payload_hash: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Most recent job for this payload, created within max_age seconds, that has not reached a terminal status"""
+        cutoff = time.time() - max_age if max_age else 0
+        row = self._conn().execute(
+            f"SELECT * FROM jobs WHERE payload_hash = ? AND {_NOT_TERMINAL} AND created_at >= ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (payload_hash, *TERMINAL_STATUSES, cutoff)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def job_ids_for_payload(self, payload_hash: str) -> List[str]:
+        """Every journaled job (finished or not) created from this payload"""
+        rows = self._conn().execute("SELECT job_id FROM jobs WHERE payload_hash = ?", (payload_hash,)).fetchall()
+        return [row["job_id"] for row in rows]
+
+    def unfinished(self, max_age: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Jobs still rendering (or never confirmed finished), oldest first (at most limit of them)"""
+        cutoff = time.time() - max_age if max_age else 0
+        rows = self._conn().execute(
+            f"SELECT * FROM jobs WHERE {_NOT_TERMINAL} AND created_at >= ? ORDER BY created_at LIMIT ?",
+            (*TERMINAL_STATUSES, cutoff, -1 if limit is None else limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_unfinished(self, max_age: Optional[float] = None) -> int:
+        cutoff = time.time() - max_age if max_age else 0
+        return self._conn().execute(
+            f"SELECT COUNT(*) FROM jobs WHERE {_NOT_TERMINAL} AND created_at >= ?", (*TERMINAL_STATUSES, cutoff)
+        ).fetchone()[0]
+
+    def _filter_clauses(self, statuses: Optional[List[str]], search: Optional[str]):
+        clauses, params = [], []
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if search:
+            clauses.append("(prospect LIKE ? OR job_id LIKE ? OR script_hash LIKE ?)")
+            params.extend([f"%{search}%"] * 3)
+        return clauses, params
+
+    def _filters(self, statuses: Optional[List[str]], search: Optional[str]):
+        clauses, params = self._filter_clauses(statuses, search)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def list_jobs(self, statuses: Optional[List[str]] = None, search: Optional[str] = None,
+                  limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        One page of jobs, newest first
+
+        Args:
+            statuses: Only jobs in these statuses (all when empty)
+            search: Substring of the prospect, job id or script hash
+            limit: Page size
+            offset: Rows to skip
+        """
+        where, params = self._filters(statuses, search)
+        rows = self._conn().execute(
+            f"SELECT {LIST_COLUMNS} FROM jobs{where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_jobs(self, statuses: Optional[List[str]] = None, search: Optional[str] = None) -> int:
+        where, params = self._filters(statuses, search)
+        return self._conn().execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+    def status_counts(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def changed_since(self, cursor: int, statuses: Optional[List[str]] = None,
+                      search: Optional[str] = None, include_ids: Iterable[str] = (),
+                      limit: int = 1000) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Jobs changed after cursor that match the filters, oldest change first
+
+        The cursor is a change_seq, taken from a counter bumped inside each write
+        transaction. Numbers are committed in order, so a change is never skipped,
+        even when writers in other processes or a clock step make updated_at run
+        backwards. Poll with the cursor returned by the previous call (start from
+        last_update()).
+
+        Args:
+            cursor: change_seq of the last change already seen
+            statuses, search: Same filters as list_jobs
+            include_ids: Jobs returned when they change even if they no longer match
+                         (the rows already on screen)
+            limit: Most rows per call; the returned cursor resumes after the last one
+
+        Returns:
+            (rows, next cursor)
+        """
+        head = self.last_update()
+        clauses, params = self._filter_clauses(statuses, search)
+        include_ids = list(include_ids)
+        match = " AND ".join(clauses) or "1"
+        if clauses and include_ids:
+            match = f"({match}) OR job_id IN ({', '.join('?' * len(include_ids))})"
+            params.extend(include_ids)
+        rows = self._conn().execute(
+            f"SELECT {LIST_COLUMNS}, change_seq FROM jobs WHERE change_seq > ? AND change_seq <= ? "
+            f"AND ({match}) ORDER BY change_seq LIMIT ?",
+            (cursor, head, *params, limit)
+        ).fetchall()
+        rows = [dict(row) for row in rows]
+        # Fewer rows than the limit means everything up to head was scanned,
+        # including changes that did not match the filters
+        next_cursor = head if len(rows) < limit else rows[-1]["change_seq"]
+        return rows, next_cursor
+
+    def last_update(self) -> int:
+        """Cursor for changed_since covering everything already in the journal"""
+        return self._conn().execute("SELECT COALESCE(MAX(change_seq), 0) FROM jobs").fetchone()[0]
+
+    def transitions(self, job_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT status, progress, at FROM job_transitions WHERE job_id = ? ORDER BY id", (job_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+_default_journal: Optional[JobJournal] = None
+_default_lock = threading.Lock()
+
+
+def get_default_journal() -> JobJournal:
+    """Process-wide journal at DEFAULT_JOURNAL_PATH"""
+    global _default_journal
+    with _default_lock:
+        if _default_journal is None:
+            _default_journal = JobJournal()
+        return _default_journal
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Local render queue shared by the Streamlit app and render workers (SQLite, WAL mode)
+
+The app only enqueues requests and reads their status; render_worker.py
+processes claim them and do the OpenAI and Hedra work. A claim is a lease:
+workers extend it while they make progress, and a job whose worker died is
+handed to the next worker once the lease runs out. Resubmits after a crash are
+safe because submit_video reattaches to the journaled in-flight job.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import logging
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = os.getenv("RENDER_QUEUE_PATH", os.path.join(".video_state", "render_queue.db"))
+
+# Statuses after which a request never changes again
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    request_id   TEXT PRIMARY KEY,
+    params       TEXT NOT NULL,
+    prospect     TEXT,
+    status       TEXT NOT NULL,
+    stage        TEXT,
+    progress     INTEGER NOT NULL DEFAULT 0,
+    job_id       TEXT,
+    result       TEXT,
+    error        TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    worker_id    TEXT,
+    lease_until  REAL,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    started_at   REAL,
+    finished_at  REAL
+);
+CREATE INDEX IF NOT EXISTS requests_status ON requests (status, created_at);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id    TEXT PRIMARY KEY,
+    pid          INTEGER,
+    host         TEXT,
+    started_at   REAL NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+
+def _decode(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    request = dict(row)
+    request["params"] = json.loads(request["params"])
+    request["result"] = json.loads(request["result"]) if request["result"] else None
+    request["done"] = request["status"] in FINISHED_STATUSES
+    return request
+
+
+class JobQueue:
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, lease_seconds: float = 120.0, max_attempts: int = 3):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            lease_seconds: How long a claim lasts without a heartbeat
+            max_attempts: Claims a request gets before it is failed for good
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (and per process - never share across a fork)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # App side
+
+    def enqueue(self, params: Dict[str, Any], prospect: Optional[str] = None) -> str:
+        """
+        Queue a render request and return its id
+
+        Args:
+            params: Either {"script_text": ...} or {"script": generate_sales_script kwargs},
+                    plus optional voice_id, aspect_ratio and download
+            prospect: Who the video is for (shown in the app and on the dashboard)
+        """
+        request_id = uuid.uuid4().hex[:16]
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO requests (request_id, params, prospect, status, stage, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'queued', 'Queued', ?, ?)",
+            (request_id, json.dumps(params), prospect, now, now)
+        )
+        return request_id
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        return _decode(self._conn().execute("SELECT * FROM requests WHERE request_id = ?", (request_id,)).fetchone())
+
+    def get_many(self, request_ids: List[str]) -> List[Dict[str, Any]]:
+        """Requests by id, in the order given (unknown ids are skipped)"""
+        if not request_ids:
+            return []
+        rows = self._conn().execute(
+            f"SELECT * FROM requests WHERE request_id IN ({', '.join('?' * len(request_ids))})", request_ids
+        ).fetchall()
+        by_id = {row["request_id"]: _decode(row) for row in rows}
+        return [by_id[request_id] for request_id in request_ids if request_id in by_id]
+
+    def cancel(self, request_id: str) -> bool:
+        """Cancel a request no worker has claimed yet"""
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE requests SET status = 'cancelled', stage = 'Cancelled', updated_at = ?, finished_at = ? "
+            "WHERE request_id = ? AND status = 'queued'",
+            (now, now, request_id)
+        )
+        return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) AS n FROM requests GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def live_workers(self, max_silence: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Workers that sent a heartbeat within max_silence seconds (default: one lease)"""
+        cutoff = time.time() - (max_silence or self.lease_seconds)
+        rows = self._conn().execute("SELECT * FROM workers WHERE heartbeat_at >= ?", (cutoff,)).fetchall()
+        return [dict(row) for row in rows]
+
+    # Worker side
+
+    def register_worker(self) -> str:
+        worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO workers (worker_id, pid, host, started_at, heartbeat_at) VALUES (?, ?, ?, ?, ?)",
+            (worker_id, os.getpid(), socket.gethostname(), now, now)
+        )
+        return worker_id
+
+    def worker_heartbeat(self, worker_id: str):
+        """Mark worker_id alive and renew the leases of all requests it holds"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("UPDATE workers SET heartbeat_at = ? WHERE worker_id = ?", (now, worker_id))
+        conn.execute("UPDATE requests SET lease_until = ? WHERE worker_id = ? AND status = 'running'",
+                     (now + self.lease_seconds, worker_id))
+
+    def unregister_worker(self, worker_id: str):
+        self._conn().execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest queued request (or one whose lease expired) to worker_id
+
+        Requests that already used max_attempts claims are failed instead of handed out.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")  # one claimer at a time across processes
+        try:
+            row = conn.execute(
+                "SELECT * FROM requests WHERE status = 'queued' OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is not None and row["attempts"] >= self.max_attempts:
+                conn.execute(
+                    "UPDATE requests SET status = 'failed', stage = 'Failed', error = COALESCE(error, ?), "
+                    "updated_at = ?, finished_at = ? WHERE request_id = ?",
+                    (f"Worker lost {row['attempts']} times", now, now, row["request_id"])
+                )
+                row = None
+            elif row is not None:
+                if row["status"] == "running":
+                    logger.warning(f"Reclaiming request {row['request_id']} from worker {row['worker_id']}")
+                conn.execute(
+                    "UPDATE requests SET status = 'running', stage = 'Starting', worker_id = ?, lease_until = ?, "
+                    "attempts = attempts + 1, started_at = COALESCE(started_at, ?), updated_at = ? "
+                    "WHERE request_id = ?",
+                    (worker_id, now + self.lease_seconds, now, now, row["request_id"])
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["request_id"]) if row is not None else None
+
+    def update(self, request_id: str, worker_id: str, stage: Optional[str] = None,
+               progress: Optional[int] = None, job_id: Optional[str] = None) -> bool:
+        """
+        Report progress and extend the lease
+
+        Returns False when worker_id no longer holds the request (its lease expired and
+        another worker took it over), in which case the caller should stop.
+        """
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE requests SET stage = COALESCE(?, stage), progress = COALESCE(?, progress), "
+            "job_id = COALESCE(?, job_id), lease_until = ?, updated_at = ? "
+            "WHERE request_id = ? AND worker_id = ? AND status = 'running'",
+            (stage, progress, job_id, now + self.lease_seconds, now, request_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, request_id: str, worker_id: str):
+        """Hand a request back to the queue unfinished (worker shutdown); the claim is not counted"""
+        self._conn().execute(
+            "UPDATE requests SET status = 'queued', stage = 'Queued', worker_id = NULL, lease_until = NULL, "
+            "attempts = attempts - 1, updated_at = ? WHERE request_id = ? AND worker_id = ? AND status = 'running'",
+            (time.time(), request_id, worker_id)
+        )
+
+    def finish(self, request_id: str, worker_id: str, result: Dict[str, Any]):
+        """Store the final result dict ({"success": ..., ...}) of a request"""
+        now = time.time()
+        status = "done" if result.get("success") else "failed"
+        self._conn().execute(
+            "UPDATE requests SET status = ?, stage = ?, progress = CASE WHEN ? THEN 100 ELSE progress END, "
+            "job_id = COALESCE(?, job_id), result = ?, error = ?, lease_until = NULL, updated_at = ?, "
+            "finished_at = ? WHERE request_id = ? AND worker_id = ?",
+            (status, "Completed" if result.get("success") else "Failed", bool(result.get("success")),
+             result.get("job_id"), json.dumps(result), result.get("error"), now, now, request_id, worker_id)
+        )
+
+
+_default_queue: Optional[JobQueue] = None
+_default_lock = threading.Lock()
+
+
+def get_default_queue() -> JobQueue:
+    """Process-wide queue at DEFAULT_QUEUE_PATH"""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Job tracker - one scheduler thread polls every outstanding Hedra job
+
+Instead of one private poll loop (and thread) per create_video_complete call,
+the tracker owns all outstanding jobIds, polls them on a shared rate budget
+and resolves a JobHandle per job that callers can wait on or attach callbacks to.
+"""
+
+import time
+import heapq
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Callable
+
+from hedra_client import MAX_MISSING_CHECKS, HedraClient, give_up_on_job
+from polling import PollStrategy, AdaptiveEtaStrategy
+
+logger = logging.getLogger(__name__)
+
+# Finished handles kept for get()/track() after their waiters were notified
+FINISHED_HANDLES = 256
+
+
+class JobHandle:
+    """Caller-side view of one tracked job"""
+
+    def __init__(self, job_id: str, max_wait_time: float):
+        self.job_id = job_id
+        self.status = "Queued"
+        self.progress = 0
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.deadline = time.monotonic() + max_wait_time
+        self.max_wait_time = max_wait_time
+        self.missing_checks = 0  # consecutive 404s
+        self._future: Future = Future()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until the job finishes; returns the same dict as wait_for_completion"""
+        return self._future.result(timeout)
+
+    def add_done_callback(self, fn: Callable[["JobHandle"], None]):
+        """Call fn(handle) once the job finishes (immediately if it already has)"""
+        self._future.add_done_callback(lambda _: fn(self))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": self.progress,
+            "done": self.done(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    def _resolve(self, result: Dict[str, Any]):
+        self.status = result.get("status", "Completed" if result.get("success") else "Failed")
+        if result.get("success"):
+            self.progress = 100
+        self.updated_at = time.time()
+        self._future.set_result(result)
+
+
+class JobTracker:
+    def __init__(self,
+                 client: HedraClient,
+                 max_polls_per_second: float = 2.0,
+                 poll_strategy: PollStrategy = None,
+                 max_wait_time: float = 300):
+        """
+        Args:
+            client: HedraClient used for submits and status checks
+            max_polls_per_second: Total status-request budget across all jobs
+            poll_strategy: Decides each job's next check (see polling.py)
+            max_wait_time: Per-job timeout, measured from when tracking starts
+        """
+        self.client = client
+        self.min_spacing = 1.0 / max_polls_per_second
+        self.poll_strategy = poll_strategy or AdaptiveEtaStrategy()
+        self.max_wait_time = max_wait_time
+
+        self._handles: Dict[str, JobHandle] = {}  # outstanding jobs only
+        self._finished: "OrderedDict[str, JobHandle]" = OrderedDict()  # most recently finished last
+        self._finished_count = 0
+        self._states: Dict[str, Any] = {}
+        self._schedule: List = []  # heap of (due_time, seq, job_id)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._last_poll = 0.0
+        self._polls = 0
+
+        self._thread = threading.Thread(target=self._run, name="hedra-job-tracker", daemon=True)
+        self._thread.start()
+
+    def track(self, job_id: str, max_wait_time: Optional[float] = None) -> JobHandle:
+        """Start tracking an existing jobId (idempotent) and return its handle"""
+        with self._cond:
+            handle = self._handles.get(job_id) or self._finished.get(job_id)
+            if handle is None:
+                handle = JobHandle(job_id, max_wait_time or self.max_wait_time)
+                self._handles[job_id] = handle
+                self._states[job_id] = self.poll_strategy.begin(job_id)
+                self._push(job_id, time.monotonic())
+                self._cond.notify()
+            return handle
+
+    def submit(self, script_text: str, voice_id: str = "default", aspect_ratio: str = "16:9",
+               prospect: Optional[str] = None, queued_at: Optional[float] = None) -> JobHandle:
+        """
+        Submit a video and track it; a failed submit yields an already-resolved handle
+        Blocks while the client's governor already has max_in_flight_jobs running
+        """
+        governor = self.client.governor
+        governor.acquire_job_slot()
+        submitted = self.client.submit_video(script_text, voice_id, aspect_ratio, prospect, queued_at)
+        if submitted["success"]:
+            handle = self.track(submitted["job_id"])
+            handle.add_done_callback(lambda _: governor.release_job_slot())
+            return handle
+
+        governor.release_job_slot()
+        handle = JobHandle(submitted.get("job_id", ""), 0)
+        handle._resolve(submitted)
+        return handle
+
+    def resume(self, max_age: Optional[float] = None) -> List[JobHandle]:
+        """Reattach to every unfinished job in the client's journal (call at startup)"""
+        if self.client.journal is None:
+            return []
+        handles = [self.track(job["job_id"]) for job in self.client.journal.unfinished(max_age)]
+        if handles:
+            logger.info(f"Resumed {len(handles)} unfinished Hedra jobs from journal")
+        return handles
+
+    def get(self, job_id: str) -> Optional[JobHandle]:
+        """Handle of an outstanding or recently finished job"""
+        with self._cond:
+            return self._handles.get(job_id) or self._finished.get(job_id)
+
+    def outstanding(self) -> List[JobHandle]:
+        with self._cond:
+            return list(self._handles.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "tracked": len(self._handles) + self._finished_count,
+                "outstanding": len(self._handles),
+                "status_requests": self._polls,
+                "max_polls_per_second": 1.0 / self.min_spacing,
+                "polling": self.poll_strategy.stats()
+            }
+
+    def shutdown(self, wait: bool = True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if wait:
+            self._thread.join()
+
+    def _push(self, job_id: str, due: float):
+        self._seq += 1
+        heapq.heappush(self._schedule, (due, self._seq, job_id))
+
+    def _next_job(self) -> Optional[str]:
+        """Block until a job is due and the shared rate budget allows a check"""
+        with self._cond:
+            while not self._stopped:
+                now = time.monotonic()
+                if not self._schedule:
+                    self._cond.wait()
+                    continue
+                due = max(self._schedule[0][0], self._last_poll + self.min_spacing)
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                _, _, job_id = heapq.heappop(self._schedule)
+                self._last_poll = now
+                self._polls += 1
+                return job_id
+        return None
+
+    def _run(self):
+        while True:
+            job_id = self._next_job()
+            if job_id is None:
+                return
+            try:
+                self._poll(job_id)
+            except Exception as e:
+                logger.error(f"Job tracker error for {job_id}: {e}")
+                with self._cond:
+                    self._push(job_id, time.monotonic() + self.min_spacing)
+
+    def _poll(self, job_id: str):
+        handle = self._handles[job_id]
+        state = self._states[job_id]
+
+        check = self.client.get_project_status(job_id)
+        state.record(check)
+
+        if check["done"]:
+            result = check["result"]
+            result["polling"] = self.poll_strategy.finish(state, result["success"])
+            self._finish(job_id, handle, result)
+            return
+
+        if not check.get("error"):
+            handle.status = check.get("status") or handle.status
+            handle.progress = check.get("progress", handle.progress)
+            handle.updated_at = time.time()
+        handle.missing_checks = handle.missing_checks + 1 if check.get("status_code") == 404 else 0
+
+        now = time.monotonic()
+        if handle.missing_checks >= MAX_MISSING_CHECKS or now >= handle.deadline:
+            if handle.missing_checks >= MAX_MISSING_CHECKS:
+                result = give_up_on_job(self.client.journal, job_id, "Abandoned",
+                                        f"Job {job_id} not found on Hedra ({handle.missing_checks} checks in a row)")
+            else:
+                result = give_up_on_job(self.client.journal, job_id, "TimedOut",
+                                        f"Video generation timed out after {handle.max_wait_time} seconds")
+            result["polling"] = self.poll_strategy.finish(state, False)
+            self._finish(job_id, handle, result)
+            return
+
+        delay = self.poll_strategy.next_delay(state, check)
+        with self._cond:
+            self._push(job_id, min(now + delay, handle.deadline))
+
+    def _finish(self, job_id: str, handle: JobHandle, result: Dict[str, Any]):
+        """Resolve the handle (running its callbacks), then move it to the bounded finished LRU"""
+        self._states.pop(job_id, None)
+        handle._resolve(result)
+        with self._cond:
+            self._handles.pop(job_id, None)
+            self._finished[job_id] = handle
+            self._finished_count += 1
+            while len(self._finished) > FINISHED_HANDLES:
+                self._finished.popitem(last=False)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Latency-SLO model routing for script generation
+
+Each task (sales script, follow-up, optimization, ...) has an ordered list of
+acceptable models and a latency deadline. The router keeps rolling latency
+percentiles and error rates per model and picks the most preferred model that
+is healthy and whose p95 fits the deadline, falling back to the next (usually
+faster) model otherwise. Every served call is appended to a JSONL log (rotated
+to one .1 backup when it gets large) so the quality/latency tradeoff can be
+analyzed later.
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTES = {
+    "sales_script": {"models": ["gpt-4", "gpt-3.5-turbo"], "deadline": 30.0},
+    "fused_script": {"models": ["gpt-4", "gpt-3.5-turbo"], "deadline": 45.0},
+    "follow_up": {"models": ["gpt-4", "gpt-3.5-turbo"], "deadline": 25.0},
+    "master_template": {"models": ["gpt-4"], "deadline": 60.0},
+    "optimize": {"models": ["gpt-3.5-turbo"], "deadline": 20.0},
+    "variation": {"models": ["gpt-3.5-turbo"], "deadline": 20.0},
+    "personalize": {"models": ["gpt-3.5-turbo"], "deadline": 15.0}
+}
+
+DEFAULT_ROUTING_LOG = os.getenv("MODEL_ROUTING_LOG", os.path.join(".video_state", "model_routing.jsonl"))
+
+
+class ModelStats:
+    """Rolling latency and error samples for one model"""
+
+    def __init__(self, max_samples: int = 200, window: float = 600.0):
+        self.window = window
+        self._samples: deque = deque(maxlen=max_samples)  # (at, latency, ok)
+        self.probe_at = 0.0  # when the in-flight probe call was handed out (0: none)
+
+    def record(self, latency: float, ok: bool):
+        self._samples.append((time.time(), latency, ok))
+
+    def _recent(self) -> List[tuple]:
+        cutoff = time.time() - self.window
+        return [sample for sample in self._samples if sample[0] >= cutoff]
+
+    def percentile(self, q: float) -> Optional[float]:
+        latencies = sorted(latency for _, latency, ok in self._recent() if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def error_rate(self) -> float:
+        recent = self._recent()
+        return sum(1 for _, _, ok in recent if not ok) / len(recent) if recent else 0.0
+
+    def count(self) -> int:
+        return len(self._recent())
+
+    def last_at(self) -> float:
+        return self._samples[-1][0] if self._samples else 0.0
+
+
+class ModelRouter:
+    def __init__(self,
+                 routes: Optional[Dict[str, Dict[str, Any]]] = None,
+                 min_samples: int = 5,
+                 max_error_rate: float = 0.25,
+                 probe_interval: float = 60.0,
+                 log_path: Optional[str] = DEFAULT_ROUTING_LOG,
+                 max_log_bytes: int = 10 * 1024 ** 2):
+        """
+        Args:
+            routes: task -> {"models": [preferred, ..., fallback], "deadline": seconds}
+                    (defaults to DEFAULT_ROUTES, overridable as JSON in MODEL_ROUTES)
+            min_samples: Samples needed before a model's percentiles are trusted
+            max_error_rate: Error rate above which a model is skipped
+            probe_interval: Seconds after which a skipped model gets one call to re-measure it
+            log_path: JSONL file of served calls (None to disable)
+            max_log_bytes: Size at which the log is moved to log_path + ".1" and restarted
+        """
+        self.routes = routes or json.loads(os.getenv("MODEL_ROUTES", "null")) or DEFAULT_ROUTES
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.probe_interval = probe_interval
+        self.log_path = log_path
+        self.max_log_bytes = max_log_bytes
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+
+    def _model_stats(self, model: str) -> ModelStats:
+        if model not in self._stats:
+            self._stats[model] = ModelStats()
+        return self._stats[model]
+
+    def primary(self, task: str) -> str:
+        """The task's preferred model, ignoring live measurements (e.g. for batch jobs)"""
+        return self.routes[task]["models"][0]
+
+    def candidates(self, task: str, deadline: Optional[float] = None) -> List[str]:
+        """
+        Models to try for task, best first
+
+        Models that are healthy and whose p95 latency fits the deadline keep their
+        configured order at the front; the rest follow as failover options. A skipped
+        model is moved to the front for one probe call once probe_interval has passed;
+        concurrent callers keep skipping it until that probe is recorded.
+        """
+        route = self.routes[task]
+        deadline = deadline or route.get("deadline")
+        now = time.time()
+        fits, rest = [], []
+        with self._lock:
+            for model in route["models"]:
+                stats = self._model_stats(model)
+                p95 = stats.percentile(0.95)
+                measured = stats.count() >= self.min_samples
+                healthy = not measured or stats.error_rate() <= self.max_error_rate
+                fast_enough = not measured or p95 is None or not deadline or p95 <= deadline
+                if healthy and fast_enough:
+                    fits.append(model)
+                elif not fits and now - max(stats.last_at(), stats.probe_at) >= self.probe_interval:
+                    stats.probe_at = now  # this caller takes the probe
+                    fits.append(model)
+                else:
+                    rest.append(model)
+
+        if fits and fits[0] != route["models"][0]:
+            logger.info(f"Routing {task} to {fits[0]} - {route['models'][0]} is over its latency/error budget")
+        return fits + rest or list(route["models"])
+
+    def record(self, task: str, model: str, latency: float, ok: bool, cached: bool = False,
+               prompt_key: Optional[str] = None, error: Optional[str] = None):
+        """Feed a call outcome back and append it to the routing log"""
+        with self._lock:
+            stats = self._model_stats(model)
+            stats.probe_at = 0.0
+            if not cached:
+                stats.record(latency, ok)
+        if not self.log_path:
+            return
+        entry = {"at": time.time(), "task": task, "model": model, "latency": round(latency, 3),
+                 "ok": ok, "cached": cached, "prompt_key": prompt_key}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            try:
+                if os.path.getsize(self.log_path) >= self.max_log_bytes:
+                    os.replace(self.log_path, self.log_path + ".1")
+            except OSError:
+                pass  # no log yet
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                model: {
+                    "samples": stats.count(),
+                    "p50": stats.percentile(0.5),
+                    "p95": stats.percentile(0.95),
+                    "error_rate": round(stats.error_rate(), 3)
+                }
+                for model, stats in self._stats.items()
+            }
+
+
+_default_router: Optional[ModelRouter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_router() -> ModelRouter:
+    """Process-wide router shared by every ScriptGenerator"""
+    global _default_router
+    with _default_lock:
+        if _default_router is None:
+            _default_router = ModelRouter()
+        return _default_router
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Process-wide OpenAI client with tuned connection pooling
+
+Creating openai.OpenAI() per Streamlit click (or per batch worker) builds a new
+httpx connection pool each time, so every request pays a fresh TCP+TLS
+handshake. get_openai_client() lazily builds one client per API key/base URL
+and hands the same instance to ScriptGenerator, OpenAIClient and campaign
+workers. An httpcore trace hook counts new connections against requests so
+connection reuse can be checked.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+import openai
+
+from http_transport import TransportStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+DEFAULT_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))
+
+_stats = TransportStats()
+
+
+def _on_request(request: httpx.Request):
+    """Count the request and attach an httpcore trace that notices new connections"""
+    host = request.url.host
+    _stats.record_request(host)
+
+    def trace(event_name: str, info: Dict[str, Any]):
+        # A completed TCP connect means no pooled keep-alive connection was free
+        if event_name == "connection.connect_tcp.complete":
+            _stats.record_new_connection(host)
+
+    request.extensions["trace"] = trace
+
+
+_lock = threading.RLock()
+_clients: Dict[Tuple[str, Optional[str]], openai.OpenAI] = {}
+_settings: Dict[str, Any] = {}
+
+
+def configure_openai_client(max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                            max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+                            keepalive_expiry: float = 60.0,
+                            connect_timeout: float = 5.0,
+                            read_timeout: float = 90.0,
+                            pool_timeout: float = 10.0,
+                            max_retries: int = 2):
+    """
+    (Re)configure the shared client; existing clients are closed and rebuilt lazily
+
+    Args:
+        max_connections: Concurrent connections to the API host
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for response data (long completions stream slowly)
+        pool_timeout: Seconds to wait for a free pooled connection
+        max_retries: The SDK's own retries for connection errors, 429 and 5xx
+    """
+    with _lock:
+        old = list(_clients.values())
+        _clients.clear()
+        _settings.update(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=pool_timeout),
+            max_retries=max_retries
+        )
+    for client in old:
+        client.close()
+
+
+def get_openai_client(api_key: Optional[str] = None) -> openai.OpenAI:
+    """
+    The shared OpenAI client for api_key (default: OPENAI_API_KEY) and OPENAI_BASE_URL
+
+    Raises:
+        ValueError: If no API key is configured
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OpenAI API key not found in environment variables")
+    base_url = os.getenv("OPENAI_BASE_URL")
+
+    with _lock:
+        if not _settings:
+            configure_openai_client()
+        client = _clients.get((api_key, base_url))
+        if client is None:
+            http_client = httpx.Client(
+                limits=_settings["limits"],
+                timeout=_settings["timeout"],
+                event_hooks={"request": [_on_request]}
+            )
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, http_client=http_client,
+                                   timeout=_settings["timeout"], max_retries=_settings["max_retries"])
+            _clients[(api_key, base_url)] = client
+            logger.info(f"OpenAI client created ({base_url or 'api.openai.com'})")
+        return client
+
+
+def get_openai_client_stats() -> Dict[str, Any]:
+    """Requests sent vs. new connections opened by the shared OpenAI clients"""
+    return _stats.snapshot()
+
+
+def reset_openai_client_stats():
+    _stats.reset()
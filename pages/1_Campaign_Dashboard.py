@@ -0,0 +1,147 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from job_journal import TERMINAL_STATUSES, get_default_journal
+
+# Campaign dashboard - every Hedra job in the journal, one page at a time.
+# Pages are LIMIT/OFFSET queries on the created_at index; while auto-refresh is on,
+# each tick only asks the journal for rows (matching the filters, or already on
+# screen) changed after a change_seq cursor and patches them into the page in
+# place. The page is only re-queried when a newly matching row would land on it.
+
+st.set_page_config(page_title="Campaign Dashboard", page_icon="📊", layout="wide")
+
+# Seconds between incremental refreshes
+REFRESH_SECONDS = 3.0
+PAGE_SIZES = [25, 50, 100, 250]
+STATUSES = ["Submitted", "Queued", "InProgress", "Completed", "Failed", "TimedOut", "Abandoned"]
+
+journal = get_default_journal()
+
+st.title("📊 Campaign Dashboard")
+
+# Filters
+col1, col2, col3 = st.columns([2, 2, 1])
+with col1:
+    statuses = st.multiselect("Status", STATUSES)
+with col2:
+    search = st.text_input("Search", placeholder="Prospect, job ID or script hash").strip()
+with col3:
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+
+
+def load_page(key: tuple, page: int) -> dict:
+    """Full (re)load of one page, its total and the change cursor"""
+    return {
+        "key": key,
+        # Cursor first, so a change landing during the page query is picked up next tick
+        "cursor": journal.last_update(),
+        "rows": {row["job_id"]: row for row in
+                 journal.list_jobs(statuses, search, limit=page_size, offset=page * page_size)},
+        "total": journal.count_jobs(statuses, search),
+        "counts": journal.status_counts()
+    }
+
+
+def lands_on_page(row: dict, page: int, rows: dict) -> bool:
+    """Whether a row not yet on screen sorts into the current page (newest first)"""
+    if not rows:
+        return True
+    created = [shown["created_at"] for shown in rows.values()]
+    if len(rows) >= page_size and row["created_at"] < min(created):
+        return False  # belongs to a later page
+    return page == 0 or row["created_at"] <= max(created)
+
+
+filter_key = (tuple(statuses), search, page_size)
+dashboard = st.session_state.get("dashboard")
+page = st.session_state.get("dashboard_page", 0)
+if dashboard is None or dashboard["key"] != filter_key:
+    page = 0
+    dashboard = load_page(filter_key, page)
+else:
+    changed, dashboard["cursor"] = journal.changed_since(dashboard["cursor"], statuses, search,
+                                                         include_ids=dashboard["rows"])
+    if changed:
+        dashboard["counts"] = journal.status_counts()
+        unseen = [row for row in changed if row["job_id"] not in dashboard["rows"]]
+        for row in changed:
+            if row["job_id"] in dashboard["rows"]:
+                # Patched in place even if it no longer matches the status filter;
+                # it drops out on the next full load
+                dashboard["rows"][row["job_id"]] = row
+        if unseen:
+            # Rows that newly match the filters (mostly new jobs) change the total;
+            # the page itself is only re-queried when one of them sorts into it
+            if any(lands_on_page(row, page, dashboard["rows"]) for row in unseen):
+                dashboard = load_page(filter_key, page)
+            else:
+                dashboard["total"] = journal.count_jobs(statuses, search)
+
+# Status summary
+counts = dashboard["counts"]
+metrics = st.columns(len(STATUSES) + 1)
+metrics[0].metric("All jobs", sum(counts.values()))
+for column, status in zip(metrics[1:], STATUSES):
+    column.metric(status, counts.get(status, 0))
+
+# Pagination
+pages = max(1, -(-dashboard["total"] // page_size))
+nav1, nav2, nav3, nav4 = st.columns([1, 1, 2, 2])
+with nav1:
+    if st.button("◀ Previous", disabled=page == 0):
+        page -= 1
+        dashboard = load_page(filter_key, page)
+with nav2:
+    if st.button("Next ▶", disabled=page >= pages - 1):
+        page += 1
+        dashboard = load_page(filter_key, page)
+with nav3:
+    st.markdown(f"Page **{page + 1}** of **{pages}** ({dashboard['total']} jobs)")
+with nav4:
+    auto_refresh = st.checkbox("Auto-refresh", value=True)
+
+st.session_state.dashboard = dashboard
+st.session_state.dashboard_page = page
+
+
+def seconds(start, end):
+    return round(end - start, 1) if start and end else None
+
+
+now = time.time()
+rows = sorted(dashboard["rows"].values(), key=lambda row: row["created_at"], reverse=True)
+if rows:
+    table = pd.DataFrame([{
+        "Prospect": row["prospect"] or "",
+        "Job ID": row["job_id"],
+        "Script": row["script_hash"] or "",
+        "Status": row["status"],
+        "Progress": row["progress"] or 0,
+        "Queued": datetime.fromtimestamp(row["queued_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+        # Time spent waiting for a submit slot, then rendering (so far, if unfinished)
+        "Queue time (s)": seconds(row["queued_at"], row["created_at"]),
+        "Render time (s)": seconds(row["created_at"], row["finished_at"] or now),
+        "Video": row["video_url"],
+        "Error": row["error"] or ""
+    } for row in rows])
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Progress": st.column_config.ProgressColumn("Progress", min_value=0, max_value=100, format="%d%%"),
+            "Video": st.column_config.LinkColumn("Video")
+        }
+    )
+else:
+    st.info("No jobs match these filters yet")
+
+# Incremental refresh while anything is still rendering
+rendering = sum(n for status, n in counts.items() if status not in TERMINAL_STATUSES)
+if auto_refresh and rendering:
+    time.sleep(REFRESH_SECONDS)
+    st.rerun()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Polling strategies for Hedra job status checks
+
+A strategy decides how long to wait before the next /v1/projects/{jobId}
+check. The adaptive strategy predicts completion from observed progress
+deltas and historical render times, so it polls sparsely while a job is
+queued and densely around the predicted finish.
+"""
+
+import time
+import random
+import statistics
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PollState:
+    """Per-job polling bookkeeping"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.started_at = time.monotonic()
+        self.running_since: Optional[float] = None
+        self.polls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.last_delay = 0.0
+        self.samples: deque = deque(maxlen=6)  # (timestamp, progress)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def record(self, check: Dict[str, Any]):
+        """Record the outcome of one status check"""
+        self.polls += 1
+        if check.get("error"):
+            self.errors += 1
+            self.consecutive_errors += 1
+            return
+
+        self.consecutive_errors = 0
+        now = time.monotonic()
+        if check.get("status") == "InProgress" and self.running_since is None:
+            self.running_since = now
+        progress = check.get("progress")
+        if isinstance(progress, (int, float)):
+            self.samples.append((now, float(progress)))
+
+    def report(self) -> Dict[str, Any]:
+        """Request count and latency overhead of polling this job"""
+        return {
+            "polls": self.polls,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed(), 2),
+            # Completion may have happened any time during the final wait
+            "max_detection_lag": round(self.last_delay, 2)
+        }
+
+
+class RenderTimeHistory:
+    """Rolling window of observed render durations, shared across jobs"""
+
+    def __init__(self, size: int = 50):
+        self._lock = threading.Lock()
+        self._durations: deque = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._durations.append(seconds)
+
+    def median(self) -> Optional[float]:
+        with self._lock:
+            return statistics.median(self._durations) if self._durations else None
+
+
+class PollStrategy:
+    """Base polling strategy - subclasses implement next_delay"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {"jobs": 0, "polls": 0, "errors": 0, "detection_lag": 0.0}
+
+    def begin(self, job_id: str) -> PollState:
+        return PollState(job_id)
+
+    def next_delay(self, state: PollState, check: Dict[str, Any]) -> float:
+        raise NotImplementedError
+
+    def finish(self, state: PollState, success: bool) -> Dict[str, Any]:
+        """Fold a finished job into the aggregate stats and return its report"""
+        report = state.report()
+        with self._lock:
+            self._totals["jobs"] += 1
+            self._totals["polls"] += state.polls
+            self._totals["errors"] += state.errors
+            self._totals["detection_lag"] += state.last_delay
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = self._totals["jobs"]
+            return {
+                "strategy": type(self).__name__,
+                "jobs": jobs,
+                "polls": self._totals["polls"],
+                "errors": self._totals["errors"],
+                "polls_per_job": self._totals["polls"] / jobs if jobs else 0.0,
+                "avg_max_detection_lag": self._totals["detection_lag"] / jobs if jobs else 0.0
+            }
+
+
+class FixedIntervalStrategy(PollStrategy):
+    """Legacy behaviour - the same interval for every check, including after errors"""
+
+    def __init__(self, interval: float = 10):
+        super().__init__()
+        self.interval = interval
+
+    def next_delay(self, state: PollState, check: Dict[str, Any]) -> float:
+        state.last_delay = self.interval
+        return self.interval
+
+
+class AdaptiveEtaStrategy(PollStrategy):
+    """
+    ETA-driven polling
+
+    - Queued: poll every queued_interval seconds
+    - InProgress: wait a fraction of the predicted time remaining, clamped to
+      [min_interval, max_interval], so checks get denser near the finish
+    - Errors: exponential backoff with full jitter
+    """
+
+    def __init__(self,
+                 min_interval: float = 1.0,
+                 max_interval: float = 30.0,
+                 queued_interval: float = 15.0,
+                 eta_fraction: float = 0.5,
+                 error_base: float = 2.0,
+                 error_cap: float = 60.0,
+                 history: Optional[RenderTimeHistory] = None):
+        super().__init__()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.queued_interval = queued_interval
+        self.eta_fraction = eta_fraction
+        self.error_base = error_base
+        self.error_cap = error_cap
+        self.history = history or default_render_history
+
+    def estimate_remaining(self, state: PollState) -> Optional[float]:
+        """Seconds until completion from progress rate, else from render history"""
+        samples: List[Tuple[float, float]] = list(state.samples)
+        if len(samples) >= 2:
+            (t0, p0), (t1, p1) = samples[0], samples[-1]
+            if p1 > p0 and t1 > t0:
+                rate = (p1 - p0) / (t1 - t0)
+                return max(100.0 - p1, 0.0) / rate
+
+        typical = self.history.median()
+        if typical is not None and state.running_since is not None:
+            return typical - (time.monotonic() - state.running_since)
+        return None
+
+    def next_delay(self, state: PollState, check: Dict[str, Any]) -> float:
+        if check.get("error"):
+            ceiling = min(self.error_cap, self.error_base * (2 ** (state.consecutive_errors - 1)))
+            delay = max(self.min_interval, random.uniform(0, ceiling))
+        elif check.get("status") == "Queued":
+            delay = self.queued_interval
+        else:
+            remaining = self.estimate_remaining(state)
+            if remaining is None:
+                delay = self.max_interval / 3
+            else:
+                delay = min(self.max_interval, max(self.min_interval, remaining * self.eta_fraction))
+
+        state.last_delay = delay
+        return delay
+
+    def finish(self, state: PollState, success: bool) -> Dict[str, Any]:
+        if success and state.running_since is not None:
+            self.history.add(time.monotonic() - state.running_since)
+        return super().finish(state, success)
+
+
+default_render_history = RenderTimeHistory()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Token-budget aware prompt building
+
+Prompts are written as indented triple-quoted f-strings for readability; the
+indentation and blank lines would otherwise be sent (and billed) as tokens.
+This module compacts them, counts tokens locally (tiktoken when installed, a
+character heuristic otherwise), sizes max_tokens from the video duration and
+warns when inputs push a request past its budget.
+"""
+
+import re
+import math
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Average conversational speech rate for the avatar voices
+SPEECH_WORDS_PER_SECOND = 2.5
+# English prose averages about 1.3 tokens per word for GPT tokenizers
+TOKENS_PER_WORD = 1.35
+
+CONTEXT_WINDOWS = {
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385
+}
+
+# Tokens of chat framing added per message (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken  # in requirements.txt; counts fall back to an estimate without it
+    except ImportError:
+        logger.warning("tiktoken not installed - token budgets use a ~4 characters/token estimate")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails offline
+        logger.warning(f"Could not load a tiktoken encoding ({str(e)}) - using a ~4 characters/token estimate")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Tokens in text for model (about 4 characters per token without tiktoken)"""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def compact_prompt(text: str) -> str:
+    """Strip indentation, trailing spaces and runs of blank lines from a prompt"""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+def duration_seconds(duration: str, default: float = 90.0) -> float:
+    """
+    Upper bound of a duration like "60-90 seconds", "45s" or "2 minutes"
+
+    Returns default when no number can be found.
+    """
+    numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", duration or "")]
+    if not numbers:
+        return default
+    seconds = max(numbers)
+    if re.search(r"\bmin", duration, re.IGNORECASE):
+        seconds *= 60
+    return seconds
+
+
+def max_tokens_for_duration(duration: str,
+                            words_per_second: float = SPEECH_WORDS_PER_SECOND,
+                            headroom: float = 1.25,
+                            minimum: int = 150) -> int:
+    """
+    Completion budget for a script spoken in duration
+
+    The spoken words at words_per_second, converted to tokens, plus headroom for
+    delivery cues and the model overshooting a little.
+    """
+    words = duration_seconds(duration) * words_per_second
+    return max(minimum, math.ceil(words * TOKENS_PER_WORD * headroom))
+
+
+def max_tokens_for_rewrite(text: str, model: str = "gpt-4", expansion: float = 1.3, minimum: int = 150) -> int:
+    """Completion budget for a rewrite of text (markup like [pause] makes it grow a little)"""
+    return max(minimum, math.ceil(count_tokens(text, model) * expansion))
+
+
+def build_messages(model: str,
+                   system: str,
+                   prompt: str,
+                   max_tokens: int,
+                   inputs: Optional[Dict[str, str]] = None,
+                   input_budget: int = 1500) -> List[Dict[str, str]]:
+    """
+    Compact a system + user prompt pair and check it against the token budget
+
+    Args:
+        model: Model the request goes to (selects tokenizer and context window)
+        system: System message
+        prompt: User message (typically an indented f-string)
+        max_tokens: Completion tokens that will be requested
+        inputs: Free-form values interpolated into the prompt, by name, so an
+                oversized one (e.g. a pasted original_script) can be named in the warning
+        input_budget: Tokens any single input may use before a warning
+
+    Returns:
+        Chat messages ready for the API
+    """
+    messages = [
+        {"role": "system", "content": compact_prompt(system)},
+        {"role": "user", "content": compact_prompt(prompt)}
+    ]
+
+    for name, value in (inputs or {}).items():
+        tokens = count_tokens(value or "", model)
+        if tokens > input_budget:
+            logger.warning(f"Prompt input '{name}' is {tokens} tokens (budget {input_budget}) - "
+                           f"it will slow the {model} call and may crowd out the reply")
+
+    prompt_tokens = sum(count_tokens(m["content"], model) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+    window = CONTEXT_WINDOWS.get(model)
+    if window and prompt_tokens + max_tokens > window:
+        logger.warning(f"{model} request needs {prompt_tokens} prompt + {max_tokens} completion tokens, "
+                       f"over its {window}-token context window")
+    return messages
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Two-tier cache for OpenAI chat completions
+
+Responses are keyed on model + messages + sampling parameters. The first tier
+is an in-process LRU; the second is a SQLite file shared by every process on
+the machine (Streamlit sessions, batch workers). Both tiers honour a TTL.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMPT_CACHE_PATH = os.getenv("PROMPT_CACHE_PATH", os.path.join(".video_state", "prompt_cache.db"))
+
+
+def prompt_key(model: str, messages: List[Dict[str, str]], **params) -> str:
+    """Canonical hash of everything that determines a completion"""
+    canonical = json.dumps({"model": model, "messages": messages, "params": params},
+                           sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    def __init__(self,
+                 path: Optional[str] = DEFAULT_PROMPT_CACHE_PATH,
+                 memory_entries: int = 256,
+                 disk_entries: int = 10000,
+                 ttl: float = 24 * 3600):
+        """
+        Args:
+            path: SQLite file for the shared disk tier (None for memory only)
+            memory_entries: LRU size of the in-process tier
+            disk_entries: Maximum rows kept on disk (oldest are pruned)
+            ttl: Seconds a cached response stays valid
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (created_at, text)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            conn = self._conn()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_created ON completions (created_at)")
+            conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                self._metrics["memory_hits"] += 1
+                return entry[1]
+            if entry:
+                del self._memory[key]
+
+        if self.path:
+            row = self._conn().execute(
+                "SELECT response, created_at FROM completions WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row:
+                self._remember(key, row[1], row[0])
+                with self._lock:
+                    self._metrics["disk_hits"] += 1
+                return row[0]
+
+        with self._lock:
+            self._metrics["misses"] += 1
+        return None
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        self._remember(key, now, response)
+        if self.path:
+            conn = self._conn()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO completions (key, response, created_at) VALUES (?, ?, ?)",
+                             (key, response, now))
+                conn.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl,))
+                conn.execute(
+                    "DELETE FROM completions WHERE key IN "
+                    "(SELECT key FROM completions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_entries,)
+                )
+        with self._lock:
+            self._metrics["stores"] += 1
+
+    def record_bypass(self):
+        with self._lock:
+            self._metrics["bypassed"] += 1
+
+    def _remember(self, key: str, created_at: float, response: str):
+        with self._lock:
+            self._memory[key] = (created_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._metrics["memory_hits"] + self._metrics["disk_hits"]
+            lookups = hits + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory)
+            }
+
+
+_default_cache: Optional[PromptCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_prompt_cache() -> PromptCache:
+    """Process-wide prompt cache at DEFAULT_PROMPT_CACHE_PATH"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PromptCache()
+        return _default_cache
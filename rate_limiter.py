@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Process-wide rate limiting for Mercury API calls
+
+Each API key gets one ApiGovernor shared by every HedraClient instance and
+thread: separate token buckets for submits, polls and downloads, plus a cap on
+jobs in flight. Buckets back off multiplicatively when the provider answers
+429 and creep back up to their configured rate while calls succeed (AIMD).
+"""
+
+import os
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; reserve() returns how long the caller must wait"""
+
+    def __init__(self, rate: float, capacity: float, min_rate: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (the configured, maximum rate)
+            capacity: Burst size
+            min_rate: Floor for the rate after 429 back-off (defaults to rate / 16)
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens now (possibly going into debt) and return the seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            delay = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+            self.waited += delay
+            return delay
+
+    def acquire(self, tokens: float = 1):
+        """Block until tokens are available"""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """Provider said 429: halve the rate and pause for Retry-After"""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        logger.warning(f"Rate limited - bucket slowed to {self.rate:.3f}/s"
+                       + (f", paused {retry_after:.1f}s" if retry_after else ""))
+
+    def succeed(self):
+        """Call went through: recover towards the configured rate"""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 4),
+                "max_rate": self.max_rate,
+                "throttled": self.throttled,
+                "total_wait_seconds": round(self.waited, 2)
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header in seconds (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Per-API-key limits from the environment (ApiGovernor's defaults)
+DEFAULT_LIMITS = {
+    "submit_rate": float(os.getenv("HEDRA_SUBMIT_RATE", "1.0")),
+    "poll_rate": float(os.getenv("HEDRA_POLL_RATE", "5.0")),
+    "download_rate": float(os.getenv("HEDRA_DOWNLOAD_RATE", "2.0")),
+    "max_in_flight_jobs": int(os.getenv("HEDRA_MAX_IN_FLIGHT_JOBS", "20"))
+}
+
+
+class ApiGovernor:
+    def __init__(self,
+                 submit_rate: float = DEFAULT_LIMITS["submit_rate"],
+                 poll_rate: float = DEFAULT_LIMITS["poll_rate"],
+                 download_rate: float = DEFAULT_LIMITS["download_rate"],
+                 max_in_flight_jobs: int = DEFAULT_LIMITS["max_in_flight_jobs"]):
+        """
+        Args:
+            submit_rate: /v1/characters calls per second
+            poll_rate: /v1/projects status checks per second
+            download_rate: Video downloads started per second
+            max_in_flight_jobs: Jobs submitted but not yet finished
+        """
+        self.buckets = {
+            "submit": TokenBucket(submit_rate, capacity=max(1.0, submit_rate * 5)),
+            "poll": TokenBucket(poll_rate, capacity=max(1.0, poll_rate * 2)),
+            "download": TokenBucket(download_rate, capacity=max(1.0, download_rate * 2))
+        }
+        self.max_in_flight_jobs = max_in_flight_jobs
+        self._slots = threading.BoundedSemaphore(max_in_flight_jobs)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, kind: str):
+        """Block until a call of this kind ("submit", "poll", "download") is allowed"""
+        self.buckets[kind].acquire()
+
+    def reserve(self, kind: str) -> float:
+        """Non-blocking variant for event loops: seconds to sleep before the call"""
+        return self.buckets[kind].reserve()
+
+    def observe(self, kind: str, status_code: int, retry_after: Optional[str] = None):
+        """Feed a response status back so the bucket can adapt"""
+        if status_code == 429:
+            self.buckets[kind].throttle(parse_retry_after(retry_after))
+        elif status_code < 500:
+            self.buckets[kind].succeed()
+
+    def try_acquire_job_slot(self) -> bool:
+        if self._slots.acquire(blocking=False):
+            with self._lock:
+                self._in_flight += 1
+            return True
+        return False
+
+    def acquire_job_slot(self, timeout: Optional[float] = None) -> bool:
+        if self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._in_flight += 1
+            return True
+        return False
+
+    def release_job_slot(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    @contextmanager
+    def job_slot(self):
+        """Hold one of the max_in_flight_jobs slots for the duration of a job"""
+        self.acquire_job_slot()
+        try:
+            yield
+        finally:
+            self.release_job_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "in_flight_jobs": in_flight,
+            "max_in_flight_jobs": self.max_in_flight_jobs,
+            **{kind: bucket.stats() for kind, bucket in self.buckets.items()}
+        }
+
+
+def split_limits(parts: int, limits: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    One process's share when parts processes use the same API key
+
+    Governors only exist in process memory, so N processes each applying the full
+    limits would send N times the configured rates. Every rate is divided by parts
+    and so are the job slots (at least one per process).
+    """
+    limits = limits or DEFAULT_LIMITS
+    return {
+        "submit_rate": limits["submit_rate"] / parts,
+        "poll_rate": limits["poll_rate"] / parts,
+        "download_rate": limits["download_rate"] / parts,
+        "max_in_flight_jobs": max(1, limits["max_in_flight_jobs"] // parts)
+    }
+
+
+_governors: Dict[str, ApiGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def configure_governor(api_key: str, **limits) -> ApiGovernor:
+    """Set the limits for one API key (replaces any existing governor for it)"""
+    with _governors_lock:
+        _governors[api_key] = ApiGovernor(**limits)
+        return _governors[api_key]
+
+
+def get_governor(api_key: str) -> ApiGovernor:
+    """The process-wide governor for this API key"""
+    with _governors_lock:
+        if api_key not in _governors:
+            _governors[api_key] = ApiGovernor()
+        return _governors[api_key]
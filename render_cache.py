@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Content-addressed render cache for Hedra videos
+
+Completed renders are stored under the canonical hash of the Mercury payload
+(text, voiceId, aspectRatio, avatar prompt and seed), so an identical request
+returns the earlier video immediately instead of submitting a new job.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.getenv("HEDRA_RENDER_CACHE", os.path.join(".video_state", "render_cache.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS renders (
+    payload_hash TEXT PRIMARY KEY,
+    job_id       TEXT,
+    video_url    TEXT NOT NULL,
+    local_path   TEXT,
+    size_bytes   INTEGER NOT NULL DEFAULT 0,
+    created_at   REAL NOT NULL,
+    last_hit_at  REAL NOT NULL,
+    hits         INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS renders_last_hit ON renders (last_hit_at);
+CREATE INDEX IF NOT EXISTS renders_video_url ON renders (video_url);
+"""
+
+
+class RenderCache:
+    def __init__(self,
+                 path: str = DEFAULT_CACHE_PATH,
+                 max_entries: int = 1000,
+                 max_age: float = 24 * 3600,
+                 max_bytes: int = 5 * 1024 ** 3):
+        """
+        Args:
+            path: SQLite file holding the cache index
+            max_entries: Least-recently-hit entries beyond this are evicted
+            max_age: Entries older than this (seconds) are treated as misses and evicted
+            max_bytes: Total size of cached local files before LRU eviction
+                       (files are only deleted if they live in the cache directory)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _count(self, metric: str, n: int = 1):
+        with self._lock:
+            self._metrics[metric] += n
+
+    def get(self, payload_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached render for this payload hash, or None on a miss"""
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM renders WHERE payload_hash = ?", (payload_hash,)).fetchone()
+        now = time.time()
+
+        if row is None or now - row["created_at"] > self.max_age:
+            if row is not None:
+                self._delete(conn, [row])
+            self._count("misses")
+            return None
+
+        with conn:
+            conn.execute("UPDATE renders SET hits = hits + 1, last_hit_at = ? WHERE payload_hash = ?",
+                         (now, payload_hash))
+        self._count("hits")
+
+        entry = dict(row)
+        if entry["local_path"] and not os.path.exists(entry["local_path"]):
+            entry["local_path"] = None
+        return entry
+
+    def put(self, payload_hash: str, result: Dict[str, Any]):
+        """Store a successful create_video_complete result"""
+        if not result.get("success") or not result.get("video_url"):
+            return
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO renders (payload_hash, job_id, video_url, created_at, last_hit_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (payload_hash, result.get("job_id"), result["video_url"], now, now)
+            )
+        self._count("stores")
+        self.evict()
+
+    def record_download(self, video_url: str, local_path: str):
+        """Attach a downloaded file to the entries serving this URL"""
+        size = os.path.getsize(local_path) if os.path.exists(local_path) else 0
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE renders SET local_path = ?, size_bytes = ? WHERE video_url = ?",
+                         (os.path.abspath(local_path), size, video_url))
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least-recently-hit ones beyond the count/size limits"""
+        conn = self._conn()
+        expired = conn.execute("SELECT * FROM renders WHERE created_at < ?",
+                               (time.time() - self.max_age,)).fetchall()
+        self._delete(conn, expired)
+
+        rows = conn.execute("SELECT * FROM renders ORDER BY last_hit_at DESC").fetchall()
+        keep_bytes = 0
+        victims = []
+        for index, row in enumerate(rows):
+            keep_bytes += row["size_bytes"]
+            if index >= self.max_entries or keep_bytes > self.max_bytes:
+                victims.append(row)
+        self._delete(conn, victims)
+
+    def _delete(self, conn: sqlite3.Connection, rows):
+        if not rows:
+            return
+        with conn:
+            conn.executemany("DELETE FROM renders WHERE payload_hash = ?", [(row["payload_hash"],) for row in rows])
+        for row in rows:
+            # Only delete files stored inside the cache directory - never user-chosen download paths
+            if row["local_path"] and self._owns(row["local_path"]) and os.path.exists(row["local_path"]):
+                try:
+                    os.remove(row["local_path"])
+                except OSError as e:
+                    logger.warning(f"Could not remove evicted render {row['local_path']}: {e}")
+        self._count("evictions", len(rows))
+
+    def _owns(self, local_path: str) -> bool:
+        cache_dir = os.path.dirname(os.path.abspath(self.path))
+        return os.path.commonpath([cache_dir, os.path.abspath(local_path)]) == cache_dir
+
+    def stats(self) -> Dict[str, Any]:
+        row = self._conn().execute("SELECT COUNT(*) AS n, COALESCE(SUM(size_bytes), 0) AS b FROM renders").fetchone()
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+                "entries": row["n"],
+                "bytes": row["b"]
+            }
+
+
+_default_cache: Optional[RenderCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_render_cache() -> RenderCache:
+    """Process-wide render cache at DEFAULT_CACHE_PATH"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = RenderCache()
+        return _default_cache
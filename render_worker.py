@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Render worker service
+
+Consumes the local render queue (job_queue.py) and does everything that talks
+to OpenAI and Hedra: script generation, submission, status polling and the
+optional download. Run it next to the Streamlit app:
+
+    python render_worker.py --workers 2 --concurrency 4
+
+Each worker process runs `concurrency` request threads sharing one HedraClient
+(journal- and cache-backed) and one JobTracker, so a process with many renders
+in flight still polls Hedra from a single scheduler thread. Rate limits and
+job slots are per process, so each of the --workers processes gets 1/N of the
+configured HEDRA_* limits, and only the first one resumes journaled jobs.
+"""
+
+import os
+import sys
+import signal
+import argparse
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict, Any, Optional
+
+from hedra_client import HedraClient, build_character_payload, cached_render_result, payload_hash
+from job_journal import get_default_journal
+from job_queue import DEFAULT_QUEUE_PATH, JobQueue
+from job_tracker import JobTracker
+from rate_limiter import configure_governor, split_limits
+from render_cache import get_default_render_cache
+from script_generator import ScriptGenerator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOWNLOAD_DIR = os.getenv("HEDRA_DOWNLOAD_DIR") or os.path.join(".video_state", "videos")
+
+
+class RenderWorker:
+    def __init__(self, queue: JobQueue, concurrency: int = 4, idle_interval: float = 1.0,
+                 download_dir: str = DEFAULT_DOWNLOAD_DIR, client=None, generator=None, resume: bool = True):
+        """
+        Args:
+            queue: Queue to claim requests from
+            concurrency: Requests this process works on at once
+            idle_interval: Seconds between claim attempts while the queue is empty
+            download_dir: Where videos of requests with "download" set are saved
+            client: HedraClient (default: journal- and cache-backed from the environment)
+            generator: ScriptGenerator for requests that need a script (created on first use)
+            resume: Reattach to the journal's unfinished jobs on start (one worker process per journal)
+        """
+        self.queue = queue
+        self.concurrency = concurrency
+        self.idle_interval = idle_interval
+        self.download_dir = download_dir
+        self.client = client or HedraClient(journal=get_default_journal(), render_cache=get_default_render_cache())
+        self.tracker = JobTracker(self.client)
+        self._generator = generator
+        self.resume = resume
+        self._generator_lock = threading.Lock()
+        self.worker_id = queue.register_worker()
+        self._stop = threading.Event()
+
+    @property
+    def generator(self):
+        with self._generator_lock:
+            if self._generator is None:
+                self._generator = ScriptGenerator()
+            return self._generator
+
+    def run(self, stop: Optional[Any] = None):
+        """Work until stop (a threading/multiprocessing Event) is set"""
+        stop = self._stop = stop or self._stop
+        logger.info(f"Render worker {self.worker_id} started with {self.concurrency} slots")
+        if self.resume:
+            self.tracker.resume(max_age=24 * 3600)
+        threads = [threading.Thread(target=self._loop, args=(stop,), name=f"render-{i}", daemon=True)
+                   for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        try:
+            # Heartbeat also renews the leases of every request this process holds
+            while not stop.wait(self.queue.lease_seconds / 4):
+                self.queue.worker_heartbeat(self.worker_id)
+        finally:
+            for thread in threads:
+                thread.join()
+            self.queue.unregister_worker(self.worker_id)
+            self.tracker.shutdown(wait=False)
+            logger.info(f"Render worker {self.worker_id} stopped")
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, stop):
+        while not stop.is_set():
+            request = self.queue.claim(self.worker_id)
+            if request is None:
+                stop.wait(self.idle_interval)
+                continue
+            try:
+                result = self.process(request)
+            except Exception as e:
+                logger.error(f"Request {request['request_id']} failed: {e}")
+                result = {"success": False, "error": f"Render worker error: {str(e)}"}
+            if result is not None:
+                self.queue.finish(request["request_id"], self.worker_id, result)
+
+    def process(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Generate the script if needed, render it and optionally download the video
+
+        Returns the result dict to store, or None if another worker took the request over.
+        """
+        request_id = request["request_id"]
+        params = request["params"]
+
+        def report(stage: str, progress: Optional[int] = None, job_id: Optional[str] = None) -> bool:
+            return self.queue.update(request_id, self.worker_id, stage, progress, job_id)
+
+        script_text = params.get("script_text")
+        if not script_text:
+            report("Generating script")
+            try:
+                script_text = self.generator.generate_sales_script(**params["script"], raise_errors=True)
+            except Exception as e:
+                return {"success": False, "error": f"Error generating script: {str(e)}"}
+
+        if not report("Submitting"):
+            return None
+        voice_id = self.client.resolve_voice(params.get("voice_id", "default"))
+        aspect_ratio = params.get("aspect_ratio", "16:9")
+        request_hash = payload_hash(build_character_payload(script_text, voice_id, aspect_ratio))
+
+        cached = self.client.render_cache.get(request_hash) if self.client.render_cache is not None else None
+        if cached:
+            logger.info(f"Render cache hit for job {cached['job_id']}")
+            result = cached_render_result(cached)
+        else:
+            handle = self.tracker.submit(script_text, voice_id, aspect_ratio,
+                                         prospect=request["prospect"], queued_at=request["created_at"])
+            while True:
+                try:
+                    result = handle.result(timeout=5)
+                    break
+                except FutureTimeout:
+                    if self._stop.is_set():
+                        # Shutting down - requeue; the next worker reattaches to the journaled job
+                        self.queue.release(request_id, self.worker_id)
+                        return None
+                    if not report(handle.status, handle.progress, handle.job_id or None):
+                        logger.warning(f"Lost lease on request {request_id} - leaving it to its new worker")
+                        return None
+            if self.client.render_cache is not None:
+                self.client.render_cache.put(request_hash, result)
+
+        if result["success"] and params.get("download") and not result.get("video_path"):
+            report("Downloading", 100)
+            download = self.client.download_video(result["video_url"], f"{request_id}.mp4", self.download_dir)
+            if download["success"]:
+                result["video_path"] = download["video_path"]
+            else:
+                result["download_error"] = download["error"]
+
+        result["script"] = script_text
+        return result
+
+
+def _worker_main(index: int, workers: int, queue_path: str, concurrency: int, download_dir: str, stop):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent turns Ctrl+C into stop.set()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    api_key = os.getenv("HEDRA_API_KEY")
+    if api_key and workers > 1:
+        # This process's share of the per-key limits - all workers together stay within them
+        configure_governor(api_key, **split_limits(workers))
+    worker = RenderWorker(JobQueue(queue_path), concurrency=concurrency, download_dir=download_dir,
+                          resume=index == 0)
+    worker.run(stop)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Process queued script/video requests for the Streamlit app")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight per worker process")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Queue database (default: %(default)s)")
+    parser.add_argument("--download-dir", default=DEFAULT_DOWNLOAD_DIR, help="Where downloaded videos go")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+
+    JobQueue(args.queue)  # create the schema once before the workers race for it
+    stop = multiprocessing.Event()
+    processes = [
+        multiprocessing.Process(target=_worker_main, name=f"render-worker-{i}",
+                                args=(i, args.workers, args.queue, args.concurrency, args.download_dir, stop))
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    logger.info(f"Started {args.workers} render workers on {args.queue}")
+
+    try:
+        while any(process.is_alive() for process in processes):
+            if stop.wait(1.0):
+                break
+    except KeyboardInterrupt:
+        pass
+    stop.set()
+    logger.info("Stopping render workers (in-flight renders resume on the next start)...")
+    for process in processes:
+        process.join()
+    return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Retry policy for Mercury API calls
+
+Failures where the request certainly did not take effect (429/503 rejections
+and connection errors before anything was sent) are retried with exponential
+backoff and full jitter, honouring Retry-After when the provider sends one.
+Ambiguous failures - a read timeout or dropped connection after the request
+went out, or a 502/504 from a gateway that may have forwarded it - are not
+retried by default: the caller has to find out whether the job exists first.
+A shared retry budget caps retries to a fraction of recent calls so an outage
+does not turn into a retry storm.
+"""
+
+import time
+import random
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, NamedTuple, Optional
+
+import httpx
+import requests
+
+from rate_limiter import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = (429, 503)
+
+# Gateway errors: the upstream may or may not have acted on the request
+AMBIGUOUS_STATUSES = (502, 504)
+
+
+class RetryBudget:
+    """Allow retries up to ratio x calls made in the last window seconds (with a small floor)"""
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls: deque = deque()
+        self._retries: deque = deque()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _trim(self, now: float):
+        for events in (self._calls, self._retries):
+            while events and events[0] < now - self.window:
+                events.popleft()
+
+    def record_call(self):
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            if len(self._retries) >= max(self.min_retries, self.ratio * len(self._calls)):
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            return {"calls": len(self._calls), "retries": len(self._retries), "exhausted": self.exhausted}
+
+
+class RetryPolicy:
+    def __init__(self,
+                 max_attempts: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0,
+                 retry_statuses=RETRYABLE_STATUSES,
+                 retry_ambiguous: bool = False,
+                 budget: Optional[RetryBudget] = None):
+        """
+        Args:
+            max_attempts: Total attempts including the first
+            base_delay: First backoff ceiling in seconds (doubles each attempt)
+            max_delay: Upper bound for any single wait, including Retry-After
+            retry_statuses: HTTP statuses where the server certainly rejected the request
+            retry_ambiguous: Also retry failures where the request may already have reached
+                             the server (read timeouts, dropped responses, 502/504) - only
+                             safe for idempotent calls
+            budget: Shared retry budget (defaults to a process-wide one)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_ambiguous = retry_ambiguous
+        self.budget = budget or default_retry_budget
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before attempt number attempt + 1"""
+        hinted = parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(self.max_delay, hinted)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses or (self.retry_ambiguous and status_code in AMBIGUOUS_STATUSES)
+
+    def should_retry_exception(self, error: Exception) -> bool:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+            return self.retry_ambiguous or is_unsent(error)
+        return False
+
+    def allow(self, attempt: int) -> bool:
+        """True if another attempt is permitted (attempt counts those already made)"""
+        return attempt < self.max_attempts and self.budget.try_spend()
+
+    def decide_exception(self, error: Exception, attempt: int) -> Optional["RetryDecision"]:
+        """
+        What to do after attempt number attempt raised error
+
+        Returns None for errors that are not transport failures (the caller re-raises).
+        """
+        if not isinstance(error, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+            return None
+        ambiguous = not is_unsent(error)
+        retry = self.should_retry_exception(error) and self.allow(attempt)
+        return RetryDecision(retry, self.backoff(attempt) if retry else 0.0, ambiguous)
+
+    def decide_status(self, status_code: int, attempt: int, retry_after: Optional[str] = None) -> "RetryDecision":
+        """What to do after attempt number attempt got an HTTP status_code response"""
+        retry = self.should_retry_status(status_code) and self.allow(attempt)
+        return RetryDecision(retry, self.backoff(attempt, retry_after) if retry else 0.0,
+                             status_code in AMBIGUOUS_STATUSES)
+
+
+class RetryDecision(NamedTuple):
+    retry: bool
+    delay: float = 0.0
+    # The failed attempt may have reached the server
+    ambiguous: bool = False
+
+
+def is_unsent(error: Exception) -> bool:
+    """Errors where the request certainly never reached the server"""
+    return isinstance(error, (requests.ConnectTimeout, httpx.ConnectError, httpx.ConnectTimeout)) or (
+        isinstance(error, requests.ConnectionError) and "NewConnectionError" in str(error)
+    )
+
+
+default_retry_budget = RetryBudget()
@@ -1,29 +1,158 @@
 import openai
-import os
-from typing import Dict, Any, Optional
+import re
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, Iterable, Iterator, Tuple
+
+from prompt_cache import PromptCache, get_default_prompt_cache, prompt_key
+from model_router import ModelRouter, get_default_router
+from openai_factory import get_openai_client
+from prompt_builder import build_messages, max_tokens_for_duration, max_tokens_for_rewrite
+from script_templates import MasterTemplate, TemplateError
+
+logger = logging.getLogger(__name__)
+
+# OpenAI Batch API: one input file holds at most this many requests
+BATCH_MAX_REQUESTS = 50000
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Errors after which _complete moves on to the task's next model
+FAILOVER_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+def parse_fused_response(text: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract (script, optimized_script) from a fused reply
+    
+    Accepts a bare JSON object, one wrapped in a code fence or surrounded by chatter,
+    and a SCRIPT: / OPTIMIZED SCRIPT: sectioned reply. Returns None when neither
+    version can be found.
+    """
+    text = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    candidates = [fenced.group(1).strip()] if fenced else []
+    candidates.append(text)
+    
+    # Decode one object at a time from each "{" on, so prose before or after it (even with braces) is ignored
+    decoder = json.JSONDecoder(strict=False)  # models often put raw newlines inside strings
+    for candidate in candidates:
+        start = candidate.find("{")
+        while start != -1:
+            try:
+                data, _ = decoder.raw_decode(candidate, start)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                script = str(data.get("script") or "").strip()
+                optimized = str(data.get("optimized_script") or data.get("optimized") or "").strip()
+                if script and optimized:
+                    return script, optimized
+            start = candidate.find("{", start + 1)
+    
+    sections = re.search(r"(?:^|\n)\W*script\W*:?\s*\n?(.*?)\n\W*optimi[sz]ed(?: script)?\W*:?\s*\n?(.*)$",
+                         text, re.IGNORECASE | re.DOTALL)
+    if sections and sections.group(1).strip() and sections.group(2).strip():
+        return sections.group(1).strip(), sections.group(2).strip()
+    return None
+
+
+def require_fused_response(text: str) -> Tuple[str, str]:
+    """parse_fused_response that raises ValueError instead of returning None"""
+    parsed = parse_fused_response(text)
+    if parsed is None:
+        raise ValueError("Fused script reply could not be parsed")
+    return parsed
+
 
 class ScriptGenerator:
     """
     AI-powered script generator for sales videos using OpenAI
     """
     
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
+    def __init__(self, prompt_cache: PromptCache = None, router: ModelRouter = None):
+        """
+        Args:
+            prompt_cache: Response cache for identical prompts (defaults to the shared one)
+            router: Per-task model selection (defaults to the shared one)
+        """
+        # Shared, pooled client: reusing it keeps connections warm across button clicks
+        self.client = get_openai_client()
         
-        # Set the API key for the openai module
-        openai.api_key = api_key
+        # Wall-clock vs summed latency of the last generate_script_variations call
+        self.last_variation_stats: Dict[str, Any] = {}
         
-        # Initialize client with minimal parameters
-        try:
-            self.client = openai.OpenAI()
-        except Exception as e:
-            # Fallback: try with just the API key
+        self.prompt_cache = prompt_cache or get_default_prompt_cache()
+        self.router = router or get_default_router()
+        self._served = threading.local()
+    
+    def _complete(self, model: str, messages: list, max_tokens: int, temperature: float,
+                  regenerate: bool = False, task: Optional[str] = None,
+                  validate: Optional[Callable[[str], Any]] = None) -> str:
+        """
+        Run one chat completion through the model router and the prompt cache
+        
+        With a task, the router picks the model (model is then only the batch default)
+        and a transient failure fails over to the task's next model. Byte-identical
+        requests (model, messages, sampling params) are answered from the cache;
+        regenerate=True always calls the API and refreshes the cached entry.
+        
+        validate(text) raises for a reply the caller cannot use. Such a reply is never
+        cached (the error propagates), and a cached entry that fails it is ignored.
+        """
+        candidates = self.router.candidates(task) if task else [model]
+        
+        key = prompt_key(candidates[0], messages, max_tokens=max_tokens, temperature=temperature)
+        if regenerate:
+            self.prompt_cache.record_bypass()
+        else:
+            cached = self.prompt_cache.get(key)
+            if cached is not None and validate is not None:
+                try:
+                    validate(cached)
+                except Exception as e:
+                    logger.warning(f"Ignoring cached {task or model} reply that fails validation: {str(e)}")
+                    cached = None
+            if cached is not None:
+                self._served.model = candidates[0]
+                if task:
+                    self.router.record(task, candidates[0], 0.0, True, cached=True, prompt_key=key)
+                return cached
+        
+        for i, candidate in enumerate(candidates):
+            key = prompt_key(candidate, messages, max_tokens=max_tokens, temperature=temperature)
+            started = time.perf_counter()
             try:
-                self.client = openai.OpenAI(api_key=api_key)
-            except Exception as e2:
-                raise ValueError(f"Failed to initialize OpenAI client: {str(e2)}")
+                response = self.client.chat.completions.create(
+                    model=candidate,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            except Exception as e:
+                if task:
+                    self.router.record(task, candidate, time.perf_counter() - started, False,
+                                       prompt_key=key, error=type(e).__name__)
+                if i + 1 < len(candidates) and isinstance(e, FAILOVER_ERRORS):
+                    logger.warning(f"{candidate} failed for {task} ({type(e).__name__}), trying {candidates[i + 1]}")
+                    continue
+                raise
+            
+            text = response.choices[0].message.content.strip()
+            if task:
+                self.router.record(task, candidate, time.perf_counter() - started, True, prompt_key=key)
+            if validate is not None:
+                validate(text)
+            self.prompt_cache.put(key, text)
+            self._served.model = candidate
+            return text
+    
+    @property
+    def last_model(self) -> Optional[str]:
+        """Model that served this thread's most recent completion"""
+        return getattr(self._served, "model", None)
     
     def generate_sales_script(self,
                             company_name: str,
@@ -32,7 +161,9 @@ class ScriptGenerator:
                             key_benefits: str,
                             call_to_action: str,
                             tone: str = "professional",
-                            duration: str = "60-90 seconds") -> str:
+                            duration: str = "60-90 seconds",
+                            regenerate: bool = False,
+                            raise_errors: bool = False) -> str:
         """
         Generate a personalized sales script using OpenAI
         
@@ -44,11 +175,89 @@ class ScriptGenerator:
             call_to_action: Desired action from the prospect
             tone: Tone of the script (professional, friendly, casual)
             duration: Target duration of the video
+            regenerate: Skip the prompt cache and ask the model again
+            raise_errors: Raise API errors instead of returning them as text
         
         Returns:
             Generated sales script as a string
         """
         
+        try:
+            text = self._complete(
+                **self._sales_script_request(company_name, contact_name, product_service,
+                                             key_benefits, call_to_action, tone, duration),
+                regenerate=regenerate,
+                task="sales_script"
+            )
+            
+            return text
+            
+        except Exception as e:
+            if raise_errors:
+                raise
+            return f"Error generating script: {str(e)}"
+    
+    def generate_sales_script_stream(self,
+                                     company_name: str,
+                                     contact_name: str,
+                                     product_service: str,
+                                     key_benefits: str,
+                                     call_to_action: str,
+                                     tone: str = "professional",
+                                     duration: str = "60-90 seconds",
+                                     regenerate: bool = False) -> Iterator[str]:
+        """
+        Streaming variant of generate_sales_script
+        
+        Yields text deltas as the model produces them, so a UI can show the first
+        words immediately. Joining the deltas (and stripping) gives the same script
+        generate_sales_script would return; the finished script is cached the same way,
+        and a cache hit is yielded as a single chunk.
+        
+        Raises:
+            Exception: The API error, also when it happens after some deltas were yielded -
+                       the partial script is never cached, and callers should discard it
+        """
+        request = self._sales_script_request(company_name, contact_name, product_service,
+                                             key_benefits, call_to_action, tone, duration)
+        request["model"] = self.router.candidates("sales_script")[0]
+        key = self._request_key(request)
+        self._served.model = request["model"]
+        
+        if regenerate:
+            self.prompt_cache.record_bypass()
+        else:
+            cached = self.prompt_cache.get(key)
+            if cached is not None:
+                self.router.record("sales_script", request["model"], 0.0, True, cached=True, prompt_key=key)
+                yield cached
+                return
+        
+        started = time.perf_counter()
+        try:
+            stream = self.client.chat.completions.create(**request, stream=True)
+            
+            parts = []
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            self.prompt_cache.put(key, "".join(parts).strip())
+            self.router.record("sales_script", request["model"], time.perf_counter() - started, True, prompt_key=key)
+            
+        except Exception as e:
+            self.router.record("sales_script", request["model"], time.perf_counter() - started, False,
+                               prompt_key=key, error=type(e).__name__)
+            raise
+    
+    def _sales_script_request(self, company_name: str, contact_name: str, product_service: str,
+                              key_benefits: str, call_to_action: str, tone: str = "professional",
+                              duration: str = "60-90 seconds", extra_requirements: str = "") -> Dict[str, Any]:
+        """Chat completion parameters shared by the live, streaming, batch and template sales script paths"""
         prompt = f"""
         Create a personalized sales video script with the following details:
         
@@ -69,6 +278,7 @@ class ScriptGenerator:
         6. Keep it conversational and engaging
         7. Ensure the script is appropriate for a {duration} video
         8. Use a {tone} tone throughout
+        {extra_requirements}
         
         Format the script as natural speech that would work well for an AI avatar.
         Avoid overly complex sentences and include natural pauses.
@@ -76,33 +286,130 @@ class ScriptGenerator:
         Script:
         """
         
+        max_tokens = max_tokens_for_duration(duration)
+        model = self.router.primary("sales_script")
+        return {
+            "model": model,
+            "messages": build_messages(
+                model,
+                "You are an expert sales copywriter specializing in creating compelling, personalized video scripts for B2B sales outreach. Your scripts are known for being engaging, concise, and highly effective at generating responses.",
+                prompt,
+                max_tokens,
+                inputs={"product_service": product_service, "key_benefits": key_benefits}
+            ),
+            "max_tokens": max_tokens,
+            "temperature": 0.7
+        }
+    
+    def _request_key(self, request: Dict[str, Any]) -> str:
+        """Prompt cache key for a chat completion request built by _sales_script_request"""
+        return prompt_key(request["model"], request["messages"],
+                          max_tokens=request["max_tokens"], temperature=request["temperature"])
+    
+    def generate_master_template(self,
+                                 product_service: str,
+                                 key_benefits: str,
+                                 call_to_action: str,
+                                 tone: str = "professional",
+                                 duration: str = "60-90 seconds",
+                                 max_attempts: int = 2,
+                                 regenerate: bool = False) -> MasterTemplate:
+        """
+        Generate one master script for a whole campaign
+        
+        The script addresses the prospect through {{company_name}} and {{contact_name}}
+        slots, so per-prospect scripts are rendered locally instead of costing one model
+        call each. A master that fails validation is regenerated (up to max_attempts).
+        
+        Args:
+            product_service: Description of the product/service
+            key_benefits: Key benefits to highlight
+            call_to_action: Desired action from the prospect
+            tone: Tone of the script (professional, friendly, casual)
+            duration: Target duration of the video
+            max_attempts: Model calls to spend on getting a valid template
+            regenerate: Skip the prompt cache and ask the model again
+        
+        Returns:
+            Compiled MasterTemplate
+        
+        Raises:
+            TemplateError: If no attempt produced a valid template
+        """
+        request = self._sales_script_request(
+            "{{company_name}}", "{{contact_name}}", product_service, key_benefits, call_to_action, tone, duration,
+            extra_requirements="9. This is a master script reused for many prospects: write the company name exactly "
+                               "as {{company_name}} and the contact's name exactly as {{contact_name}} every time, "
+                               "and use no other placeholders, brackets or invented names"
+        )
+        
+        for attempt in range(1, max_attempts + 1):
+            try:
+                text = self._complete(**request, regenerate=regenerate, task="master_template",
+                                      validate=MasterTemplate)
+                return MasterTemplate(text)
+            except TemplateError as e:
+                logger.warning(f"Master script attempt {attempt} rejected: {str(e)}")
+                if attempt == max_attempts:
+                    raise
+    
+    def personalize_script(self, script: str, company_name: str, contact_name: str,
+                           regenerate: bool = False, raise_errors: bool = False) -> str:
+        """
+        Cheap per-prospect polish of a script rendered from a master template
+        
+        Fixes grammar around the inserted names (articles, possessives) and may add a
+        light company-specific touch without changing length or call to action.
+        
+        Args:
+            script: Script rendered from a MasterTemplate
+            company_name: Name of the target company
+            contact_name: Name of the contact person
+            regenerate: Skip the prompt cache and ask the model again
+            raise_errors: Raise API errors instead of returning the script unchanged
+        
+        Returns:
+            Personalized script (the input script if the call fails)
+        """
+        prompt = f"""
+        Lightly personalize this sales video script for {contact_name} at {company_name}.
+        Fix any grammar around their names, keep the length, structure and call to action,
+        and return only the script.
+        
+        Script:
+        {script}
+        """
+        
+        model = self.router.primary("personalize")
+        max_tokens = max_tokens_for_rewrite(script, model, expansion=1.15)
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert sales copywriter specializing in creating compelling, personalized video scripts for B2B sales outreach. Your scripts are known for being engaging, concise, and highly effective at generating responses."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=800,
-                temperature=0.7
+            return self._complete(
+                model=model,
+                messages=build_messages(
+                    model,
+                    "You are a careful editor who makes minimal, natural edits to sales scripts.",
+                    prompt,
+                    max_tokens,
+                    inputs={"script": script}
+                ),
+                max_tokens=max_tokens,
+                temperature=0.3,
+                regenerate=regenerate,
+                task="personalize"
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
-            return f"Error generating script: {str(e)}"
+            if raise_errors:
+                raise
+            logger.warning(f"Personalization failed for {company_name}: {str(e)}")
+            return script
     
     def generate_follow_up_script(self,
                                 company_name: str,
                                 contact_name: str,
                                 original_script: str,
-                                response_type: str = "no_response") -> str:
+                                response_type: str = "no_response",
+                                regenerate: bool = False) -> str:
         """
         Generate a follow-up script based on the original outreach
         
@@ -111,6 +418,7 @@ class ScriptGenerator:
             contact_name: Name of the contact person
             original_script: The original script that was sent
             response_type: Type of response received (no_response, interested, not_interested)
+            regenerate: Skip the prompt cache and ask the model again
         
         Returns:
             Generated follow-up script
@@ -137,35 +445,37 @@ class ScriptGenerator:
         Script:
         """
         
+        max_tokens = max_tokens_for_duration("30-45 seconds")
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at creating follow-up sales messages that are helpful, non-pushy, and focused on providing value to the prospect."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=600,
-                temperature=0.7
+            text = self._complete(
+                model=self.router.primary("follow_up"),
+                messages=build_messages(
+                    self.router.primary("follow_up"),
+                    "You are an expert at creating follow-up sales messages that are helpful, non-pushy, and focused on providing value to the prospect.",
+                    prompt,
+                    max_tokens,
+                    inputs={"original_script": original_script}
+                ),
+                max_tokens=max_tokens,
+                temperature=0.7,
+                regenerate=regenerate,
+                task="follow_up"
             )
             
-            return response.choices[0].message.content.strip()
+            return text
             
         except Exception as e:
             return f"Error generating follow-up script: {str(e)}"
     
-    def optimize_script_for_avatar(self, script: str, avatar_style: str = "professional") -> str:
+    def optimize_script_for_avatar(self, script: str, avatar_style: str = "professional",
+                                   regenerate: bool = False) -> str:
         """
         Optimize a script for better delivery by an AI avatar
         
         Args:
             script: The original script
             avatar_style: Style of the avatar (professional, friendly, casual)
+            regenerate: Skip the prompt cache and ask the model again
         
         Returns:
             Optimized script with better pacing and delivery cues
@@ -189,45 +499,158 @@ class ScriptGenerator:
         Optimized Script:
         """
         
+        model = self.router.primary("optimize")
+        max_tokens = max_tokens_for_rewrite(script, model)
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in optimizing scripts for AI avatar delivery, ensuring natural speech patterns and effective communication."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=600,
-                temperature=0.5
+            text = self._complete(
+                model=model,
+                messages=build_messages(
+                    model,
+                    "You are an expert in optimizing scripts for AI avatar delivery, ensuring natural speech patterns and effective communication.",
+                    prompt,
+                    max_tokens,
+                    inputs={"script": script}
+                ),
+                max_tokens=max_tokens,
+                temperature=0.5,
+                regenerate=regenerate,
+                task="optimize"
             )
             
-            return response.choices[0].message.content.strip()
+            return text
             
         except Exception as e:
             return f"Error optimizing script: {str(e)}"
     
+    def generate_avatar_ready_script(self,
+                                     company_name: str,
+                                     contact_name: str,
+                                     product_service: str,
+                                     key_benefits: str,
+                                     call_to_action: str,
+                                     tone: str = "professional",
+                                     duration: str = "60-90 seconds",
+                                     avatar_style: str = "professional",
+                                     regenerate: bool = False) -> Dict[str, Any]:
+        """
+        Generate a sales script and its avatar-optimized version in one call
+        
+        The model returns both versions as one JSON object, which saves the second
+        round trip (and resending the whole script) of generate_sales_script followed
+        by optimize_script_for_avatar. If the reply can't be parsed, those two calls
+        are made instead.
+        
+        Args:
+            company_name: Name of the target company
+            contact_name: Name of the contact person
+            product_service: Description of the product/service
+            key_benefits: Key benefits to highlight
+            call_to_action: Desired action from the prospect
+            tone: Tone of the script (professional, friendly, casual)
+            duration: Target duration of the video
+            avatar_style: Style of the avatar (professional, friendly, casual)
+            regenerate: Skip the prompt cache and ask the model again
+        
+        Returns:
+            Dictionary with success, script, optimized_script, fused (False when the
+            two-call fallback was used) and model, or success False and error
+        """
+        prompt = f"""
+        Create a personalized sales video script and a version of it optimized for delivery by an
+        AI avatar with a {avatar_style} style.
+        
+        Target Company: {company_name}
+        Contact Person: {contact_name}
+        Product/Service: {product_service}
+        Key Benefits: {key_benefits}
+        Call to Action: {call_to_action}
+        Tone: {tone}
+        Duration: {duration}
+        
+        Script requirements:
+        1. Start with a personalized greeting using the contact's name and company
+        2. Quickly establish credibility and relevance
+        3. Present the product/service in a compelling way
+        4. Highlight the key benefits specifically for their company
+        5. Include a clear and compelling call to action
+        6. Keep it conversational, natural speech appropriate for a {duration} video in a {tone} tone
+        
+        Optimized version requirements:
+        1. Same message and call to action as the script
+        2. Natural pauses marked with [pause]
+        3. Long sentences broken into shorter, natural phrases
+        4. Emphasis marked with *emphasis*
+        5. Pronunciation-friendly wording for AI voice synthesis
+        
+        Reply with only a JSON object of the form:
+        {{"script": "<plain script>", "optimized_script": "<avatar-optimized script>"}}
+        """
+        
+        # Both versions plus JSON framing
+        max_tokens = 2 * max_tokens_for_duration(duration) + 100
+        model = self.router.primary("fused_script")
+        
+        try:
+            text = self._complete(
+                model=model,
+                messages=build_messages(
+                    model,
+                    "You are an expert sales copywriter who also prepares scripts for AI avatar delivery. You always answer with valid JSON.",
+                    prompt,
+                    max_tokens,
+                    inputs={"product_service": product_service, "key_benefits": key_benefits}
+                ),
+                max_tokens=max_tokens,
+                temperature=0.7,
+                regenerate=regenerate,
+                task="fused_script",
+                validate=require_fused_response
+            )
+            script, optimized = require_fused_response(text)
+            return {"success": True, "script": script, "optimized_script": optimized,
+                    "fused": True, "model": self.last_model}
+        except ValueError as e:
+            # Only an unusable reply is worth two more calls; API errors would just repeat
+            logger.warning(f"{str(e)} - falling back to two calls")
+        except Exception as e:
+            return {"success": False, "error": f"Error generating script: {str(e)}"}
+        
+        try:
+            script = self.generate_sales_script(company_name, contact_name, product_service, key_benefits,
+                                                call_to_action, tone, duration, regenerate=regenerate,
+                                                raise_errors=True)
+            model = self.last_model
+            optimized = self.optimize_script_for_avatar(script, avatar_style, regenerate=regenerate)
+            if optimized.startswith("Error optimizing script:"):
+                return {"success": False, "script": script, "error": optimized}
+            return {"success": True, "script": script, "optimized_script": optimized, "fused": False, "model": model}
+        except Exception as e:
+            return {"success": False, "error": f"Error generating script: {str(e)}"}
+    
     def generate_script_variations(self,
                                  base_script: str,
-                                 num_variations: int = 3) -> list:
+                                 num_variations: int = 3,
+                                 max_workers: int = 5,
+                                 regenerate: bool = False) -> list:
         """
         Generate multiple variations of a script for A/B testing
         
+        Variations are requested concurrently (each has its own prompt, so they
+        can't share one multi-completion request); output order is preserved and a
+        failed variation doesn't affect the others. Timing is stored in
+        self.last_variation_stats.
+        
         Args:
             base_script: The base script to create variations from
             num_variations: Number of variations to generate
+            max_workers: Maximum concurrent OpenAI requests
+            regenerate: Skip the prompt cache and ask the model again
         
         Returns:
             List of script variations
         """
         
-        variations = []
-        
-        for i in range(num_variations):
+        def generate_variation(i: int):
             prompt = f"""
             Create a variation of this sales script while maintaining the core message:
             
@@ -244,26 +667,181 @@ class ScriptGenerator:
             Variation:
             """
             
+            started = time.perf_counter()
+            model = self.router.primary("variation")
+            max_tokens = max_tokens_for_rewrite(base_script, model, expansion=1.2)
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a creative copywriter skilled at creating fresh variations of sales messages while maintaining their effectiveness."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=600,
-                    temperature=0.8
+                text = self._complete(
+                    model=model,
+                    messages=build_messages(
+                        model,
+                        "You are a creative copywriter skilled at creating fresh variations of sales messages while maintaining their effectiveness.",
+                        prompt,
+                        max_tokens,
+                        inputs={"base_script": base_script}
+                    ),
+                    max_tokens=max_tokens,
+                    temperature=0.8,
+                    regenerate=regenerate,
+                    task="variation"
                 )
                 
-                variations.append(response.choices[0].message.content.strip())
-                
             except Exception as e:
-                variations.append(f"Error generating variation {i+1}: {str(e)}")
+                text = f"Error generating variation {i+1}: {str(e)}"
+            
+            return text, time.perf_counter() - started
+        
+        if num_variations <= 0:
+            self.last_variation_stats = {"wall_seconds": 0.0, "summed_seconds": 0.0, "speedup": 1.0}
+            return []
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, num_variations))) as pool:
+            results = list(pool.map(generate_variation, range(num_variations)))
+        wall = time.perf_counter() - started
+        
+        summed = sum(latency for _, latency in results)
+        self.last_variation_stats = {
+            "wall_seconds": round(wall, 3),
+            "summed_seconds": round(summed, 3),
+            "speedup": round(summed / wall, 2) if wall else 1.0
+        }
+        logger.info(f"Generated {num_variations} variations in {wall:.2f}s "
+                    f"(sequential would take ~{summed:.2f}s)")
+        
+        return [text for text, _ in results]
+    
+    def write_script_batch(self, requests: Iterable[Tuple[str, Dict[str, Any]]], batch_path: str) -> int:
+        """
+        Serialize sales script requests to an OpenAI Batch API input file
+        
+        Args:
+            requests: (custom_id, generate_sales_script keyword arguments) pairs;
+                      custom_id maps each result back to its prospect
+            batch_path: JSONL file to write
+        
+        Returns:
+            Number of requests written (at most BATCH_MAX_REQUESTS)
+        
+        Raises:
+            ValueError: If there are more requests than one batch accepts
+        """
+        count = 0
+        with open(batch_path, "w", encoding="utf-8") as f:
+            for custom_id, kwargs in requests:
+                if count >= BATCH_MAX_REQUESTS:
+                    raise ValueError(f"A batch holds at most {BATCH_MAX_REQUESTS} requests - split the campaign")
+                line = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": self._sales_script_request(**kwargs)
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+    
+    def submit_script_batch(self, batch_path: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Upload a batch input file and start the batch job
+        
+        Returns:
+            Dictionary with success, batch_id, input_file_id and status
+        """
+        try:
+            with open(batch_path, "rb") as f:
+                input_file = self.client.files.create(file=f, purpose="batch")
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window="24h",
+                metadata=metadata
+            )
+            logger.info(f"Submitted script batch {batch.id} from {batch_path}")
+            return {"success": True, "batch_id": batch.id, "input_file_id": input_file.id, "status": batch.status}
+        except Exception as e:
+            return {"success": False, "error": f"Error submitting script batch: {str(e)}"}
+    
+    def wait_for_script_batch(self, batch_id: str, poll_interval: float = 60,
+                              max_wait_time: float = 25 * 3600) -> Dict[str, Any]:
+        """
+        Poll a batch job until it reaches a terminal status
+        
+        Args:
+            batch_id: ID returned by submit_script_batch
+            poll_interval: Seconds between status checks (batches take minutes to hours)
+            max_wait_time: Give up after this many seconds (the completion window is 24h)
+        
+        Returns:
+            Dictionary with success, status, request_counts, output_file_id and error_file_id
+        """
+        started = time.time()
+        while True:
+            try:
+                batch = self.client.batches.retrieve(batch_id)
+            except Exception as e:
+                logger.warning(f"Error checking script batch {batch_id}: {str(e)}")
+                batch = None
+            
+            if batch is not None:
+                counts = batch.request_counts
+                result = {
+                    "batch_id": batch_id,
+                    "status": batch.status,
+                    "request_counts": {
+                        "total": counts.total if counts else 0,
+                        "completed": counts.completed if counts else 0,
+                        "failed": counts.failed if counts else 0
+                    },
+                    "output_file_id": batch.output_file_id,
+                    "error_file_id": batch.error_file_id
+                }
+                if batch.status in BATCH_TERMINAL_STATUSES:
+                    result["success"] = batch.status == "completed" or bool(batch.output_file_id)
+                    if not result["success"]:
+                        result["error"] = f"Script batch {batch_id} ended as {batch.status}"
+                    return result
+                logger.info(f"Script batch {batch_id}: {batch.status} "
+                            f"({result['request_counts']['completed']}/{result['request_counts']['total']})")
+            
+            if time.time() - started + poll_interval > max_wait_time:
+                return {"success": False, "batch_id": batch_id, "error": f"Timed out waiting for script batch {batch_id}"}
+            time.sleep(poll_interval)
+    
+    def script_batch_results(self, batch: Dict[str, Any], batch_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Map a finished batch's output back to its requests
+        
+        Successful scripts are also stored in the prompt cache (when the input file is
+        given), so later interactive calls with the same inputs are answered instantly.
+        
+        Args:
+            batch: Result of wait_for_script_batch
+            batch_path: The input file passed to submit_script_batch
+        
+        Yields:
+            {"custom_id", "success", "script"} or {"custom_id", "success", "error"}
+        """
+        keys = {}
+        if batch_path:
+            with open(batch_path, encoding="utf-8") as f:
+                for line in f:
+                    request = json.loads(line)
+                    keys[request["custom_id"]] = self._request_key(request["body"])
         
-        return variations
+        for file_id in (batch.get("output_file_id"), batch.get("error_file_id")):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    script = response["body"]["choices"][0]["message"]["content"].strip()
+                    if item["custom_id"] in keys:
+                        self.prompt_cache.put(keys[item["custom_id"]], script)
+                    yield {"custom_id": item["custom_id"], "success": True, "script": script}
+                else:
+                    error = item.get("error") or (response.get("body") or {}).get("error") or response
+                    yield {"custom_id": item["custom_id"], "success": False, "error": str(error)}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Master script templates with named slots
+
+A campaign's prompts differ only in the prospect's company and contact name,
+so the model is asked once for a master script that uses {{company_name}} and
+{{contact_name}} placeholders. The master is validated and compiled into
+literal/slot parts; rendering a prospect's script is then a local string join.
+"""
+
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+# Slots a master script may use; the prospect row supplies their values
+TEMPLATE_SLOTS = ("company_name", "contact_name")
+REQUIRED_SLOTS = ("company_name", "contact_name")
+
+SLOT_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+# Placeholders models write when they ignore the slot syntax, e.g. [Company Name] or <Contact>
+STRAY_PLACEHOLDER_PATTERN = re.compile(r"[\[<][^\]>\n]{0,30}\b(name|company|contact|prospect)\b[^\]>\n]{0,30}[\]>]",
+                                       re.IGNORECASE)
+
+
+class TemplateError(ValueError):
+    """A master script is malformed or a render is missing slot values"""
+
+
+class MasterTemplate:
+    def __init__(self, text: str,
+                 allowed_slots: Tuple[str, ...] = TEMPLATE_SLOTS,
+                 required_slots: Tuple[str, ...] = REQUIRED_SLOTS):
+        """
+        Validate and compile a master script
+
+        Args:
+            text: Script containing {{slot}} placeholders
+            allowed_slots: Slot names the text may use
+            required_slots: Slot names that must appear at least once
+
+        Raises:
+            TemplateError: On unknown, missing or malformed slots
+        """
+        self.text = text.strip()
+        self.template_id = hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:12]
+
+        parts: List[Tuple[str, Optional[str]]] = []
+        used = set()
+        position = 0
+        for match in SLOT_PATTERN.finditer(self.text):
+            parts.append((self.text[position:match.start()], match.group(1)))
+            used.add(match.group(1))
+            position = match.end()
+        tail = self.text[position:]
+
+        literal = "".join(literal for literal, _ in parts) + tail
+        unknown = sorted(used - set(allowed_slots))
+        missing = [slot for slot in required_slots if slot not in used]
+        if unknown:
+            raise TemplateError(f"Master script uses unknown slots: {', '.join(unknown)}")
+        if missing:
+            raise TemplateError(f"Master script is missing slots: {', '.join(missing)}")
+        if "{{" in literal or "}}" in literal:
+            raise TemplateError("Master script has unbalanced slot braces")
+        stray = STRAY_PLACEHOLDER_PATTERN.search(literal)
+        if stray:
+            raise TemplateError(f"Master script has a placeholder outside the slot syntax: {stray.group(0)}")
+
+        self.slots = tuple(sorted(used))
+        self._parts = tuple(parts)
+        self._tail = tail
+
+    def render(self, values: Dict[str, str]) -> str:
+        """
+        Fill the slots for one prospect
+
+        Raises:
+            TemplateError: If a slot the template uses has no value
+        """
+        try:
+            return "".join(literal + str(values[slot]) for literal, slot in self._parts) + self._tail
+        except KeyError as e:
+            raise TemplateError(f"No value for slot {e.args[0]}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Streamlit app and its client modules
+
+Every measurement runs in a fresh interpreter, so nothing is already in
+sys.modules: each client module's import time, and the first render of app.py
+through Streamlit's AppTest harness. The app runs with dummy API keys and
+stubbed health probes, so the background health checks start exactly as in
+production (without network calls); afterwards the probe checks that both
+started and that the modules app.py must not import eagerly are still absent.
+Results are compared against budgets and the exit code is non-zero when any is
+exceeded:
+
+    python startup_benchmark.py --runs 5
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, Any, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Seconds for a cold `import <module>` (interpreter startup excluded)
+MODULE_BUDGETS = {
+    "job_queue": 0.1,
+    "job_journal": 0.1,
+    "health_checks": 0.1,
+    "hedra_client": 0.75,
+    "openai_client": 1.5,
+    "script_generator": 1.5
+}
+
+# Seconds for the first script run of app.py, after Streamlit itself is imported
+APP_RENDER_BUDGET = 1.0
+
+# Heavy modules app.py may only import once a button needs them
+# (requests/httpx are left out: Streamlit may load them itself)
+APP_LAZY_MODULES = ("openai", "openai_factory", "script_generator", "openai_client", "hedra_client")
+
+# Seconds each stubbed health probe takes - longer than the render budget, so a
+# first render that waited for the probes could not pass
+PROBE_SECONDS = 2.0
+
+IMPORT_PROBE = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+APP_PROBE = """
+import sys, json, time
+import health_checks
+
+# Stand-ins for the real probes (which import the clients and call the APIs)
+probed = []
+def stub_probe(provider):
+    def probe(api_key):
+        probed.append(provider)
+        time.sleep({probe_seconds!r})
+        return {{"success": True, "message": "stubbed"}}
+    return probe
+health_checks.PROBES.update({{provider: stub_probe(provider) for provider in health_checks.PROBES}})
+
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file("app.py", default_timeout=60).run()
+done = time.perf_counter()
+
+# Let the background health checks start before looking at sys.modules
+deadline = time.time() + 5
+while len(probed) < len(health_checks.PROBES) and time.time() < deadline:
+    time.sleep(0.05)
+print(json.dumps({{
+    "streamlit_import": imported - start,
+    "seconds": done - imported,
+    "exceptions": [str(e.value) for e in app.exception],
+    "unprobed": [provider for provider in health_checks.PROBES if provider not in probed],
+    "eager": [m for m in {lazy!r} if m in sys.modules]
+}}))
+"""
+
+
+def _probe(code: str, env: Dict[str, str]) -> Dict[str, Any]:
+    completed = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env,
+                               capture_output=True, text=True, timeout=300)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else
+                           f"exit code {completed.returncode}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _probe_env(state_dir: str) -> Dict[str, str]:
+    """Isolated state files, and dummy API keys so the app takes its configured-keys path"""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": HERE + os.pathsep + env.get("PYTHONPATH", ""),
+        "OPENAI_API_KEY": "sk-benchmark",
+        "HEDRA_API_KEY": "hedra-benchmark",
+        "HEDRA_JOB_JOURNAL": os.path.join(state_dir, "hedra_jobs.db"),
+        "HEDRA_RENDER_CACHE": os.path.join(state_dir, "render_cache.db"),
+        "RENDER_QUEUE_PATH": os.path.join(state_dir, "render_queue.db"),
+        "PROVIDER_HEALTH_PATH": os.path.join(state_dir, "provider_health.json"),
+        "PROMPT_CACHE_PATH": os.path.join(state_dir, "prompt_cache.db"),
+        "MODEL_ROUTING_LOG": os.path.join(state_dir, "model_routing.jsonl")
+    })
+    return env
+
+
+def run_benchmark(runs: int = 3, scale: float = 1.0, include_app: bool = True) -> List[Dict[str, Any]]:
+    """
+    Measure every module (and the app) `runs` times each
+
+    Returns one row per target with the median seconds, its budget and whether it passed.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        env = _probe_env(state_dir)
+
+        for module, budget in MODULE_BUDGETS.items():
+            row = {"target": f"import {module}", "budget": budget * scale}
+            try:
+                row["seconds"] = statistics.median(
+                    _probe(IMPORT_PROBE.format(module=module), env)["seconds"] for _ in range(runs))
+                row["ok"] = row["seconds"] <= row["budget"]
+            except Exception as e:
+                row.update(seconds=None, ok=False, error=str(e))
+            results.append(row)
+
+        if include_app:
+            row = {"target": "app.py first render", "budget": APP_RENDER_BUDGET * scale}
+            try:
+                probe = APP_PROBE.format(lazy=APP_LAZY_MODULES, probe_seconds=PROBE_SECONDS)
+                samples = [_probe(probe, env) for _ in range(runs)]
+                row["seconds"] = statistics.median(sample["seconds"] for sample in samples)
+                row["streamlit_import"] = statistics.median(sample["streamlit_import"] for sample in samples)
+                eager = sorted({module for sample in samples for module in sample["eager"]})
+                exceptions = [message for sample in samples for message in sample["exceptions"]]
+                unprobed = sorted({provider for sample in samples for provider in sample["unprobed"]})
+                row["ok"] = row["seconds"] <= row["budget"] and not eager and not exceptions and not unprobed
+                if eager:
+                    row["error"] = f"imported at startup: {', '.join(eager)}"
+                elif exceptions:
+                    row["error"] = f"app raised: {exceptions[0]}"
+                elif unprobed:
+                    row["error"] = f"health checks never started: {', '.join(unprobed)}"
+            except Exception as e:
+                row.update(seconds=None, ok=False, error=str(e))
+            results.append(row)
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import/render times against their budgets")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per target (median is used)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI machines)")
+    parser.add_argument("--modules-only", action="store_true", help="Skip the app.py render")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.runs, args.scale, include_app=not args.modules_only)
+
+    print("🚀 Cold-start benchmark")
+    print("=" * 60)
+    for row in results:
+        seconds = f"{row['seconds']:.3f}s" if row["seconds"] is not None else "   -  "
+        print(f"{'✅' if row['ok'] else '❌'} {row['target']:<28} {seconds}  (budget {row['budget']:.2f}s)")
+        if row.get("streamlit_import") is not None:
+            print(f"   streamlit import (not budgeted): {row['streamlit_import']:.3f}s")
+        if row.get("error"):
+            print(f"   {row['error']}")
+
+    failed = [row["target"] for row in results if not row["ok"]]
+    print("=" * 60)
+    print(f"❌ Over budget: {', '.join(failed)}" if failed else "✅ All targets within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
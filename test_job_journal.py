@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the journal's changed-since feed (no network)
+"""
+import sqlite3
+
+import pytest
+
+import job_journal
+from job_journal import JobJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return JobJournal(str(tmp_path / "jobs.db"))
+
+
+def submit(journal, job_id, prospect="Ann"):
+    journal.record_submission(job_id, {"text": f"Hi {prospect}"}, f"hash-{job_id}", prospect=prospect)
+
+
+def test_changes_are_fed_once_in_write_order(journal):
+    cursor = journal.last_update()
+    submit(journal, "job-1")
+    submit(journal, "job-2")
+    journal.record_status("job-1", "InProgress", 40)
+
+    rows, cursor = journal.changed_since(cursor)
+
+    assert [row["job_id"] for row in rows] == ["job-2", "job-1"]
+    assert journal.changed_since(cursor) == ([], cursor)
+
+
+def test_change_is_not_skipped_when_the_clock_steps_back(journal, monkeypatch):
+    submit(journal, "job-1")
+    cursor = journal.last_update()
+    # Another writer whose clock is behind (or a clock step) records an older updated_at
+    monkeypatch.setattr(job_journal.time, "time", lambda: 1.0)
+    journal.record_status("job-1", "Completed", 100, "https://video")
+
+    rows, _ = journal.changed_since(cursor)
+
+    assert [row["status"] for row in rows] == ["Completed"]
+
+
+def test_filtered_feed_pages_through_limit(journal):
+    cursor = journal.last_update()
+    for i in range(5):
+        submit(journal, f"job-{i}", prospect="Bob" if i % 2 else "Ann")
+
+    rows, cursor = journal.changed_since(cursor, search="Ann", limit=2)
+    more, cursor = journal.changed_since(cursor, search="Ann", limit=2)
+
+    assert [row["job_id"] for row in rows + more] == ["job-0", "job-2", "job-4"]
+    assert cursor == journal.last_update()
+
+
+def test_journal_from_before_change_seq_is_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE jobs (job_id TEXT PRIMARY KEY, payload_hash TEXT NOT NULL, payload TEXT NOT NULL, "
+                 "status TEXT NOT NULL, progress INTEGER NOT NULL DEFAULT 0, video_url TEXT, error TEXT, "
+                 "created_at REAL NOT NULL, updated_at REAL NOT NULL, finished_at REAL)")
+    conn.execute("INSERT INTO jobs (job_id, payload_hash, payload, status, created_at, updated_at) "
+                 "VALUES ('job-old', 'h', '{}', 'Submitted', 1, 1)")
+    conn.commit()
+    conn.close()
+
+    journal = JobJournal(path)
+    cursor = journal.last_update()
+    journal.record_status("job-old", "Completed", 100)
+
+    assert cursor == 1
+    assert [row["job_id"] for row in journal.changed_since(cursor)[0]] == ["job-old"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for batch campaign generation against the local OpenAI stand-in
+
+Everything the run writes (prompt cache, routing log, batch files) goes to
+tmp_path; the generator gets its own PromptCache and ModelRouter so the shared
+.video_state files are never touched.
+"""
+import json
+
+import pytest
+
+from campaign import CampaignRunner, prospect_id
+from fake_openai_server import FakeOpenAIServer
+from model_router import ModelRouter
+from prompt_cache import PromptCache
+from script_generator import ScriptGenerator
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeOpenAIServer(batch_delay=1.0).start()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def generator(server, tmp_path):
+    return ScriptGenerator(prompt_cache=PromptCache(str(tmp_path / "prompt_cache.db")),
+                           router=ModelRouter(log_path=str(tmp_path / "model_routing.jsonl")))
+
+
+def make_prospects(n):
+    return [
+        {"company_name": f"Company {i}", "contact_name": f"Contact {i}", "product_service": "AI Video Generator",
+         "key_benefits": "Save time", "call_to_action": "Book a demo"}
+        for i in range(n)
+    ]
+
+
+def test_script_batch(server, generator, tmp_path):
+    prospects = make_prospects(25)
+    server.fail_ids = {prospect_id(prospects[3])}
+    output = str(tmp_path / "scripts.jsonl")
+    runner = CampaignRunner(generator=generator)
+
+    # Submitted as batch jobs, results mapped back to their prospects
+    stats = runner.run_batch(iter(prospects), output, batch_size=10, poll_interval=0.2)
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    ok = [record for record in records if record["status"] == "ok"]
+    assert stats["batches"] == 3
+    assert stats["succeeded"] == 24 and stats["failed"] == 1
+    assert len(ok) == 24
+    assert all("Company" in record["script"] for record in ok)
+
+    # A rerun only resubmits the prospect that failed
+    server.fail_ids = set()
+    stats = runner.run_batch(iter(prospects), output, batch_size=10, poll_interval=0.2)
+    assert stats["skipped"] == 24 and stats["succeeded"] == 1
+
+    # Batch results also land in the prompt cache, so a live call costs nothing
+    before = server.requests
+    script = generator.generate_sales_script(**prospects[0])
+    assert server.requests == before
+    assert "Company 0" in script
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for fused script replies and their fallback (no network)
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from model_router import ModelRouter
+from prompt_cache import PromptCache
+from script_generator import ScriptGenerator, parse_fused_response, require_fused_response
+
+
+def test_bare_json_reply():
+    assert parse_fused_response('{"script": "Hi Ann", "optimized_script": "Hi [pause] Ann"}') == \
+        ("Hi Ann", "Hi [pause] Ann")
+
+
+def test_json_between_prose_with_braces():
+    reply = ('Sure {as requested}, here it is:\n'
+             '{"script": "Hi Ann", "optimized_script": "Hi [pause] Ann"}\n'
+             'Let me know if you want changes to the {tone}!')
+    assert parse_fused_response(reply) == ("Hi Ann", "Hi [pause] Ann")
+
+
+def test_fenced_json_with_raw_newlines():
+    reply = 'Here:\n```json\n{"script": "Hi Ann,\nwelcome", "optimized_script": "Hi Ann [pause]"}\n```\nDone.'
+    assert parse_fused_response(reply) == ("Hi Ann,\nwelcome", "Hi Ann [pause]")
+
+
+def test_sectioned_reply():
+    assert parse_fused_response("SCRIPT:\nHi Ann\nOPTIMIZED SCRIPT:\nHi [pause] Ann") == ("Hi Ann", "Hi [pause] Ann")
+
+
+def test_unparseable_reply_raises_value_error():
+    assert parse_fused_response("I cannot help with that {sorry}") is None
+    with pytest.raises(ValueError):
+        require_fused_response("I cannot help with that {sorry}")
+
+
+class FakeCompletions:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=outcome))])
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    return ScriptGenerator(prompt_cache=PromptCache(None), router=ModelRouter(log_path=None))
+
+
+def use_completions(generator, completions):
+    generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return completions
+
+
+def test_unparseable_fused_reply_falls_back_to_two_calls(generator):
+    completions = use_completions(generator, FakeCompletions("no json here", "Hi Ann", "Hi [pause] Ann"))
+
+    result = generator.generate_avatar_ready_script("Acme", "Ann", "Videos", "Fast", "Book a call")
+
+    assert result["success"] and not result["fused"]
+    assert result["optimized_script"] == "Hi [pause] Ann"
+    assert completions.calls == 3
+
+
+def test_api_error_is_reported_without_fallback(generator):
+    completions = use_completions(generator, FakeCompletions(RuntimeError("invalid api key")))
+
+    result = generator.generate_avatar_ready_script("Acme", "Ann", "Videos", "Fast", "Book a call")
+
+    assert not result["success"] and "invalid api key" in result["error"]
+    assert completions.calls == 1
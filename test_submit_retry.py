@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Tests for Hedra submit retries and journal dedup (no network)
+
+Both clients are driven against scripted fake transports, so every retry,
+backoff and journal decision is deterministic.
+"""
+import json
+import asyncio
+
+import httpx
+import pytest
+import requests
+
+import hedra_client
+from async_hedra_client import AsyncHedraClient
+from hedra_client import HedraClient, build_character_payload, payload_hash
+from job_journal import JobJournal
+from retry_policy import RetryBudget, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body or {}
+        self.headers = headers or {}
+        self.text = str(self._body)
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Answers POSTs from a script of FakeResponses and exceptions, recording each request"""
+
+    def __init__(self, *outcomes, projects=None):
+        self.outcomes = list(outcomes)
+        self.projects = projects
+        self.posts = []
+        self.listings = 0
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        self.posts.append({"url": url, "json": json, "headers": headers})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def get(self, url, headers=None, timeout=None):
+        self.listings += 1
+        if self.projects is None:
+            return FakeResponse(500, {"error": "unavailable"})
+        return FakeResponse(200, {"projects": self.projects})
+
+
+class FakeGovernor:
+    def __init__(self):
+        self.observed = []
+
+    def acquire(self, kind):
+        pass
+
+    def reserve(self, kind):
+        return 0.0
+
+    def observe(self, kind, status_code, retry_after=None):
+        self.observed.append((kind, status_code, retry_after))
+
+
+class FakeVoices:
+    def resolve(self, voice_id):
+        return "voice-1" if voice_id == "default" else voice_id
+
+
+def accepted(job_id="job-1"):
+    return FakeResponse(200, {"jobId": job_id})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(hedra_client.time, "sleep", recorded.append)
+    return recorded
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return JobJournal(str(tmp_path / "jobs.db"))
+
+
+def make_client(session, journal=None, budget=None, max_attempts=4):
+    return HedraClient(api_key="test-key", session=session, journal=journal, voice_catalog=FakeVoices(),
+                       governor=FakeGovernor(),
+                       retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.5,
+                                                budget=budget or RetryBudget()))
+
+
+def test_429_waits_for_retry_after(sleeps, journal):
+    session = FakeSession(FakeResponse(429, {"error": "slow down"}, {"Retry-After": "7"}), accepted())
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert result["success"] and result["job_id"] == "job-1"
+    assert result["attempts"] == 2
+    assert sleeps == [7.0]
+    assert client.governor.observed[0] == ("submit", 429, "7")
+
+
+def test_503_then_success_reuses_idempotency_key(sleeps, journal):
+    session = FakeSession(FakeResponse(503), accepted())
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert result["success"] and result["attempts"] == 2
+    keys = {post["headers"]["Idempotency-Key"] for post in session.posts}
+    assert len(session.posts) == 2 and len(keys) == 1
+    assert len(sleeps) == 1 and 0 <= sleeps[0] <= 0.5
+    assert journal.get("job-1")["status"] == "Submitted"
+
+
+def test_exhausted_budget_stops_retrying(sleeps, journal):
+    budget = RetryBudget(ratio=0.0, min_retries=0)
+    session = FakeSession(FakeResponse(503))
+    client = make_client(session, journal, budget=budget)
+
+    result = client.submit_video("Hello there")
+
+    assert not result["success"] and result["status_code"] == 503
+    assert len(session.posts) == 1 and sleeps == []
+    assert budget.stats()["exhausted"] == 1
+
+
+def test_ambiguous_timeout_is_not_resent(sleeps, journal):
+    session = FakeSession(requests.ReadTimeout("read timed out"), accepted())
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert not result["success"] and result["unconfirmed"]
+    assert len(session.posts) == 1 and sleeps == []
+    payload = build_character_payload("Hello there", "voice-1", "16:9")
+    assert journal.submit_intent(payload_hash(payload))["ambiguous"]
+
+
+def test_gateway_timeout_is_unconfirmed(sleeps, journal):
+    session = FakeSession(FakeResponse(504))
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert result["unconfirmed"] and len(session.posts) == 1
+
+
+def test_never_sent_error_is_retried(sleeps, journal):
+    session = FakeSession(requests.ConnectTimeout("connect timed out"), accepted())
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert result["success"] and len(session.posts) == 2
+
+
+def test_unconfirmed_submit_is_reconciled_before_resending(sleeps, journal):
+    session = FakeSession(requests.ReadTimeout("read timed out"))
+    client = make_client(session, journal)
+    client.submit_video("Hello there")
+
+    # The first attempt did create a job: the retry finds it instead of posting again
+    session.projects = [{"id": "job-lost", "text": "Hello there", "voiceId": "voice-1", "aspectRatio": "16:9"}]
+    result = client.submit_video("Hello there")
+
+    assert result == {"success": True, "job_id": "job-lost", "reconciled": True}
+    assert len(session.posts) == 1
+    assert journal.get("job-lost")["status"] == "Submitted"
+
+
+def test_unconfirmed_submit_waits_while_projects_cannot_be_listed(sleeps, journal):
+    session = FakeSession(requests.ReadTimeout("read timed out"))
+    client = make_client(session, journal)
+    client.submit_video("Hello there")
+
+    result = client.submit_video("Hello there")
+
+    assert result["unconfirmed"] and session.listings == 1 and len(session.posts) == 1
+
+
+def test_lost_submit_is_resent_with_the_same_key_after_the_grace_period(sleeps, journal, monkeypatch):
+    session = FakeSession(requests.ReadTimeout("read timed out"), accepted("job-2"), projects=[])
+    client = make_client(session, journal)
+    client.submit_video("Hello there")
+
+    assert client.submit_video("Hello there")["unconfirmed"]  # not listed yet - too early to tell
+    monkeypatch.setattr(hedra_client, "RECONCILE_GRACE_SECONDS", 0)
+    result = client.submit_video("Hello there")
+
+    assert result["success"] and result["job_id"] == "job-2"
+    assert len(session.posts) == 2
+    assert session.posts[0]["headers"]["Idempotency-Key"] == session.posts[1]["headers"]["Idempotency-Key"]
+
+
+def test_unfinished_job_is_reused_instead_of_resubmitted(sleeps, journal):
+    payload = build_character_payload("Hello there", "voice-1", "16:9")
+    journal.record_submission("job-old", payload, payload_hash(payload))
+    session = FakeSession()
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert result == {"success": True, "job_id": "job-old", "deduplicated": True}
+    assert session.posts == []
+
+
+def test_async_client_shares_the_retry_flow(journal):
+    answers = [httpx.Response(503), httpx.Response(200, json={"jobId": "job-async"})]
+    seen = []
+
+    def handler(request):
+        assert json.loads(request.content)["voiceId"] == "voice-1"
+        seen.append(request.headers["Idempotency-Key"])
+        return answers.pop(0)
+
+    async def run():
+        client = AsyncHedraClient(api_key="test-key", journal=journal, governor=FakeGovernor(),
+                                  voice_catalog=FakeVoices(),
+                                  retry_policy=RetryPolicy(base_delay=0.0, budget=RetryBudget()))
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await client.submit_video("Hello there")
+
+    result = asyncio.run(run())
+
+    assert result["success"] and result["job_id"] == "job-async" and result["attempts"] == 2
+    assert len(seen) == 2 and len(set(seen)) == 1
+    # "default" was resolved like the sync client does, so both hash the same payload
+    payload = build_character_payload("Hello there", "voice-1", "16:9")
+    assert journal.get("job-async")["payload_hash"] == payload_hash(payload)
+
+
+def test_stale_unfinished_job_is_resubmitted(sleeps, journal):
+    payload = build_character_payload("Hello there", "voice-1", "16:9")
+    journal.record_submission("job-dead", payload, payload_hash(payload))
+    journal._conn().execute("UPDATE jobs SET created_at = created_at - ?", (hedra_client.DEDUP_MAX_AGE + 60,))
+    session = FakeSession(accepted("job-new"))
+    client = make_client(session, journal)
+
+    result = client.submit_video("Hello there")
+
+    assert result["success"] and result["job_id"] == "job-new"
+
+
+def test_job_that_keeps_404ing_is_abandoned(sleeps, journal):
+    payload = build_character_payload("Hello there", "voice-1", "16:9")
+    journal.record_submission("job-gone", payload, payload_hash(payload))
+    client = make_client(FakeSession(), journal)
+    client.get_project_status = lambda job_id: {"done": False, "error": "not found", "status_code": 404}
+
+    result = client.wait_for_completion("job-gone")
+
+    assert not result["success"] and result["status"] == "Abandoned"
+    assert len(sleeps) == hedra_client.MAX_MISSING_CHECKS - 1
+    assert journal.get("job-gone")["status"] == "Abandoned"
+    assert journal.find_unfinished(payload_hash(payload)) is None
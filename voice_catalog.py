@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Hedra voice catalog cache
+
+/v1/voices is fetched at most once per TTL and revalidated with
+If-None-Match / If-Modified-Since afterwards. The last good copy is kept on
+disk so a cold start has voices immediately, and voices are indexed by id and
+name so lookups during job submission never touch the network.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from typing import Dict, Any, List, Optional, Callable
+
+import requests
+
+from http_transport import get_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_DIR = os.getenv("HEDRA_VOICE_CACHE_DIR", ".video_state")
+
+
+def voice_id_of(voice: Dict[str, Any]) -> Optional[str]:
+    return voice.get("voice_id", voice.get("id"))
+
+
+class VoiceCatalog:
+    def __init__(self,
+                 base_url: str,
+                 api_key: str,
+                 ttl: float = 3600,
+                 error_ttl: float = 30,
+                 warm_path: Optional[str] = None,
+                 session_factory: Callable[[], requests.Session] = get_session):
+        """
+        Args:
+            base_url: Mercury API base URL
+            api_key: Hedra API key (catalogs are per key)
+            ttl: Seconds a fetched catalog is served without revalidation
+            error_ttl: Seconds to wait after a failed fetch before trying again
+            warm_path: On-disk copy used for cold starts (defaults to one file per key)
+            session_factory: Returns the session used for /v1/voices
+        """
+        self.base_url = base_url
+        self.headers = {"X-API-Key": api_key}
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        self.warm_path = warm_path or os.path.join(DEFAULT_CATALOG_DIR, f"voices_{key_hash}.json")
+        self.session_factory = session_factory
+
+        self._lock = threading.Lock()
+        self._voices: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._fetched_at = 0.0
+        self._failed_at = 0.0
+        self._metrics = {"hits": 0, "fetches": 0, "not_modified": 0, "errors": 0}
+
+        self._load_warm_copy()
+
+    def voices(self) -> List[Dict[str, Any]]:
+        """Current voice list, revalidating with the API once the TTL has passed"""
+        with self._lock:
+            # An empty catalog is as fresh as a full one, and a failed fetch is not
+            # retried on every lookup
+            now = time.time()
+            if now - self._fetched_at < self.ttl or now - self._failed_at < self.error_ttl:
+                self._metrics["hits"] += 1
+                return list(self._voices)
+            self._revalidate()
+            return list(self._voices)
+
+    def get(self, voice_id: str) -> Optional[Dict[str, Any]]:
+        """Voice by id - O(1), from memory"""
+        self.voices()
+        return self._by_id.get(voice_id)
+
+    def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Voice by (case-insensitive) name - O(1), from memory"""
+        self.voices()
+        return self._by_name.get(name.lower())
+
+    def resolve(self, voice_id: str) -> str:
+        """
+        Map a requested voice to the id Mercury expects
+
+        "default" becomes the first available voice, a known name becomes its id,
+        and anything else (including a known id) is passed through unchanged.
+        """
+        voices = self.voices()
+        if voice_id == "default":
+            return (voice_id_of(voices[0]) or voice_id) if voices else voice_id
+        if voice_id in self._by_id:
+            return voice_id
+        by_name = self._by_name.get(voice_id.lower())
+        return voice_id_of(by_name) if by_name else voice_id
+
+    def invalidate(self):
+        with self._lock:
+            self._fetched_at = 0.0
+            self._failed_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._metrics,
+                "voices": len(self._voices),
+                "age_seconds": round(time.time() - self._fetched_at, 1) if self._fetched_at else None,
+                "etag": self._etag
+            }
+
+    def _revalidate(self):
+        headers = dict(self.headers)
+        if self._voices and self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._voices and self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        try:
+            response = self.session_factory().get(f"{self.base_url}/v1/voices", headers=headers, timeout=30)
+
+            if response.status_code == 304:
+                self._metrics["not_modified"] += 1
+                self._fetched_at = time.time()
+                self._save_warm_copy()
+            elif response.status_code == 200:
+                self._metrics["fetches"] += 1
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+                self._set_voices(response.json().get("supported_voices", []))
+                self._fetched_at = time.time()
+                self._save_warm_copy()
+            else:
+                self._metrics["errors"] += 1
+                self._failed_at = time.time()
+                logger.warning(f"Could not fetch voices: {response.status_code}")
+
+        except Exception as e:
+            # Keep serving the stale catalog (if any) rather than failing the caller
+            self._metrics["errors"] += 1
+            self._failed_at = time.time()
+            logger.error(f"Error fetching voices: {e}")
+
+    def _set_voices(self, voices: List[Dict[str, Any]]):
+        self._voices = voices
+        self._by_id = {voice_id_of(v): v for v in voices if voice_id_of(v)}
+        self._by_name = {v["name"].lower(): v for v in voices if v.get("name")}
+
+    def _load_warm_copy(self):
+        try:
+            with open(self.warm_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._set_voices(data.get("voices", []))
+        self._etag = data.get("etag")
+        self._last_modified = data.get("last_modified")
+        self._fetched_at = data.get("fetched_at", 0.0)
+        logger.info(f"Loaded {len(self._voices)} voices from {self.warm_path}")
+
+    def _save_warm_copy(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.warm_path)), exist_ok=True)
+            tmp_path = self.warm_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({
+                    "voices": self._voices,
+                    "etag": self._etag,
+                    "last_modified": self._last_modified,
+                    "fetched_at": self._fetched_at
+                }, f)
+            os.replace(tmp_path, self.warm_path)
+        except OSError as e:
+            logger.warning(f"Could not save voice catalog: {e}")
+
+
+_catalogs: Dict[tuple, VoiceCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_voice_catalog(base_url: str, api_key: str) -> VoiceCatalog:
+    """Process-wide catalog per (base URL, API key), shared by all HedraClient instances"""
+    with _catalogs_lock:
+        key = (base_url, api_key)
+        if key not in _catalogs:
+            _catalogs[key] = VoiceCatalog(base_url, api_key)
+        return _catalogs[key]